@@ -5,44 +5,209 @@
 # ///
 """Check Playwright browser installation status."""
 
+import argparse
+import importlib.metadata
+import importlib.util
+import json
+import os
+import re
 import sys
+from pathlib import Path
 
-from playwright.sync_api import sync_playwright
+from runtime import STATE_DIR, sync_playwright
+
+# chromium-headless-shell is what chromium launches in headless mode
+BROWSERS = ("chromium", "chromium-headless-shell", "firefox", "webkit")
+
+# Probe results, reused while the playwright version and browser cache are unchanged
+PROBE_CACHE = STATE_DIR.parent / "setup.json"
+
+PIN_RE = re.compile(r'^# dependencies = .*"playwright==([^"]+)"', re.MULTILINE)
+
+
+def playwright_package_dir() -> Path:
+    """The installed playwright package directory; exits with an error if there is none."""
+    spec = importlib.util.find_spec("playwright")
+    if spec is None or not spec.submodule_search_locations:
+        sys.exit("Error: playwright not installed (run this script with `uv run`)")
+    return Path(spec.submodule_search_locations[0])
+
+
+def browsers_path() -> Path:
+    """The ms-playwright browser cache directory, resolved like the Playwright driver does."""
+    package = playwright_package_dir()
+    env = os.getenv("PLAYWRIGHT_BROWSERS_PATH")
+    if env == "0":
+        return package / "driver" / "package" / ".local-browsers"
+    if env:
+        return Path(env).resolve()
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "ms-playwright"
+    if sys.platform == "win32":
+        local = os.getenv("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+        return Path(local) / "ms-playwright"
+    return Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "ms-playwright"
+
+
+def browser_dirs(entry: dict) -> list[str]:
+    """Directory names a browsers.json entry may be installed under, default revision first."""
+    prefix = entry["name"].replace("-", "_")
+    names = [f"{prefix}-{entry['revision']}"]
+    for platform, revision in entry.get("revisionOverrides", {}).items():
+        names.append(f"{prefix}_{platform}_special".replace("-", "_") + f"-{revision}")
+    return names
+
+
+def probe(root: Path) -> tuple[dict, bool]:
+    """Find installed browsers from the revisions pinned in the playwright package, without the driver.
+
+    Returns the browsers found and whether any install looks unfinished (its
+    directory exists, but not its INSTALLATION_COMPLETE marker yet).
+    """
+    package = playwright_package_dir()
+    manifest = json.loads((package / "driver" / "package" / "browsers.json").read_text())
+    entries = {entry["name"]: entry for entry in manifest["browsers"]}
+
+    found = {}
+    unfinished = False
+    for name in BROWSERS:
+        found[name] = None
+        for dir_name in browser_dirs(entries[name]):
+            if (root / dir_name / "INSTALLATION_COMPLETE").exists():
+                found[name] = str(root / dir_name)
+                break
+            unfinished = unfinished or (root / dir_name).exists()
+    return found, unfinished
+
+
+def cached_probe(root: Path, version: str) -> dict:
+    """probe(), cached by playwright version and the browser cache directory's mtime.
+
+    Partial results (such as a chromium-only install) are cached too: a new
+    browser directory changes the cache directory's mtime. Results taken while
+    an install was unfinished aren't cached, and each cached browser's marker
+    file is still checked, so removals inside the cache are noticed.
+    """
+    try:
+        key = f"{version}:{root}:{root.stat().st_mtime_ns}"
+    except FileNotFoundError:
+        return dict.fromkeys(BROWSERS)
+    try:
+        cache = json.loads(PROBE_CACHE.read_text())
+        found = cache["browsers"]
+        if (
+            cache["key"] == key
+            and set(found) == set(BROWSERS)
+            and all(Path(path, "INSTALLATION_COMPLETE").exists() for path in found.values() if path)
+        ):
+            return found
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+
+    found, unfinished = probe(root)
+    if not unfinished:
+        try:
+            PROBE_CACHE.parent.mkdir(parents=True, exist_ok=True)
+            PROBE_CACHE.write_text(json.dumps({"key": key, "browsers": found}))
+        except OSError:
+            pass
+    return found
+
+
+def deep_check() -> dict:
+    """Ask the driver for each executable and launch it headless to prove it runs.
+
+    Plain headless chromium runs chromium-headless-shell; the "chromium" channel
+    runs the full browser in its new headless mode.
+    """
+    launches = {
+        "chromium": ("chromium", {"channel": "chromium"}),
+        "chromium-headless-shell": ("chromium", {}),
+        "firefox": ("firefox", {}),
+        "webkit": ("webkit", {}),
+    }
+    found = {}
+    with sync_playwright() as p:
+        for name in BROWSERS:
+            browser_type_name, options = launches[name]
+            browser_type = getattr(p, browser_type_name)
+            try:
+                browser = browser_type.launch(headless=True, **options)
+                version = browser.version
+                browser.close()
+                # The driver only reports the full chromium's executable path
+                if name == "chromium-headless-shell":
+                    found[name] = f"launched (version {version})"
+                else:
+                    found[name] = browser_type.executable_path
+            except Exception as e:
+                found[name] = None
+                print(f"Can't launch {name}: {str(e).splitlines()[0]}", file=sys.stderr)
+    return found
+
+
+def pin_mismatches(version: str) -> list[str]:
+    """Scripts whose inline playwright pin differs from the installed playwright."""
+    mismatched = []
+    for script in sorted(Path(__file__).parent.glob("*.py")):
+        match = PIN_RE.search(script.read_text())
+        if match and match.group(1) != version:
+            mismatched.append(f"{script.name} pins {match.group(1)}")
+    return mismatched
 
 
 def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Check Playwright browser installation status",
+        epilog="""
+By default the browser cache (ms-playwright) is inspected directly for the
+revisions pinned by the installed playwright package, without starting the
+driver; results are cached until playwright or the cache directory changes.
+""",
+    )
+    parser.add_argument(
+        "--deep",
+        action="store_true",
+        help="Start the driver and launch each browser headless (slower, catches missing system libraries)",
+    )
+    args = parser.parse_args()
+
     print("Checking Playwright browser installation...\n")
 
-    with sync_playwright() as p:
-        browsers = {
-            "chromium": p.chromium,
-            "firefox": p.firefox,
-            "webkit": p.webkit,
-        }
+    version = importlib.metadata.version("playwright")
+    if args.deep:
+        available = deep_check()
+    else:
+        available = cached_probe(browsers_path(), version)
 
-        available = {}
-        missing = []
+    missing = []
+    for name in BROWSERS:
+        if available[name]:
+            print(f"  {name}: {available[name]}")
+        else:
+            missing.append(name)
+            print(f"  {name}: missing")
 
-        for name, bt in browsers.items():
-            try:
-                path = bt.executable_path
-                available[name] = path
-                print(f"  {name}: {path}")
-            except Exception:
-                missing.append(name)
-                print(f"  {name}: missing")
+    print()
 
+    mismatches = pin_mismatches(version)
+    if mismatches:
+        print(f"Warning: playwright {version} is installed, but:")
+        for line in mismatches:
+            print(f"  {line}")
         print()
 
-        if missing:
-            print("Install missing browsers with:")
-            print(f"  uv run --with playwright playwright install {' '.join(missing)}")
-            print("\nOr install with system dependencies:")
-            print(f"  uv run --with playwright playwright install --with-deps {' '.join(missing)}")
-            return 1
+    if missing:
+        print("Install missing browsers with:")
+        print(f"  uv run --with playwright=={version} playwright install {' '.join(missing)}")
+        print("\nOr install with system dependencies:")
+        print(
+            f"  uv run --with playwright=={version} playwright install --with-deps {' '.join(missing)}"
+        )
+        return 1
 
-        print("All browsers installed!")
-        return 0
+    print("All browsers installed!")
+    return 0
 
 
 if __name__ == "__main__":
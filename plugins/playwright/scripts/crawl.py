@@ -0,0 +1,320 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.10"
+# dependencies = ["playwright==1.56.0"]
+# ///
+"""Crawl a site and extract title, links and text from every page."""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+from fnmatch import fnmatchcase
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from runtime import (
+    HEADLESS,
+    add_block_arguments,
+    add_har_arguments,
+    add_state_arguments,
+    add_trace_arguments,
+    add_wait_arguments,
+    async_playwright,
+    close_context_async,
+    env_viewport,
+    goto_async,
+    install_blocking_async,
+    launch_browser_async,
+    load_state_path,
+    open_context_async,
+    print_ndjson,
+    span,
+)
+
+CHECKPOINT_FORMAT = 1
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+EXTRACT_JS = """
+(withText) => ({
+    title: document.title,
+    links: Array.from(document.querySelectorAll('a[href]'), a => a.href)
+        .filter(href => typeof href === 'string'),
+    text: withText ? document.body?.innerText ?? '' : undefined,
+})
+"""
+
+
+def normalize_url(url: str, base: str | None = None) -> str | None:
+    """Canonicalize an http(s) URL for deduplication; None for other schemes.
+
+    Lowercases scheme and host, drops credentials, default ports and the
+    fragment, and sorts query parameters.
+    """
+    parts = urlsplit(urljoin(base, url) if base else url)
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return None
+    try:
+        port = parts.port
+    except ValueError:
+        return None
+    netloc = parts.hostname.lower()
+    if port and port != DEFAULT_PORTS[scheme]:
+        netloc += f":{port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+
+def origin_of(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def in_scope(url: str, origins: set[str], include: list[str], exclude: list[str]) -> bool:
+    """Same-origin as a start URL, matching an --include glob (if any) and no --exclude glob."""
+    if origin_of(url) not in origins:
+        return False
+    if include and not any(fnmatchcase(url, glob) for glob in include):
+        return False
+    return not any(fnmatchcase(url, glob) for glob in exclude)
+
+
+def load_checkpoint(path: str) -> dict | None:
+    """Load a checkpoint written by save_checkpoint(), or None if there is none."""
+    try:
+        state = json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        return None
+    if state.get("format") != CHECKPOINT_FORMAT:
+        raise ValueError(f"unsupported checkpoint format: {state.get('format')}")
+    return state
+
+
+def save_checkpoint(path: str, state: dict) -> None:
+    """Write the checkpoint atomically so an interrupted write never loses the old one."""
+    tmp = Path(f"{path}.tmp")
+    tmp.write_text(json.dumps(state))
+    tmp.replace(path)
+
+
+async def crawl(args: argparse.Namespace, headless: bool, viewport: dict) -> int:
+    """Breadth-first crawl with up to --concurrency pages in flight, streaming NDJSON."""
+    state = load_checkpoint(args.checkpoint) if args.checkpoint else None
+    if state:
+        roots = state["roots"]
+        seen = set(state["seen"])
+        frontier = deque((url, depth) for url, depth in state["frontier"])
+        done = state["pages"]
+        print(
+            f"Resuming from {args.checkpoint}: {done} page(s) done, {len(frontier)} queued",
+            file=sys.stderr,
+        )
+    else:
+        roots = [url for url in map(normalize_url, args.urls) if url]
+        if not roots:
+            print("Error: no http(s) start URL", file=sys.stderr)
+            return 1
+        seen = set(roots)
+        frontier = deque((url, 0) for url in roots)
+        done = 0
+
+    # Roots that redirect (http -> https, apex -> www) add their final origin below
+    origins = {origin_of(url) for url in roots} | set(state.get("origins", []) if state else [])
+    in_flight: dict[asyncio.Task, tuple[str, int]] = {}
+    failed = 0
+
+    def checkpoint() -> None:
+        if args.checkpoint:
+            pending = list(in_flight.values()) + list(frontier)
+            save_checkpoint(
+                args.checkpoint,
+                {
+                    "format": CHECKPOINT_FORMAT,
+                    "roots": roots,
+                    "origins": sorted(origins),
+                    "pages": done,
+                    "seen": sorted(seen),
+                    "frontier": [list(item) for item in pending],
+                },
+            )
+
+    async with async_playwright() as p:
+        browser = await launch_browser_async(p, headless)
+        context = await open_context_async(
+            browser, args, viewport=viewport, storage_state=load_state_path(args, roots[0])
+        )
+        await install_blocking_async(context, args.block, roots[0])
+
+        async def visit(url: str, depth: int) -> tuple[dict, list[str]]:
+            start = time.monotonic()
+            record = {"url": url, "depth": depth}
+            links = []
+            page = await context.new_page()
+            page.set_default_navigation_timeout(args.timeout * 1000)
+            try:
+                response = await asyncio.wait_for(goto_async(page, url, args), args.timeout)
+                record["status"] = response.status if response else None
+                if page.url != url:
+                    record["final_url"] = page.url
+                content_type = response.headers.get("content-type", "") if response else ""
+                if "html" not in content_type:
+                    record["ok"] = False
+                    record["error"] = f"not HTML ({content_type or 'unknown content type'})"
+                else:
+                    with span("extract", url=url):
+                        page_data = await page.evaluate(EXTRACT_JS, args.text)
+                    links = list(
+                        dict.fromkeys(filter(None, map(normalize_url, page_data["links"])))
+                    )
+                    record["ok"] = response.ok
+                    record["title"] = page_data["title"]
+                    record["links"] = links
+                    if args.text:
+                        record["text"] = page_data["text"]
+            except Exception as e:
+                record["ok"] = False
+                record["error"] = str(e) or type(e).__name__
+            finally:
+                record["ms"] = round((time.monotonic() - start) * 1000)
+                await page.close()
+            return record, links
+
+        try:
+            while frontier or in_flight:
+                while (
+                    frontier
+                    and len(in_flight) < args.concurrency
+                    and (done + len(in_flight) < args.max_pages)
+                ):
+                    url, depth = frontier.popleft()
+                    in_flight[asyncio.ensure_future(visit(url, depth))] = (url, depth)
+                if not in_flight:
+                    break
+
+                finished, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    _, depth = in_flight.pop(task)
+                    record, links = task.result()
+                    done += 1
+                    failed += not record["ok"]
+                    print_ndjson(record)
+
+                    # Redirect targets count as visited too
+                    final = normalize_url(record.get("final_url", ""))
+                    if final:
+                        seen.add(final)
+                        if depth == 0:
+                            origins.add(origin_of(final))
+                    if depth < args.max_depth:
+                        for link in links:
+                            if link not in seen and in_scope(
+                                link, origins, args.include, args.exclude
+                            ):
+                                seen.add(link)
+                                frontier.append((link, depth + 1))
+
+                    if done % args.checkpoint_every == 0:
+                        checkpoint()
+        finally:
+            # Runs on Ctrl-C too: in-flight pages go back to the frontier
+            checkpoint()
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+            await close_context_async(context, args)
+            await browser.close()
+
+    print(
+        f"Crawled {done} page(s), {failed} failed, {len(frontier)} left in the frontier",
+        file=sys.stderr,
+    )
+    return 0 if failed == 0 else 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Crawl a site and extract title, links and text from every page",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  crawl.py https://docs.example.com/ --headless > pages.ndjson
+  crawl.py https://docs.example.com/guide/ --include "*/guide/*" --max-depth 5 --text
+  crawl.py https://docs.example.com/ --max-pages 500 --checkpoint /tmp/docs.json
+  crawl.py --checkpoint /tmp/docs.json --max-pages 1000   # resume and go further
+
+Only pages on the same origin as a start URL, or as the page a start URL
+redirects to (http -> https, apex -> www), are followed. --include and
+--exclude globs are matched against the normalized URL (lowercase scheme and
+host, no fragment, default port or credentials, sorted query parameters).
+
+Output is one NDJSON record per page:
+  {"url", "depth", "status", "ok", "title", "links", "text"?, "final_url"?, "error"?, "ms"}
+
+With --checkpoint, progress is saved every --checkpoint-every pages and on
+exit (including Ctrl-C); an existing checkpoint is resumed and the start URLs
+on the command line are ignored.
+
+Environment variables:
+  HEADLESS=1    Run browser in headless mode
+  SLOW_MO=250   Slow down actions by 250ms
+  PLAYWRIGHT_DAEMON=0  Don't connect to a running daemon.py browser
+""",
+    )
+    parser.add_argument("urls", nargs="*", metavar="url", help="Start URL(s)")
+    parser.add_argument("--headless", action="store_true", help="Run in headless mode")
+    parser.add_argument("--text", action="store_true", help="Include each page's text")
+    parser.add_argument(
+        "--max-depth", type=int, default=2, help="Link depth from the start URLs (default: 2)"
+    )
+    parser.add_argument(
+        "--max-pages", type=int, default=100, help="Stop after this many pages (default: 100)"
+    )
+    parser.add_argument(
+        "--include", action="append", default=[], metavar="GLOB", help="Only follow matching URLs"
+    )
+    parser.add_argument(
+        "--exclude", action="append", default=[], metavar="GLOB", help="Never follow matching URLs"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="Pages loaded in parallel (default: 4)"
+    )
+    parser.add_argument("--timeout", type=float, default=60, help="Per-page timeout in seconds")
+    parser.add_argument("--checkpoint", metavar="FILE", help="Save and resume crawl state")
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=25,
+        metavar="N",
+        help="Pages between checkpoint writes (default: 25)",
+    )
+    add_block_arguments(parser)
+    add_har_arguments(parser)
+    add_trace_arguments(parser)
+    add_state_arguments(parser)
+    add_wait_arguments(parser)
+    args = parser.parse_args()
+
+    if not args.urls and not (args.checkpoint and Path(args.checkpoint).exists()):
+        parser.error("a start URL or an existing --checkpoint is required")
+    if args.concurrency < 1 or args.checkpoint_every < 1:
+        parser.error("--concurrency and --checkpoint-every must be positive")
+    if args.save_state or args.record_har:
+        parser.error("--save-state and --record-har aren't supported while crawling")
+
+    headless = HEADLESS or args.headless
+    viewport = env_viewport()
+
+    try:
+        return asyncio.run(crawl(args, headless, viewport))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.10"
+# dependencies = ["playwright==1.56.0"]
+# ///
+"""Run a persistent browser that the other scripts connect to."""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+from runtime import (
+    DAEMON_STATE,
+    HEADLESS,
+    pid_alive,
+    read_daemon_state,
+    sync_playwright,
+    write_daemon_state,
+)
+
+
+def launch_server(headless: bool) -> tuple[subprocess.Popen, str]:
+    """Start Chromium behind a Playwright browser server listening on 127.0.0.1.
+
+    The Python API has no BrowserType.launch_server(), so this runs the bundled
+    driver's launch-server command, which calls it and prints the endpoint. The
+    endpoint's path is a random GUID; connections to any other path are refused.
+    Returns the server process and its endpoint (empty if it failed to start).
+    """
+    from playwright._impl._driver import compute_driver_executable, get_driver_env
+
+    driver, cli = compute_driver_executable()
+    with tempfile.NamedTemporaryFile("w", suffix=".json") as config:
+        json.dump({"headless": headless, "host": "127.0.0.1", "port": 0}, config)
+        config.flush()
+        server = subprocess.Popen(
+            [driver, cli, "launch-server", "--browser", "chromium", "--config", config.name],
+            stdout=subprocess.PIPE,
+            stdin=subprocess.DEVNULL,
+            env=get_driver_env(),
+            text=True,
+        )
+        # The server prints its endpoint once the browser is up
+        assert server.stdout is not None
+        endpoint = server.stdout.readline().strip()
+    return server, endpoint
+
+
+def serve(headless: bool) -> int:
+    """Launch a Chromium browser server and keep it alive until signalled."""
+    stopping = False
+
+    def request_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    server, endpoint = launch_server(headless)
+    try:
+        if not endpoint.startswith("ws://"):
+            print("Error: browser server did not report an endpoint", file=sys.stderr)
+            return 1
+
+        # Warm up the renderer and network stack so the first client doesn't pay for it
+        with sync_playwright() as p:
+            browser = p.chromium.connect(endpoint)
+            browser.new_page().goto("about:blank")
+            browser.close()
+
+        # The endpoint is the only credential, so it lives in the 0600 state file alone
+        state = {
+            "pid": os.getpid(),
+            "server_pid": server.pid,
+            "endpoint": endpoint,
+            "headless": headless,
+            "started": time.time(),
+        }
+        write_daemon_state(state)
+
+        while not stopping and server.poll() is None:
+            time.sleep(0.5)
+    finally:
+        DAEMON_STATE.unlink(missing_ok=True)
+        if server.poll() is None:
+            server.terminate()
+            try:
+                server.wait(10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+    return 0
+
+
+def start(headless: bool, timeout: float) -> int:
+    state = read_daemon_state()
+    if state:
+        print(f"Daemon already running (pid {state['pid']})")
+        return 0
+
+    log_path = DAEMON_STATE.with_suffix(".log")
+    DAEMON_STATE.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    with open(log_path, "w") as log:
+        cmd = [sys.executable, os.path.abspath(__file__), "serve"]
+        if headless:
+            cmd.append("--headless")
+        proc = subprocess.Popen(
+            cmd, stdout=log, stderr=log, stdin=subprocess.DEVNULL, start_new_session=True
+        )
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        state = read_daemon_state()
+        if state and state["pid"] == proc.pid:
+            print(f"Daemon started (pid {proc.pid})")
+            return 0
+        if proc.poll() is not None:
+            break
+        time.sleep(0.1)
+
+    print(f"Error: daemon failed to start, see {log_path}", file=sys.stderr)
+    if proc.poll() is None:
+        proc.terminate()
+    return 1
+
+
+def stop(timeout: float) -> int:
+    state = read_daemon_state()
+    if not state:
+        DAEMON_STATE.unlink(missing_ok=True)
+        print("Daemon not running")
+        return 0
+
+    os.kill(state["pid"], signal.SIGTERM)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and pid_alive(state["pid"]):
+        time.sleep(0.1)
+
+    if pid_alive(state["pid"]):
+        os.kill(state["pid"], signal.SIGKILL)
+        if state.get("server_pid") and pid_alive(state["server_pid"]):
+            os.kill(state["server_pid"], signal.SIGKILL)
+        DAEMON_STATE.unlink(missing_ok=True)
+    print(f"Daemon stopped (pid {state['pid']})")
+    return 0
+
+
+def status() -> int:
+    state = read_daemon_state()
+    if not state:
+        print("Daemon not running")
+        return 1
+    # Leave the endpoint out: anyone who has it can drive the browser
+    print(json.dumps({key: value for key, value in state.items() if key != "endpoint"}, indent=2))
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Run a persistent browser that the other scripts connect to",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  daemon.py start --headless   # Launch the browser in the background
+  daemon.py status             # Show pids, headless mode and start time
+  daemon.py stop               # Shut the browser down
+
+While the daemon runs, screenshot.py, navigate.py, evaluate.py and fill_form.py
+connect to it instead of launching a browser, and each command gets its own
+fresh browser context. The daemon's headless mode applies to all of them.
+
+The browser listens on a 127.0.0.1 websocket whose path is random; only the
+state file, readable by this user alone, holds that endpoint. No Chrome
+remote-debugging port is opened.
+
+Environment variables:
+  HEADLESS=1                Start the daemon in headless mode
+  PLAYWRIGHT_DAEMON=0       Make the scripts ignore a running daemon
+  PLAYWRIGHT_DAEMON_STATE   State file path (default: $XDG_RUNTIME_DIR/playwright-daemon.json,
+                            else ~/.cache/playwright-skill/daemon.json)
+""",
+    )
+    parser.add_argument("command", choices=["start", "stop", "status", "serve"])
+    parser.add_argument("--headless", action="store_true", help="Run in headless mode")
+    parser.add_argument(
+        "--timeout", type=float, default=30, help="Seconds to wait for start/stop (default: 30)"
+    )
+    args = parser.parse_args()
+
+    headless = HEADLESS or args.headless
+    if args.command == "start":
+        return start(headless, args.timeout)
+    if args.command == "stop":
+        return stop(args.timeout)
+    if args.command == "status":
+        return status()
+    return serve(headless)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,25 +6,175 @@
 """Execute JavaScript in browser context."""
 
 import argparse
+import asyncio
 import json
-import os
 import sys
+import time
 
-from playwright.sync_api import sync_playwright
+from runtime import (
+    HEADLESS,
+    add_block_arguments,
+    add_har_arguments,
+    add_state_arguments,
+    add_trace_arguments,
+    add_wait_arguments,
+    async_playwright,
+    close_context,
+    close_context_async,
+    env_viewport,
+    goto,
+    goto_async,
+    install_blocking,
+    install_blocking_async,
+    launch_browser,
+    launch_browser_async,
+    load_state_path,
+    open_context,
+    open_context_async,
+    print_ndjson,
+    run_bounded,
+    save_state,
+    span,
+    state_path,
+    sync_playwright,
+)
 
-HEADLESS = os.getenv("HEADLESS", "0").lower() in ("1", "true", "yes")
-SLOW_MO = int(os.getenv("SLOW_MO", "0"))
 
+def parse_request(line: str) -> dict:
+    """Turn a REPL line into a request: a JSON object, or else a bare expression."""
+    if line.startswith("{"):
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError:
+            return {"expression": line}  # an object literal or block, not a framed request
+        if isinstance(request, dict) and ("expression" in request or "goto" in request):
+            return request
+        raise ValueError('JSON requests need an "expression" or a "goto" URL')
+    return {"expression": line}
+
+
+def read_urls(source: str) -> list[str]:
+    """Read one URL per line from a file, or stdin when source is '-'; # starts a comment."""
+    stream = sys.stdin if source == "-" else open(source)
+    with stream:
+        lines = [line.strip() for line in stream]
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+async def fan_out(
+    urls: list[str], script: str, args: argparse.Namespace, headless: bool, viewport: dict
+) -> int:
+    """Evaluate script on every URL through a pool of reused contexts on one browser.
+
+    Contexts are pooled per storage state, so with --load-state each URL starts
+    from its own origin's saved state. One NDJSON record per URL is printed as
+    soon as it completes.
+    """
+    failed = 0
+    storage_states: dict = {}
+
+    def storage_state_for(url: str) -> str | None:
+        # Resolved once per state file, so a stale-state warning isn't repeated per URL
+        key = state_path(args.load_state, url) if args.load_state else None
+        if key not in storage_states:
+            storage_states[key] = load_state_path(args, url)
+        return storage_states[key]
+
+    async with async_playwright() as p:
+        browser = await launch_browser_async(p, headless)
+        # Idle contexts by the storage state they were opened with
+        pool: dict[str | None, list] = {}
+
+        async def acquire(storage_state: str | None):
+            if pool.get(storage_state):
+                return pool[storage_state].pop()
+            return await open_context_async(
+                browser, args, viewport=viewport, storage_state=storage_state
+            )
 
-def parse_viewport(value: str) -> dict | None:
-    """Parse viewport string like '1280x720' into dict."""
-    if not value:
-        return None
-    try:
-        w, h = value.lower().split("x", 1)
-        return {"width": int(w), "height": int(h)}
-    except Exception:
-        return None
+        async def release(context, storage_state: str | None) -> None:
+            if sum(map(len, pool.values())) >= args.concurrency:
+                await close_context_async(context, args)
+            else:
+                pool.setdefault(storage_state, []).append(context)
+
+        async def load_and_evaluate(page, url: str):
+            await goto_async(page, url, args)
+            with span("evaluate", url=url):
+                return await page.evaluate(script)
+
+        async def evaluate_url(url: str) -> dict:
+            start = time.monotonic()
+            record = {"url": url}
+            storage_state = storage_state_for(url)
+            context = await acquire(storage_state)
+            page = await context.new_page()
+            page.set_default_navigation_timeout(args.timeout * 1000)
+            try:
+                # Routes go on the page: third-party blocking depends on each URL's site
+                await install_blocking_async(page, args.block, url)
+                record["result"] = await asyncio.wait_for(
+                    load_and_evaluate(page, url), args.timeout
+                )
+                record["ok"] = True
+            except Exception as e:
+                record["ok"] = False
+                record["error"] = str(e) or type(e).__name__
+            finally:
+                await page.close()
+                await release(context, storage_state)
+            record["ms"] = round((time.monotonic() - start) * 1000)
+            return record
+
+        try:
+            async for record in run_bounded(urls, evaluate_url, args.concurrency):
+                failed += not record["ok"]
+                print_ndjson(record)
+        finally:
+            for context in [context for idle in pool.values() for context in idle]:
+                await close_context_async(context, args)
+            await browser.close()
+
+    print(f"{len(urls) - failed} of {len(urls)} URL(s) evaluated", file=sys.stderr)
+    return 0 if failed == 0 else 1
+
+
+def run_repl(page, args: argparse.Namespace) -> int:
+    """Evaluate requests from stdin against the already loaded page.
+
+    Every request gets one JSON line back with its timing, and errors don't
+    end the session. Input ends at EOF.
+    """
+    interactive = sys.stdin.isatty()
+    while True:
+        if interactive:
+            print("> ", end="", file=sys.stderr, flush=True)
+        line = sys.stdin.readline()
+        if not line:
+            return 0
+        line = line.strip()
+        if not line:
+            continue
+
+        record = {}
+        start = time.monotonic()
+        try:
+            request = parse_request(line)
+            if "id" in request:
+                record["id"] = request["id"]
+            if "goto" in request:
+                goto(page, request["goto"], args)
+                record["result"] = page.url
+            elif "arg" in request:
+                record["result"] = page.evaluate(request["expression"], request["arg"])
+            else:
+                record["result"] = page.evaluate(request["expression"])
+            record["ok"] = True
+        except Exception as e:
+            record["ok"] = False
+            record["error"] = str(e)
+        record["ms"] = round((time.monotonic() - start) * 1000, 1)
+        print_ndjson(record)
 
 
 def main() -> int:
@@ -37,6 +187,23 @@ Examples:
   evaluate.py https://example.com "document.querySelectorAll('a').length"
   evaluate.py https://example.com "JSON.stringify(performance.timing)"
   evaluate.py https://example.com --file /tmp/script.js
+  evaluate.py https://example.com "document.links.length" --block images,fonts --block "**/*.mp4"
+  evaluate.py https://example.com --repl          # Read expressions from stdin
+  evaluate.py --urls pages.txt "document.querySelectorAll('img').length" --block images
+
+REPL mode:
+  The page stays loaded while expressions are read from stdin, one per line.
+  A line may also be a JSON request:
+    {"id": 1, "expression": "sel => document.querySelectorAll(sel).length", "arg": "a"}
+    {"id": 2, "goto": "https://example.com/other"}
+  Output is one JSON line per request: {"id", "ok", "result" or "error", "ms"},
+  preceded by {"ready": true, "url", "ms"} once the page has loaded.
+
+Multi-URL mode:
+  --urls reads one URL per line and evaluates the script on each, reusing a
+  pool of --concurrency browser contexts. Records stream as they complete:
+  {"url", "ok", "result" or "error", "ms"}. With --load-state, each URL starts
+  from its own origin's saved state.
 
 JavaScript context:
   The script runs in the page context with access to DOM, window, etc.
@@ -45,20 +212,55 @@ JavaScript context:
 Environment variables:
   HEADLESS=1    Run browser in headless mode
   SLOW_MO=250   Slow down actions by 250ms
+  PLAYWRIGHT_DAEMON=0  Don't connect to a running daemon.py browser
 """,
     )
-    parser.add_argument("url", help="URL to navigate to")
+    parser.add_argument("url", nargs="?", help="URL to navigate to")
     parser.add_argument("expression", nargs="?", help="JavaScript expression to evaluate")
     parser.add_argument("--file", "-f", help="Path to JavaScript file to execute")
+    parser.add_argument(
+        "--repl",
+        action="store_true",
+        help="Keep the page open and evaluate expressions read from stdin",
+    )
     parser.add_argument("--headless", action="store_true", help="Run in headless mode")
+    fan = parser.add_argument_group("multi-URL mode")
+    fan.add_argument("--urls", metavar="FILE", help="Evaluate on every URL in FILE ('-' for stdin)")
+    fan.add_argument(
+        "--concurrency", type=int, default=4, help="Browser contexts in the pool (default: 4)"
+    )
+    fan.add_argument("--timeout", type=float, default=30, help="Per-URL timeout in seconds")
     parser.add_argument(
         "--raw", action="store_true", help="Output raw value without JSON formatting"
     )
+    add_block_arguments(parser)
+    add_har_arguments(parser)
+    add_trace_arguments(parser)
+    add_state_arguments(parser)
+    add_wait_arguments(parser)
     args = parser.parse_args()
 
-    if not args.expression and not args.file:
-        parser.error("Either expression or --file is required")
+    if args.urls:
+        # Without a URL positional, argparse hands the expression to `url`
+        if args.url and not args.expression:
+            args.expression, args.url = args.url, None
+        if args.url:
+            parser.error("give either a url or --urls, not both")
+        if args.repl:
+            parser.error("--repl can't be combined with --urls")
+        if args.save_state or args.record_har:
+            parser.error("--save-state and --record-har can't be combined with --urls")
+        if args.concurrency < 1:
+            parser.error("--concurrency must be positive")
+    elif not args.url:
+        parser.error("url is required (or --urls)")
 
+    if args.repl and (args.expression or args.file):
+        parser.error("--repl reads expressions from stdin; drop the expression and --file")
+    if not args.repl and not args.expression and not args.file:
+        parser.error("Either expression, --file or --repl is required")
+
+    script = args.expression
     if args.file:
         try:
             with open(args.file) as f:
@@ -66,23 +268,44 @@ Environment variables:
         except Exception as e:
             print(f"Error reading file: {e}", file=sys.stderr)
             return 1
-    else:
-        script = args.expression
 
     headless = HEADLESS or args.headless
-    viewport = parse_viewport(os.getenv("VIEWPORT", "")) or {"width": 1280, "height": 720}
+    viewport = env_viewport()
+
+    if args.urls:
+        try:
+            urls = read_urls(args.urls)
+        except OSError as e:
+            print(f"Error reading URLs: {e}", file=sys.stderr)
+            return 1
+        if not urls:
+            print("Error: no URLs to evaluate", file=sys.stderr)
+            return 1
+        return asyncio.run(fan_out(urls, script, args, headless, viewport))
 
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=headless, slow_mo=SLOW_MO)
-        context = browser.new_context(viewport=viewport)
+        browser = launch_browser(p, headless)
+        context = open_context(
+            browser, args, viewport=viewport, storage_state=load_state_path(args, args.url)
+        )
+        install_blocking(context, args.block, args.url)
         page = context.new_page()
         page.set_default_timeout(30_000)
         page.set_default_navigation_timeout(60_000)
 
         try:
-            page.goto(args.url, wait_until="networkidle")
+            start = time.monotonic()
+            goto(page, args.url, args)
+
+            if args.repl:
+                ms = round((time.monotonic() - start) * 1000)
+                print_ndjson({"ready": True, "url": page.url, "ms": ms})
+                run_repl(page, args)
+                save_state(context, args, args.url)
+                return 0
 
-            result = page.evaluate(script)
+            with span("evaluate"):
+                result = page.evaluate(script)
 
             if args.raw:
                 print(result)
@@ -97,6 +320,7 @@ Environment variables:
             else:
                 print(result)
 
+            save_state(context, args, args.url)
             return 0
 
         except Exception as e:
@@ -104,7 +328,7 @@ Environment variables:
             return 1
 
         finally:
-            context.close()
+            close_context(context, args)
             browser.close()
 
 
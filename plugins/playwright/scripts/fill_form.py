@@ -6,25 +6,126 @@
 """Fill and submit forms."""
 
 import argparse
-import os
+import asyncio
+import csv
+import io
+import json
+import re
 import sys
-from datetime import datetime
-
-from playwright.sync_api import sync_playwright
-
-HEADLESS = os.getenv("HEADLESS", "0").lower() in ("1", "true", "yes")
-SLOW_MO = int(os.getenv("SLOW_MO", "0"))
-
-
-def parse_viewport(value: str) -> dict | None:
-    """Parse viewport string like '1280x720' into dict."""
-    if not value:
-        return None
-    try:
-        w, h = value.lower().split("x", 1)
-        return {"width": int(w), "height": int(h)}
-    except Exception:
-        return None
+import time
+from pathlib import Path
+from typing import TextIO
+
+from runtime import (
+    HEADLESS,
+    add_har_arguments,
+    add_image_arguments,
+    add_state_arguments,
+    add_trace_arguments,
+    add_wait_arguments,
+    async_playwright,
+    check_image_arguments,
+    close_context,
+    close_context_async,
+    env_viewport,
+    goto,
+    goto_async,
+    image_options,
+    launch_browser,
+    launch_browser_async,
+    load_state_path,
+    open_context,
+    open_context_async,
+    print_ndjson,
+    ref_locator,
+    resolve_refs,
+    resolve_refs_async,
+    run_bounded,
+    save_error_screenshot,
+    save_state,
+    span,
+    sync_playwright,
+    wait_ready,
+    wait_ready_async,
+)
+
+SUBMIT_SELECTOR = "button[type='submit'], input[type='submit']"
+
+
+# Resolves every --field name in one round trip, using the same priority as
+# Playwright's locators: label text (incl. aria-label/aria-labelledby), then
+# placeholder (both case-insensitive substring), then name attribute, then id.
+# Matches are tagged with data-pw-field so they can be filled afterwards.
+# Only visible, enabled, editable plain-text inputs and textareas are marked for
+# the batch: types such as number or date silently drop values they reject.
+RESOLVE_FIELDS_JS = """
+(names) => {
+  const norm = s => (s || '').replace(/\\s+/g, ' ').trim().toLowerCase();
+  const textTypes = new Set(['text', 'search', 'email', 'url', 'tel', 'password']);
+  const batchable = el => {
+    if (!(el.tagName === 'TEXTAREA' || (el.tagName === 'INPUT' && textTypes.has(el.type)))) return false;
+    if (el.matches(':disabled') || el.readOnly || el.getAttribute('aria-disabled') === 'true') return false;
+    const rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility === 'visible';
+  };
+  const labelled = Array.from(document.querySelectorAll(
+    'input, textarea, select, [contenteditable], [role], [aria-label], [aria-labelledby]'
+  )).map(el => {
+    const texts = Array.from(el.labels || [], l => l.textContent);
+    texts.push(el.getAttribute('aria-label'));
+    for (const id of (el.getAttribute('aria-labelledby') || '').split(/\\s+/)) {
+      const ref = id && document.getElementById(id);
+      if (ref) texts.push(ref.textContent);
+    }
+    return [el, texts.filter(Boolean).map(norm)];
+  });
+  const withPlaceholder = Array.from(document.querySelectorAll('[placeholder]'));
+
+  return names.map((name, index) => {
+    const needle = norm(name);
+    const candidates = [
+      ['label', () => (labelled.find(([, texts]) => texts.some(t => t.includes(needle))) || [])[0]],
+      ['placeholder', () => withPlaceholder.find(el => norm(el.getAttribute('placeholder')).includes(needle))],
+      ['name', () => document.getElementsByName(name)[0]],
+      ['id', () => document.getElementById(name)],
+    ];
+    for (const [strategy, find] of candidates) {
+      const el = find();
+      if (!el) continue;
+      const tags = (el.getAttribute('data-pw-field') || '').split(' ').filter(Boolean);
+      el.setAttribute('data-pw-field', [...tags, String(index)].join(' '));
+      return {strategy, batch: batchable(el)};
+    }
+    return null;
+  });
+}
+"""
+
+# Sets plain text inputs in one round trip. The native value setter is used so
+# framework-controlled inputs (React, Vue) see the change, and input/change
+# events are dispatched as they would be after typing. Focus is left on the
+# last field so the Enter-to-submit fallback still works. Returns the indexes
+# whose value didn't stick (the element went away, or a handler rewrote it) so
+# they can be retried through Locator.fill().
+BATCH_FILL_JS = """
+(items) => {
+  const failed = [];
+  for (const [index, value] of items) {
+    const el = document.querySelector(`[data-pw-field~="${index}"]`);
+    if (!el || el.matches(':disabled') || el.readOnly) {
+      failed.push(index);
+      continue;
+    }
+    const proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    el.focus();
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    if (el.value !== value) failed.push(index);
+  }
+  return failed;
+}
+"""
 
 
 def parse_field(field: str) -> tuple[str, str]:
@@ -35,6 +136,170 @@ def parse_field(field: str) -> tuple[str, str]:
     return name.strip(), value
 
 
+def parse_ref(item: str) -> tuple[str, str]:
+    """Parse a 'ref=value' pair such as 'e12=hello' (refs come from navigate.py --a11y)."""
+    ref, value = parse_field(item)
+    ref = ref.strip("[]")
+    if not re.fullmatch(r"e\d+", ref):
+        raise ValueError(f"Invalid ref: {ref}. Use a ref from navigate.py --a11y, like e12")
+    return ref, value
+
+
+def batch_items(fields: list[tuple[str, str]], matches: list[dict | None]) -> list[list]:
+    """Return [index, value] pairs for the fields RESOLVE_FIELDS_JS marked as batchable."""
+    return [
+        [index, value]
+        for index, ((_, value), match) in enumerate(zip(fields, matches))
+        if match and match["batch"]
+    ]
+
+
+def fill_fields(page, fields: list[tuple[str, str]]) -> None:
+    """Resolve and fill name=value fields with as few page round trips as possible.
+
+    Visible, enabled text inputs and textareas are filled in a single batch;
+    anything else (selects, number or date inputs, contenteditable, hidden,
+    disabled or read-only controls), and any batched value that didn't stick,
+    goes through Locator.fill() so Playwright's own checks and errors apply.
+    """
+    matches = page.evaluate(RESOLVE_FIELDS_JS, [name for name, _ in fields])
+
+    batch = batch_items(fields, matches)
+    unapplied = set(page.evaluate(BATCH_FILL_JS, batch)) if batch else set()
+
+    for index, ((name, value), match) in enumerate(zip(fields, matches)):
+        if match is None:
+            print(f"  Warning: Could not find field: {name}", file=sys.stderr)
+            continue
+        if not match["batch"] or index in unapplied:
+            page.locator(f'[data-pw-field~="{index}"]').first.fill(value)
+        print(f"  Filled by {match['strategy']}: {name}")
+
+
+async def fill_fields_async(page, fields: list[tuple[str, str]]) -> list[str]:
+    """Async counterpart of fill_fields(); returns the names of fields that weren't found."""
+    matches = await page.evaluate(RESOLVE_FIELDS_JS, [name for name, _ in fields])
+
+    batch = batch_items(fields, matches)
+    unapplied = set(await page.evaluate(BATCH_FILL_JS, batch)) if batch else set()
+
+    for index, ((_, value), match) in enumerate(zip(fields, matches)):
+        if match and (not match["batch"] or index in unapplied):
+            await page.locator(f'[data-pw-field~="{index}"]').first.fill(value)
+    return [name for (name, _), match in zip(fields, matches) if match is None]
+
+
+async def submit_async(page, args: argparse.Namespace) -> None:
+    """Click the form's submit button (or press Enter) and wait for readiness."""
+    submit_btn = page.get_by_role("button", name="submit")
+    if await submit_btn.count() == 0:
+        submit_btn = page.locator(SUBMIT_SELECTOR)
+
+    with span("submit", url=page.url):
+        if await submit_btn.count() > 0:
+            await submit_btn.first.click()
+        else:
+            await page.keyboard.press("Enter")
+    await wait_ready_async(page, args)
+
+
+def read_rows(source: str) -> list[dict]:
+    """Read rows from a CSV file with a header line or from NDJSON ('-' for stdin)."""
+    text = sys.stdin.read() if source == "-" else Path(source).read_text()
+    if not text.lstrip().startswith("{"):
+        return list(csv.DictReader(io.StringIO(text)))
+
+    rows = [json.loads(line) for line in text.splitlines() if line.strip()]
+    for number, row in enumerate(rows, 1):
+        if not isinstance(row, dict):
+            raise ValueError(f"Row {number} is not a JSON object")
+    return rows
+
+
+def row_fields(
+    row: dict, mapping: dict[str, str], defaults: list[tuple[str, str]]
+) -> list[tuple[str, str]]:
+    """Turn a row into (field, value) pairs.
+
+    Columns are renamed through mapping (an empty target drops the column);
+    empty cells are skipped, and --field values fill in whatever a row lacks.
+    """
+    values = dict(defaults)
+    for column, value in row.items():
+        field = mapping.get(column, column)
+        if field and value is not None and value != "":
+            values[field] = str(value)
+    return list(values.items())
+
+
+async def fill_rows(
+    rows: list[dict],
+    args: argparse.Namespace,
+    headless: bool,
+    viewport: dict,
+    mapping: dict[str, str],
+    defaults: list[tuple[str, str]],
+    refs: list[tuple[str, str]],
+    results: TextIO,
+) -> int:
+    """Fill (and submit) the form once per row, each in its own context on one browser."""
+    storage_state = load_state_path(args, args.url)
+    failed = 0
+
+    async def fill_row(page, row: dict) -> None:
+        await goto_async(page, args.url, args)
+        with span("fill", url=args.url):
+            missing = await fill_fields_async(page, row_fields(row, mapping, defaults))
+        if missing:
+            raise ValueError(f"Could not find field(s): {', '.join(missing)}")
+        if refs:
+            missing = await resolve_refs_async(page, [ref for ref, _ in refs])
+            if missing:
+                raise ValueError(f"Could not find ref(s): {', '.join(missing)}")
+            for ref, value in refs:
+                await ref_locator(page, ref).fill(value)
+        for selector, value in zip(args.selector, args.value):
+            await page.locator(selector).fill(value)
+        if args.submit:
+            await submit_async(page, args)
+        if args.expect:
+            with span("expect", url=args.url):
+                await page.wait_for_selector(args.expect, state="visible")
+
+    async with async_playwright() as p:
+        browser = await launch_browser_async(p, headless)
+
+        async def run_row(item: tuple[int, dict]) -> dict:
+            number, row = item
+            start = time.monotonic()
+            record = {"row": number, "ok": True}
+            context = await open_context_async(
+                browser, args, viewport=viewport, storage_state=storage_state
+            )
+            page = await context.new_page()
+            page.set_default_navigation_timeout(args.timeout * 1000)
+            try:
+                await asyncio.wait_for(fill_row(page, row), args.timeout)
+            except Exception as e:
+                record["ok"] = False
+                record["error"] = str(e) or type(e).__name__
+            finally:
+                record["url"] = page.url
+                record["ms"] = round((time.monotonic() - start) * 1000)
+                await close_context_async(context, args)
+            return record
+
+        try:
+            async for record in run_bounded(enumerate(rows, 1), run_row, args.concurrency):
+                failed += not record["ok"]
+                print_ndjson(record, results)
+        finally:
+            await browser.close()
+
+    print(f"{len(rows) - failed} of {len(rows)} row(s) succeeded", file=sys.stderr)
+    return 0 if failed == 0 else 1
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Fill and submit forms",
@@ -46,18 +311,39 @@ Examples:
     --field "password=secret123" \\
     --submit
 
+  fill_form.py https://example.com/login \\
+    --field "email=test@example.com" --field "password=secret123" \\
+    --submit --save-state          # later: navigate.py ... --load-state
+
   fill_form.py https://example.com/search \\
     --field "q=search query" \\
     --submit \\
     --screenshot /tmp/results.png
 
+  fill_form.py https://example.com/signup --rows accounts.csv \\
+    --map mail=email --field "country=NZ" --submit \\
+    --concurrency 8 --results /tmp/signup.ndjson --headless
+
+Data-driven mode:
+  --rows reads a CSV file with a header line, or NDJSON objects, and fills the
+  form once per row in its own isolated browser context. Columns are used as
+  field names unless renamed with --map COLUMN=FIELD (--map COLUMN= drops one);
+  --field values apply to every row that doesn't set them. One result per row
+  is written as NDJSON: {"row", "ok", "url", "ms", "error"}. Add --expect
+  SELECTOR to fail rows whose submit doesn't show a success element;
+  --wait-for only applies to page readiness, including before the form is filled.
+
 Field matching:
-  Fields are matched by: name attribute, label text, placeholder, or aria-label.
+  Fields are matched by label text (or aria-label), then placeholder, then
+  name attribute, then id. All fields are resolved in a single page call.
   For complex forms, use CSS selectors: --selector "input#email" --value "test@example.com"
+  or refs from `navigate.py URL --a11y`: --ref "e7=test@example.com". Refs are
+  positions in document order, so they hold while the page renders the same way.
 
 Environment variables:
   HEADLESS=1    Run browser in headless mode
   SLOW_MO=250   Slow down actions by 250ms
+  PLAYWRIGHT_DAEMON=0  Don't connect to a running daemon.py browser
 """,
     )
     parser.add_argument("url", help="URL of the form")
@@ -80,117 +366,154 @@ Environment variables:
         default=[],
         help="Value for selector (pairs with --selector)",
     )
+    parser.add_argument(
+        "--ref",
+        action="append",
+        default=[],
+        metavar="REF=VALUE",
+        help="Fill the element with this navigate.py --a11y ref (e.g. e7=hello). Can be repeated.",
+    )
     parser.add_argument("--submit", action="store_true", help="Submit the form after filling")
+    parser.add_argument(
+        "--expect",
+        metavar="SELECTOR",
+        help="After submitting, fail unless SELECTOR becomes visible (e.g. a success message)",
+    )
     parser.add_argument("--screenshot", help="Take screenshot after filling")
     parser.add_argument("--headless", action="store_true", help="Run in headless mode")
+    rows = parser.add_argument_group("data-driven mode")
+    rows.add_argument("--rows", metavar="FILE", help="CSV or NDJSON rows to submit ('-' for stdin)")
+    rows.add_argument(
+        "--map",
+        action="append",
+        default=[],
+        metavar="COLUMN=FIELD",
+        help="Fill FIELD from COLUMN (repeatable)",
+    )
+    rows.add_argument(
+        "--concurrency", type=int, default=4, help="Rows submitted in parallel (default: 4)"
+    )
+    rows.add_argument("--timeout", type=float, default=60, help="Per-row timeout in seconds")
+    rows.add_argument(
+        "--results", default="-", metavar="FILE", help="Results file (default: stdout)"
+    )
+    add_image_arguments(parser, region=False)
+    add_har_arguments(parser)
+    add_trace_arguments(parser)
+    add_state_arguments(parser)
+    add_wait_arguments(parser)
     args = parser.parse_args()
 
+    check_image_arguments(parser, args, args.screenshot)
+    if args.expect and not args.submit:
+        parser.error("--expect requires --submit")
+
     if len(args.selector) != len(args.value):
         print("Error: --selector and --value must be paired", file=sys.stderr)
         return 1
 
+    try:
+        fields = [parse_field(field) for field in args.field]
+        refs = [parse_ref(item) for item in args.ref]
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
     headless = HEADLESS or args.headless
-    viewport = parse_viewport(os.getenv("VIEWPORT", "")) or {"width": 1280, "height": 720}
+    viewport = env_viewport()
+
+    if args.rows:
+        for option in ("screenshot", "save_state", "record_har"):
+            if getattr(args, option):
+                parser.error(f"--{option.replace('_', '-')} can't be combined with --rows")
+        try:
+            mapping = dict(parse_field(item) for item in args.map)
+            rows = read_rows(args.rows)
+        except (OSError, ValueError, csv.Error) as e:
+            print(f"Error reading rows: {e}", file=sys.stderr)
+            return 1
+        if args.results == "-":
+            return asyncio.run(
+                fill_rows(rows, args, headless, viewport, mapping, fields, refs, sys.stdout)
+            )
+        with open(args.results, "w") as results:
+            return asyncio.run(
+                fill_rows(rows, args, headless, viewport, mapping, fields, refs, results)
+            )
 
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=headless, slow_mo=SLOW_MO)
-        context = browser.new_context(viewport=viewport)
+        browser = launch_browser(p, headless)
+        context = open_context(
+            browser, args, viewport=viewport, storage_state=load_state_path(args, args.url)
+        )
         page = context.new_page()
         page.set_default_timeout(30_000)
         page.set_default_navigation_timeout(60_000)
 
         try:
-            page.goto(args.url, wait_until="networkidle")
-
-            # Fill by name/label/placeholder
-            for field in args.field:
-                try:
-                    name, value = parse_field(field)
-
-                    # Try different locator strategies
-                    filled = False
-
-                    # Try by label
-                    label_locator = page.get_by_label(name)
-                    if label_locator.count() > 0:
-                        label_locator.first.fill(value)
-                        print(f"  Filled by label: {name}")
-                        filled = True
-
-                    # Try by placeholder
-                    if not filled:
-                        placeholder_locator = page.get_by_placeholder(name)
-                        if placeholder_locator.count() > 0:
-                            placeholder_locator.first.fill(value)
-                            print(f"  Filled by placeholder: {name}")
-                            filled = True
-
-                    # Try by name attribute
-                    if not filled:
-                        name_locator = page.locator(f"[name='{name}']")
-                        if name_locator.count() > 0:
-                            name_locator.first.fill(value)
-                            print(f"  Filled by name: {name}")
-                            filled = True
-
-                    # Try by id
-                    if not filled:
-                        id_locator = page.locator(f"#{name}")
-                        if id_locator.count() > 0:
-                            id_locator.first.fill(value)
-                            print(f"  Filled by id: {name}")
-                            filled = True
-
-                    if not filled:
-                        print(f"  Warning: Could not find field: {name}", file=sys.stderr)
-
-                except ValueError as e:
-                    print(f"Error: {e}", file=sys.stderr)
-                    return 1
+            goto(page, args.url, args)
+
+            # Fill by label/placeholder/name/id
+            if fields:
+                with span("fill", fields=len(fields)):
+                    fill_fields(page, fields)
 
             # Fill by CSS selector
             for selector, value in zip(args.selector, args.value):
                 page.locator(selector).fill(value)
                 print(f"  Filled selector: {selector}")
 
+            # Fill by snapshot ref
+            if refs:
+                with span("fill", refs=len(refs)):
+                    missing = resolve_refs(page, [ref for ref, _ in refs])
+                    for ref, value in refs:
+                        if ref in missing:
+                            print(f"  Warning: Could not find ref: {ref}", file=sys.stderr)
+                            continue
+                        ref_locator(page, ref).fill(value)
+                        print(f"  Filled by ref: {ref}")
+
             # Submit if requested
             if args.submit:
                 # Try to find and click submit button
                 submit_btn = page.get_by_role("button", name="submit")
                 if submit_btn.count() == 0:
-                    submit_btn = page.locator("button[type='submit'], input[type='submit']")
+                    submit_btn = page.locator(SUBMIT_SELECTOR)
 
                 if submit_btn.count() > 0:
-                    submit_btn.first.click()
-                    page.wait_for_load_state("networkidle")
+                    with span("submit"):
+                        submit_btn.first.click()
+                    wait_ready(page, args)
                     print("  Form submitted")
                 else:
                     # Try pressing Enter on last filled field
-                    page.keyboard.press("Enter")
-                    page.wait_for_load_state("networkidle")
+                    with span("submit"):
+                        page.keyboard.press("Enter")
+                    wait_ready(page, args)
                     print("  Pressed Enter to submit")
 
+                if args.expect:
+                    with span("expect"):
+                        page.wait_for_selector(args.expect, state="visible")
+                    print(f"  Found expected element: {args.expect}")
+
             # Screenshot if requested
             if args.screenshot:
-                page.screenshot(path=args.screenshot, full_page=True)
+                page.screenshot(path=args.screenshot, full_page=True, **image_options(args))
                 print(f"Screenshot: {args.screenshot}")
 
             print(f"\nFinal URL: {page.url}")
+            save_state(context, args, args.url)
             return 0
 
         except Exception as e:
             print(f"Error: {e}", file=sys.stderr)
-            ts = datetime.now().strftime("%Y%m%d-%H%M%S")
-            error_path = f"/tmp/form-error-{ts}.png"
-            try:
-                page.screenshot(path=error_path)
-                print(f"Error screenshot: {error_path}", file=sys.stderr)
-            except Exception:
-                pass
+            save_error_screenshot(page, args, "form-error")
             return 1
 
         finally:
-            context.close()
+            close_context(context, args)
             browser.close()
 
 
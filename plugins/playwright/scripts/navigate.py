@@ -7,24 +7,408 @@
 
 import argparse
 import json
-import os
+import math
+import re
+import statistics
 import sys
+from urllib.parse import urlsplit
 
-from playwright.sync_api import sync_playwright
+from runtime import (
+    HEADLESS,
+    SNAPSHOT_JS,
+    add_block_arguments,
+    add_har_arguments,
+    add_state_arguments,
+    add_trace_arguments,
+    add_wait_arguments,
+    close_context,
+    env_viewport,
+    goto,
+    install_blocking,
+    launch_browser,
+    load_state_path,
+    open_context,
+    print_ndjson,
+    save_state,
+    span,
+    sync_playwright,
+)
 
-HEADLESS = os.getenv("HEADLESS", "0").lower() in ("1", "true", "yes")
-SLOW_MO = int(os.getenv("SLOW_MO", "0"))
+# Streaming extraction: EXTRACT_START_JS collects the candidate links or text
+# lines once and parks them in the page; EXTRACT_NEXT_JS then hands out
+# records a chunk at a time, applying --offset and --dedupe in the page so
+# skipped records never cross the wire.
+EXTRACT_START_JS = """
+([kind, selector, offset, dedupe]) => {
+    const roots = selector ? Array.from(document.querySelectorAll(selector)) : [document.body];
+    const items = kind === 'links'
+        ? roots.flatMap(root => [
+            ...(root.matches('a[href]') ? [root] : []),
+            ...root.querySelectorAll('a[href]'),
+        ])
+        : roots.flatMap(root => root.innerText.split('\\n')).map(line => line.trim()).filter(Boolean);
+    window.__playwrightExtract = {
+        kind, items, next: 0, skip: offset, seen: dedupe ? new Set() : null,
+    };
+    return items.length;
+}
+"""
 
+EXTRACT_NEXT_JS = """
+(count) => {
+    const state = window.__playwrightExtract;
+    const records = [];
+    while (records.length < count && state.next < state.items.length) {
+        const item = state.items[state.next++];
+        let record = {text: item};
+        if (state.kind === 'links') {
+            const href = typeof item.href === 'string'
+                ? item.href
+                : new URL(item.href.baseVal, document.baseURI).href;
+            if (!href) continue;
+            if (state.seen) {
+                if (state.seen.has(href)) continue;
+                state.seen.add(href);
+            }
+            record = {text: item.textContent?.trim() || '', href};
+        }
+        if (state.skip > 0) {
+            state.skip--;
+            continue;
+        }
+        records.push(record);
+    }
+    return records;
+}
+"""
 
-def parse_viewport(value: str) -> dict | None:
-    """Parse viewport string like '1280x720' into dict."""
-    if not value:
-        return None
+# Collected after the readiness wait. LCP and layout shifts are only exposed to
+# PerformanceObservers, whose buffered entries arrive asynchronously.
+METRICS_JS = """
+() => new Promise(resolve => {
+    const ms = value => Math.round(value * 10) / 10;
+    let lcp = null;
+    let cls = 0;
+    const observe = (type, callback) => {
+        try {
+            new PerformanceObserver(list => list.getEntries().forEach(callback))
+                .observe({type, buffered: true});
+        } catch (e) {}
+    };
+    observe('largest-contentful-paint', entry => { lcp = entry.startTime; });
+    observe('layout-shift', entry => { if (!entry.hadRecentInput) cls += entry.value; });
+
+    setTimeout(() => {
+        const nav = performance.getEntriesByType('navigation')[0];
+        const paint = Object.fromEntries(
+            performance.getEntriesByType('paint').map(entry => [entry.name, entry.startTime])
+        );
+
+        const resources = {count: 0, transfer_bytes: 0, decoded_bytes: 0, by_type: {}};
+        for (const entry of performance.getEntriesByType('resource')) {
+            const type = resources.by_type[entry.initiatorType] ||=
+                {count: 0, transfer_bytes: 0, slowest_ms: 0};
+            type.count += 1;
+            type.transfer_bytes += entry.transferSize;
+            type.slowest_ms = Math.max(type.slowest_ms, ms(entry.duration));
+            resources.count += 1;
+            resources.transfer_bytes += entry.transferSize;
+            resources.decoded_bytes += entry.decodedBodySize;
+        }
+
+        resolve({
+            navigation: nav ? {
+                dns_ms: ms(nav.domainLookupEnd - nav.domainLookupStart),
+                connect_ms: ms(nav.connectEnd - nav.connectStart),
+                ttfb_ms: ms(nav.responseStart),
+                download_ms: ms(nav.responseEnd - nav.responseStart),
+                dom_interactive_ms: ms(nav.domInteractive),
+                dom_content_loaded_ms: ms(nav.domContentLoadedEventEnd),
+                load_ms: ms(nav.loadEventEnd),
+                transfer_bytes: nav.transferSize,
+                decoded_bytes: nav.decodedBodySize,
+            } : null,
+            paint: {
+                first_paint_ms: paint['first-paint'] != null ? ms(paint['first-paint']) : null,
+                first_contentful_paint_ms:
+                    paint['first-contentful-paint'] != null ? ms(paint['first-contentful-paint']) : null,
+                largest_contentful_paint_ms: lcp != null ? ms(lcp) : null,
+                cumulative_layout_shift: Math.round(cls * 10000) / 10000,
+            },
+            resources,
+        });
+    }, 50);
+})
+"""
+
+# Chrome's Performance.getMetrics counters worth reporting (durations are in seconds)
+CDP_METRICS = (
+    "Documents",
+    "Frames",
+    "Nodes",
+    "JSEventListeners",
+    "LayoutCount",
+    "RecalcStyleCount",
+    "LayoutDuration",
+    "RecalcStyleDuration",
+    "ScriptDuration",
+    "TaskDuration",
+    "JSHeapUsedSize",
+    "JSHeapTotalSize",
+)
+
+
+def measure(browser, args: argparse.Namespace, viewport: dict) -> dict:
+    """Load the URL in a fresh context (cold cache) and collect one metrics sample."""
+    context = open_context(
+        browser, args, viewport=viewport, storage_state=load_state_path(args, args.url)
+    )
+    install_blocking(context, args.block, args.url)
+    try:
+        page = context.new_page()
+        page.set_default_timeout(30_000)
+        page.set_default_navigation_timeout(60_000)
+        cdp = context.new_cdp_session(page)
+        cdp.send("Performance.enable")
+
+        goto(page, args.url, args)
+        with span("metrics"):
+            metrics = page.evaluate(METRICS_JS)
+        counters = {m["name"]: m["value"] for m in cdp.send("Performance.getMetrics")["metrics"]}
+        metrics["cdp"] = {name: counters[name] for name in CDP_METRICS if name in counters}
+        return metrics
+    finally:
+        close_context(context, args)
+
+
+def flatten(metrics: dict, prefix: str = "") -> dict[str, float]:
+    """Flatten nested metrics into dotted keys, keeping only numeric values."""
+    flat = {}
+    for key, value in metrics.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+
+def summarize(samples: list[dict]) -> dict:
+    """Reduce repeated samples to min/median/p75/p95/max per metric."""
+    series: dict[str, list[float]] = {}
+    for sample in samples:
+        for key, value in flatten(sample).items():
+            series.setdefault(key, []).append(value)
+
+    summary = {}
+    for key, values in series.items():
+        values.sort()
+        summary[key] = {
+            "min": values[0],
+            "median": round(statistics.median(values), 4),
+            "p75": percentile(values, 75),
+            "p95": percentile(values, 95),
+            "max": values[-1],
+            "n": len(values),
+        }
+    return summary
+
+
+SIZE_UNITS = {"": 1, "b": 1, "kb": 1024, "mb": 1024**2}
+
+# Playwright's request.resource_type values, plus "total" for the whole page
+BUDGET_TYPES = (
+    "total",
+    "document",
+    "stylesheet",
+    "image",
+    "media",
+    "font",
+    "script",
+    "texttrack",
+    "xhr",
+    "fetch",
+    "eventsource",
+    "websocket",
+    "manifest",
+    "other",
+)
+
+
+def parse_budget(value: str) -> tuple[str, int]:
+    """Parse a '[TYPE=]SIZE' budget such as 'script=300KB' or '1.5MB' (TYPE defaults to total)."""
+    kind, _, size = value.rpartition("=")
+    match = re.fullmatch(r"\s*([\d.]+)\s*([kmKM]?[bB]?)\s*", size)
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid budget {value!r}, expected [TYPE=]SIZE")
     try:
-        w, h = value.lower().split("x", 1)
-        return {"width": int(w), "height": int(h)}
-    except Exception:
-        return None
+        limit = float(match.group(1)) * SIZE_UNITS[match.group(2).lower()]
+    except (KeyError, ValueError):
+        raise argparse.ArgumentTypeError(f"invalid budget size {size!r}")
+    kind = kind.strip().lower() or "total"
+    if kind not in BUDGET_TYPES:
+        raise argparse.ArgumentTypeError(
+            f"unknown budget type {kind!r}, expected one of: {', '.join(BUDGET_TYPES)}"
+        )
+    return kind, int(limit)
+
+
+def network_entry(request, origin: float) -> dict:
+    """One waterfall row for a finished or failed request."""
+    timing = request.timing
+    start = timing["startTime"]
+    entry = {
+        "url": request.url,
+        "type": request.resource_type,
+        "method": request.method,
+        "start_ms": round(start - origin, 1) if start > 0 else None,
+        "ttfb_ms": round(timing["responseStart"], 1) if timing["responseStart"] >= 0 else None,
+        "ms": round(timing["responseEnd"], 1) if timing["responseEnd"] >= 0 else None,
+    }
+    if request.failure:
+        entry.update(status=None, transfer_bytes=0, body_bytes=0, error=request.failure)
+        return entry
+
+    response = request.response()
+    sizes = request.sizes()
+    body = sizes["responseBodySize"]
+    if not body and response:
+        # Responses fulfilled from a HAR replay report no wire size, and chunked or
+        # compressed ones often lack content-length; measure the body itself
+        try:
+            body = len(response.body())
+        except Exception:
+            body = 0  # redirects and evicted bodies have none to measure
+    entry.update(
+        status=response.status if response else None,
+        transfer_bytes=sizes["responseHeadersSize"] + body,
+        body_bytes=body,
+    )
+    return entry
+
+
+def network_report(requests: list, args: argparse.Namespace) -> dict:
+    """Summarize the page's requests: totals per type and domain, heaviest and slowest."""
+    requests = [r for r in requests if not r.url.startswith(("data:", "blob:"))]
+    origin = min((r.timing["startTime"] for r in requests if r.timing["startTime"] > 0), default=0)
+    entries = [network_entry(request, origin) for request in requests]
+    entries.sort(key=lambda e: e["start_ms"] if e["start_ms"] is not None else math.inf)
+
+    def totals(key) -> dict:
+        groups: dict[str, dict] = {}
+        for entry in entries:
+            group = groups.setdefault(key(entry), {"requests": 0, "transfer_bytes": 0})
+            group["requests"] += 1
+            group["transfer_bytes"] += entry["transfer_bytes"]
+        return dict(sorted(groups.items(), key=lambda item: -item[1]["transfer_bytes"]))
+
+    def brief(entry: dict) -> dict:
+        return {k: entry[k] for k in ("url", "type", "status", "transfer_bytes", "ms")}
+
+    by_type = totals(lambda e: e["type"])
+    total = sum(entry["transfer_bytes"] for entry in entries)
+    report = {
+        "url": args.url,
+        "requests": len(entries),
+        "failed": sum("error" in entry for entry in entries),
+        "transfer_bytes": total,
+        "finished_ms": max(
+            (
+                e["start_ms"] + e["ms"]
+                for e in entries
+                if e["start_ms"] is not None and e["ms"] is not None
+            ),
+            default=None,
+        ),
+        "by_type": by_type,
+        "by_domain": totals(lambda e: urlsplit(e["url"]).hostname or ""),
+        "heaviest": [brief(e) for e in sorted(entries, key=lambda e: -e["transfer_bytes"])][
+            : args.top
+        ],
+        "slowest": [brief(e) for e in sorted(entries, key=lambda e: -(e["ms"] or 0)) if e["ms"]][
+            : args.top
+        ],
+        "errors": [
+            {"url": e["url"], "type": e["type"], "error": e["error"]}
+            for e in entries
+            if "error" in e
+        ],
+    }
+    if args.budget:
+        report["budget"] = []
+        for kind, limit in args.budget:
+            actual = total if kind == "total" else by_type.get(kind, {}).get("transfer_bytes", 0)
+            report["budget"].append(
+                {
+                    "type": kind,
+                    "limit_bytes": limit,
+                    "transfer_bytes": actual,
+                    "ok": actual <= limit,
+                }
+            )
+    if args.waterfall:
+        report["waterfall"] = entries
+    return report
+
+
+# Boolean states shown as [flag]; for those in FALSE_FLAGS false is shown too
+STATE_FLAGS = ("checked", "pressed", "expanded", "selected", "disabled", "required")
+FALSE_FLAGS = {"expanded": "collapsed", "pressed": "not pressed"}
+
+
+def render_snapshot(snapshot: dict) -> str:
+    """Render an accessibility snapshot as a compact indented outline, one element per line."""
+    lines = [f"# {snapshot['title']} ({snapshot['url']})"]
+
+    def walk(nodes: list[dict], depth: int) -> None:
+        for node in nodes:
+            line = f"{'  ' * depth}- {node['role']}"
+            if node.get("name"):
+                line += f" {json.dumps(node['name'], ensure_ascii=False)}"
+            line += f" [{node['ref']}]"
+            for flag in STATE_FLAGS:
+                value = node.get(flag)
+                if value is True:
+                    line += f" [{flag}]"
+                elif value == "mixed":
+                    line += f" [{flag}=mixed]"
+                elif value is False and flag in FALSE_FLAGS:
+                    line += f" [{FALSE_FLAGS[flag]}]"
+            if "value" in node:
+                line += f" = {json.dumps(node['value'], ensure_ascii=False)}"
+            if "options" in node:
+                line += f" (options: {' | '.join(node['options'])})"
+            if "url" in node:
+                line += f" -> {node['url']}"
+            lines.append(line)
+            walk(node.get("children", []), depth + 1)
+            if node.get("omitted"):
+                lines.append(f"{'  ' * (depth + 1)}- ... {node['omitted']} more below --max-depth")
+
+    walk(snapshot["children"], 0)
+    if snapshot.get("omitted"):
+        lines.append(f"- ... {snapshot['omitted']} more below --max-depth")
+    if snapshot["truncated"]:
+        lines.append(f"# stopped at --max-nodes ({snapshot['nodes']} elements)")
+    return "\n".join(lines)
+
+
+def iter_records(page, kind: str, args: argparse.Namespace):
+    """Yield link or text-line records from the page, fetched in chunks."""
+    page.evaluate(EXTRACT_START_JS, [kind, args.selector, args.offset, args.dedupe])
+    remaining = args.limit
+    while remaining is None or remaining > 0:
+        count = args.chunk_size if remaining is None else min(args.chunk_size, remaining)
+        chunk = page.evaluate(EXTRACT_NEXT_JS, count)
+        yield from chunk
+        if remaining is not None:
+            remaining -= len(chunk)
+        if len(chunk) < count:
+            break
 
 
 def main() -> int:
@@ -38,10 +422,35 @@ Examples:
   navigate.py https://example.com --links   # All links as JSON
   navigate.py https://example.com --text    # Page text content
   navigate.py https://example.com --html    # Page HTML
+  navigate.py https://example.com --a11y    # Interactive/landmark outline with element refs
+  navigate.py https://example.com --links --ndjson --dedupe --limit 100
+  navigate.py https://example.com --text --ndjson --selector main --offset 200 --limit 50
+  navigate.py https://example.com --text --block images,media,fonts,third-party
+  navigate.py https://example.com --metrics # Load timings, paints, resources, CDP counters
+  navigate.py https://example.com --metrics --repeat 10 --headless  # Medians/percentiles
+  navigate.py https://example.com --network --top 5   # Heaviest/slowest requests, totals
+  navigate.py https://example.com --network --replay-har site.har --budget 500KB --budget script=150KB
+
+Accessibility snapshot (--a11y, alias --snapshot):
+  A pruned accessibility tree: only interactive elements (links, buttons,
+  form controls, tabs, menu items...) and landmarks (banner, navigation, main,
+  form, region...), with roles, names, values and states. Each element gets a
+  ref such as [e12]: its index among such elements in document order, so the
+  same page loaded again hands out the same refs. fill_form.py --ref and
+  run_steps.py "ref" steps target elements by these refs.
+
+Network report (--network):
+  Every request the page makes until it is ready (per --wait-until) is
+  recorded with its type, status, timing and transfer size (headers + body).
+  The JSON report has totals per resource type and per domain, the --top
+  heaviest and slowest requests, and failed requests; --waterfall adds every
+  request in start order. Each --budget caps the transfer size of a resource
+  type (or the total); the exit code is 1 when any budget is exceeded.
 
 Environment variables:
   HEADLESS=1    Run browser in headless mode
   SLOW_MO=250   Slow down actions by 250ms
+  PLAYWRIGHT_DAEMON=0  Don't connect to a running daemon.py browser
 """,
     )
     parser.add_argument("url", help="URL to navigate to")
@@ -49,42 +458,193 @@ Environment variables:
     parser.add_argument("--links", action="store_true", help="Output all links as JSON")
     parser.add_argument("--text", action="store_true", help="Output page text content")
     parser.add_argument("--html", action="store_true", help="Output page HTML")
+    parser.add_argument(
+        "--selector", help="Limit --links, --text, --html and --a11y to elements matching SELECTOR"
+    )
+    snapshot = parser.add_argument_group("accessibility snapshot")
+    snapshot.add_argument(
+        "--a11y",
+        "--snapshot",
+        action="store_true",
+        help="Output interactive and landmark elements with refs as an outline",
+    )
+    snapshot.add_argument(
+        "--a11y-json", action="store_true", help="Output the --a11y snapshot as JSON instead"
+    )
+    snapshot.add_argument(
+        "--max-depth",
+        type=int,
+        default=12,
+        metavar="N",
+        help="Snapshot nesting limit (default: 12)",
+    )
+    snapshot.add_argument(
+        "--max-nodes",
+        type=int,
+        default=500,
+        metavar="N",
+        help="Snapshot size limit in elements (default: 500)",
+    )
+    stream = parser.add_argument_group("streaming output")
+    stream.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Stream --links or --text (one record per non-empty line) as NDJSON",
+    )
+    stream.add_argument("--limit", type=int, metavar="N", help="Stop after N records")
+    stream.add_argument(
+        "--offset", type=int, default=0, metavar="N", help="Skip the first N records"
+    )
+    stream.add_argument("--dedupe", action="store_true", help="Drop links with a repeated href")
+    stream.add_argument(
+        "--chunk-size",
+        type=int,
+        default=500,
+        metavar="N",
+        help="Records fetched from the page per round trip (default: 500)",
+    )
+    parser.add_argument(
+        "--metrics", action="store_true", help="Output page performance metrics as JSON"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        metavar="N",
+        help="With --metrics: load the page N times and report min/median/p75/p95/max",
+    )
+    network = parser.add_argument_group("network report")
+    network.add_argument(
+        "--network", action="store_true", help="Output a request size and timing report as JSON"
+    )
+    network.add_argument(
+        "--top", type=int, default=10, metavar="N", help="Heaviest/slowest requests to list"
+    )
+    network.add_argument(
+        "--waterfall", action="store_true", help="Include every request in start order"
+    )
+    network.add_argument(
+        "--budget",
+        action="append",
+        type=parse_budget,
+        default=[],
+        metavar="[TYPE=]SIZE",
+        help="Fail when TYPE (e.g. script, image; default: total) transfers more than SIZE "
+        "(e.g. 300KB, 1.5MB; repeatable)",
+    )
     parser.add_argument("--headless", action="store_true", help="Run in headless mode")
+    add_block_arguments(parser)
+    add_har_arguments(parser)
+    add_trace_arguments(parser)
+    add_state_arguments(parser)
+    add_wait_arguments(parser)
     args = parser.parse_args()
 
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    if args.repeat > 1 and not args.metrics:
+        parser.error("--repeat requires --metrics")
+    if args.ndjson and not (args.links or args.text):
+        parser.error("--ndjson requires --links or --text")
+    if (args.limit is not None or args.offset or args.dedupe) and not args.ndjson:
+        parser.error("--limit, --offset and --dedupe require --ndjson")
+    if (args.limit is not None and args.limit < 0) or args.offset < 0 or args.chunk_size < 1:
+        parser.error("--limit and --offset can't be negative and --chunk-size must be positive")
+    args.a11y = args.a11y or args.a11y_json
+    if args.a11y and (args.title or args.links or args.text or args.html or args.metrics):
+        parser.error("--a11y can't be combined with other output options")
+    if args.max_depth < 1 or args.max_nodes < 1:
+        parser.error("--max-depth and --max-nodes must be positive")
+    if args.network and (
+        args.metrics or args.title or args.links or args.text or args.html or args.a11y
+    ):
+        parser.error("--network can't be combined with --metrics or other output options")
+    if (args.budget or args.waterfall) and not args.network:
+        parser.error("--budget and --waterfall require --network")
+    if args.top < 0:
+        parser.error("--top can't be negative")
+
     headless = HEADLESS or args.headless
-    viewport = parse_viewport(os.getenv("VIEWPORT", "")) or {"width": 1280, "height": 720}
+    viewport = env_viewport()
 
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=headless, slow_mo=SLOW_MO)
-        context = browser.new_context(viewport=viewport)
+        browser = launch_browser(p, headless)
+
+        if args.metrics:
+            try:
+                samples = [measure(browser, args, viewport) for _ in range(args.repeat)]
+                if args.repeat == 1:
+                    report = {"url": args.url, **samples[0]}
+                else:
+                    report = {"url": args.url, "runs": args.repeat, "summary": summarize(samples)}
+                print(json.dumps(report, indent=2))
+                return 0
+            except Exception as e:
+                print(f"Error: {e}", file=sys.stderr)
+                return 1
+            finally:
+                browser.close()
+
+        context = open_context(
+            browser, args, viewport=viewport, storage_state=load_state_path(args, args.url)
+        )
+        install_blocking(context, args.block, args.url)
         page = context.new_page()
         page.set_default_timeout(30_000)
         page.set_default_navigation_timeout(60_000)
 
+        requests = []
+        if args.network:
+            page.on("requestfinished", requests.append)
+            page.on("requestfailed", requests.append)
+
         try:
-            page.goto(args.url, wait_until="networkidle")
-
-            if args.title:
-                print(page.title())
-            elif args.links:
-                links = page.evaluate("""
-                    () => Array.from(document.querySelectorAll('a')).map(a => ({
-                        text: a.textContent?.trim() || '',
-                        href: a.href
-                    })).filter(l => l.href)
-                """)
-                print(json.dumps(links, indent=2))
-            elif args.text:
-                text = page.evaluate("() => document.body.innerText")
-                print(text)
-            elif args.html:
-                html = page.content()
-                print(html)
-            else:
-                print(f"Title: {page.title()}")
-                print(f"URL: {page.url}")
+            goto(page, args.url, args)
+
+            if args.network:
+                with span("network_report", requests=len(requests)):
+                    report = network_report(requests, args)
+                print(json.dumps(report, indent=2))
+                save_state(context, args, args.url)
+                return 0 if all(b["ok"] for b in report.get("budget", [])) else 1
+
+            with span("extract"):
+                if args.title:
+                    print(page.title())
+                elif args.ndjson:
+                    for record in iter_records(page, "links" if args.links else "text", args):
+                        print_ndjson(record)
+                elif args.links:
+                    print(json.dumps(list(iter_records(page, "links", args)), indent=2))
+                elif args.text:
+                    if args.selector:
+                        print("\n".join(page.locator(args.selector).all_inner_texts()))
+                    else:
+                        print(page.evaluate("() => document.body.innerText"))
+                elif args.html:
+                    if args.selector:
+                        html = page.locator(args.selector).evaluate_all(
+                            "els => els.map(el => el.outerHTML)"
+                        )
+                        print("\n".join(html))
+                    else:
+                        print(page.content())
+                elif args.a11y:
+                    snapshot = page.evaluate(
+                        SNAPSHOT_JS,
+                        ["snapshot", [args.max_depth, args.max_nodes], args.selector],
+                    )
+                    if snapshot is None:
+                        raise ValueError(f"No element matches --selector {args.selector}")
+                    if args.a11y_json:
+                        print(json.dumps(snapshot, indent=2, ensure_ascii=False))
+                    else:
+                        print(render_snapshot(snapshot))
+                else:
+                    print(f"Title: {page.title()}")
+                    print(f"URL: {page.url}")
 
+            save_state(context, args, args.url)
             return 0
 
         except Exception as e:
@@ -92,7 +652,7 @@ Environment variables:
             return 1
 
         finally:
-            context.close()
+            close_context(context, args)
             browser.close()
 
 
@@ -0,0 +1,126 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.10"
+# dependencies = ["playwright==1.56.0", "pyyaml==6.0.2", "numpy==2.2.6", "pillow==11.3.0"]
+# ///
+"""Single entry point for all playwright scripts, sharing one uv environment."""
+
+import argparse
+import importlib
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Command name -> module in this directory; each module exposes main() -> int
+COMMANDS = {
+    "screenshot": "screenshot",
+    "navigate": "navigate",
+    "evaluate": "evaluate",
+    "fill-form": "fill_form",
+    "run-steps": "run_steps",
+    "crawl": "crawl",
+    "daemon": "daemon",
+    "check-setup": "check_setup",
+}
+
+# Imported by prewarm so their bytecode is compiled and cached ahead of time
+PREWARM_IMPORTS = [
+    "playwright.sync_api",
+    "playwright.async_api",
+    "yaml",
+    "numpy",
+    "PIL.Image",
+    "visual_diff",
+    *COMMANDS.values(),
+]
+
+
+def timed(report: dict, step: str, fn):
+    """Run fn, recording its duration in milliseconds under report[step]."""
+    start = time.monotonic()
+    try:
+        return fn()
+    finally:
+        report[step] = round((time.monotonic() - start) * 1000)
+
+
+def chromium_installed() -> bool:
+    from runtime import sync_playwright
+
+    with sync_playwright() as p:
+        return Path(p.chromium.executable_path).exists()
+
+
+def prewarm(argv: list[str]) -> int:
+    """Resolve the environment, compile imports and install Chromium ahead of the first run."""
+    parser = argparse.ArgumentParser(
+        prog="pw.py prewarm",
+        description="Prepare the environment so later commands start fast",
+    )
+    parser.add_argument(
+        "--no-install",
+        action="store_true",
+        help="Report a missing Chromium instead of installing it",
+    )
+    args = parser.parse_args(argv)
+
+    # Getting here means uv has already resolved and cached this script's environment
+    report = {"python": sys.executable, "ms": {}}
+    for module in PREWARM_IMPORTS:
+        timed(
+            report["ms"], f"import {module}", lambda module=module: importlib.import_module(module)
+        )
+
+    installed = timed(report["ms"], "driver", chromium_installed)
+    if not installed and not args.no_install:
+        result = timed(
+            report["ms"],
+            "install chromium",
+            lambda: subprocess.run(
+                [sys.executable, "-m", "playwright", "install", "chromium"], check=False
+            ),
+        )
+        installed = result.returncode == 0
+    report["chromium"] = installed
+
+    print(json.dumps(report, indent=2))
+    return 0 if installed else 1
+
+
+def main() -> int:
+    commands = ", ".join([*COMMANDS, "prewarm"])
+    if len(sys.argv) < 2 or sys.argv[1] in ("-h", "--help"):
+        print(
+            f"""usage: pw.py COMMAND [ARGS...]
+
+Run any playwright script through one shared, cached uv environment.
+
+Commands: {commands}
+
+Each command takes the same arguments as the script of the same name
+(fill-form runs fill_form.py). Use `pw.py COMMAND --help` for its options.
+
+Examples:
+  pw.py prewarm                          # Resolve deps, compile imports, install Chromium
+  pw.py navigate https://example.com --title --headless
+  pw.py screenshot https://example.com -o /tmp/shot.png --headless"""
+        )
+        return 0 if len(sys.argv) >= 2 else 2
+
+    command, argv = sys.argv[1], sys.argv[2:]
+    if command == "prewarm":
+        return prewarm(argv)
+
+    module_name = COMMANDS.get(command.removesuffix(".py").replace("_", "-"))
+    if not module_name:
+        print(f"pw.py: unknown command {command!r} (choose from {commands})", file=sys.stderr)
+        return 2
+
+    sys.argv = [f"{module_name}.py", *argv]
+    return importlib.import_module(module_name).main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
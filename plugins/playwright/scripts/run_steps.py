@@ -0,0 +1,278 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.10"
+# dependencies = ["playwright==1.56.0", "pyyaml==6.0.2"]
+# ///
+"""Run a list of browser steps in a single page."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import yaml
+from runtime import (
+    HEADLESS,
+    add_block_arguments,
+    add_har_arguments,
+    add_state_arguments,
+    add_trace_arguments,
+    add_wait_arguments,
+    close_context,
+    env_viewport,
+    goto,
+    install_blocking,
+    launch_browser,
+    load_state_path,
+    open_context,
+    ref_locator,
+    resolve_refs,
+    save_state,
+    span,
+    sync_playwright,
+    wait_ready,
+)
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Page
+
+EXTRACT_JS = {
+    "text": "el => el.innerText",
+    "html": "el => el.outerHTML",
+    "links": """el => Array.from(el.querySelectorAll('a')).map(a => ({
+        text: a.textContent?.trim() || '',
+        href: a.href
+    })).filter(l => l.href)""",
+}
+
+# Keys each action needs; TARGET stands for one of TARGET_KEYS
+TARGET = "selector, label, text or ref"
+TARGET_KEYS = ("selector", "label", "text", "ref")
+WAIT_KEYS = ("ms", "load_state", "url", *TARGET_KEYS)
+REQUIRED_KEYS = {
+    "goto": ("url",),
+    "fill": (TARGET, "value"),
+    "click": (TARGET,),
+    "wait": (),
+    "evaluate": ("script",),
+    "extract": (),
+    "screenshot": ("path",),
+}
+
+
+def load_steps(source: str) -> list[dict]:
+    """Load steps from a JSON or YAML file ('-' for stdin)."""
+    text = sys.stdin.read() if source == "-" else Path(source).read_text()
+    steps = yaml.safe_load(text)  # YAML is a superset of JSON
+    if isinstance(steps, dict):
+        steps = steps.get("steps")
+    if not isinstance(steps, list) or not steps:
+        raise ValueError("Expected a non-empty list of steps (or a mapping with a 'steps' list)")
+    for index, step in enumerate(steps, 1):
+        check_step(index, step)
+    return steps
+
+
+def check_step(index: int, step: object) -> None:
+    """Raise ValueError naming the step if it lacks keys its action needs."""
+    if not isinstance(step, dict) or "action" not in step:
+        raise ValueError(f"Step {index} needs an 'action'")
+    action = step["action"]
+    if action not in REQUIRED_KEYS:
+        raise ValueError(
+            f"Step {index}: unknown action {action!r} (expected {', '.join(REQUIRED_KEYS)})"
+        )
+    for key in REQUIRED_KEYS[action]:
+        if key == TARGET:
+            if not any(target in step for target in TARGET_KEYS):
+                raise ValueError(f"Step {index} ({action}) needs a {TARGET}")
+        elif key not in step:
+            raise ValueError(f"Step {index} ({action}) needs '{key}'")
+    if action == "wait" and not any(key in step for key in WAIT_KEYS):
+        raise ValueError(f"Step {index} (wait) needs ms, load_state, url or a {TARGET}")
+    if action == "extract" and step.get("what", "text") not in ("title", "url", *EXTRACT_JS):
+        raise ValueError(f"Step {index} (extract): unknown target {step['what']!r}")
+
+
+def locate(page: Page, step: dict):
+    """Resolve a step's target from 'selector', 'label', 'text' or a navigate.py --a11y 'ref'."""
+    if "ref" in step:
+        if resolve_refs(page, [step["ref"]]):
+            raise ValueError(f"Could not find ref: {step['ref']}")
+        return ref_locator(page, step["ref"])
+    if "selector" in step:
+        return page.locator(step["selector"]).first
+    if "label" in step:
+        return page.get_by_label(step["label"]).first
+    if "text" in step:
+        return page.get_by_text(step["text"]).first
+    raise ValueError("Step needs a 'selector', 'label', 'text' or 'ref'")
+
+
+def run_step(page: Page, step: dict, args: argparse.Namespace):
+    """Execute one step and return its result (None for actions without output)."""
+    action = step["action"]
+
+    if action == "goto":
+        goto(page, step["url"], args)
+        return page.url
+    if action == "fill":
+        locate(page, step).fill(str(step["value"]))
+        return None
+    if action == "click":
+        locate(page, step).click()
+        if step.get("wait", False):
+            wait_ready(page, args)
+        return None
+    if action == "wait":
+        if "ms" in step:
+            page.wait_for_timeout(step["ms"])
+        elif "load_state" in step:
+            page.wait_for_load_state(step["load_state"])
+        elif "url" in step:
+            page.wait_for_url(step["url"])
+        else:
+            locate(page, step).wait_for(state=step.get("state", "visible"))
+        return None
+    if action == "evaluate":
+        return page.evaluate(step["script"])
+    if action == "screenshot":
+        if "selector" in step:
+            page.locator(step["selector"]).first.screenshot(path=step["path"])
+        else:
+            page.screenshot(path=step["path"], full_page=step.get("full_page", False))
+        return step["path"]
+    if action == "extract":
+        what = step.get("what", "text")
+        if what == "title":
+            return page.title()
+        if what == "url":
+            return page.url
+        if what not in EXTRACT_JS:
+            raise ValueError(f"Unknown extract target: {what}")
+        return page.locator(step.get("selector", "body")).first.evaluate(EXTRACT_JS[what])
+    raise ValueError(f"Unknown action: {action}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Run a list of browser steps in a single page",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  run_steps.py flow.yaml --headless
+  cat flow.json | run_steps.py - --continue-on-error
+
+Steps file (YAML or JSON list, or a mapping with a "steps" list):
+  - action: goto
+    url: https://example.com/login
+  - action: fill
+    label: Email                 # or selector: "#email" / ref: e7 (navigate.py --a11y)
+    value: test@example.com
+  - action: click
+    selector: "button[type=submit]"
+    wait: true                   # apply the page-readiness options afterwards
+  - action: wait
+    selector: ".dashboard"       # or ms: 500 / load_state: networkidle / url: "**/home"
+  - action: evaluate
+    name: count                  # optional key for the result
+    script: document.querySelectorAll('li').length
+  - action: extract
+    what: links                  # title | url | text | html | links
+    selector: main
+  - action: screenshot
+    path: /tmp/dashboard.png
+    full_page: true
+
+Output is one JSON document with per-step timings and results.
+
+Environment variables:
+  HEADLESS=1    Run browser in headless mode
+  SLOW_MO=250   Slow down actions by 250ms
+  PLAYWRIGHT_DAEMON=0  Don't connect to a running daemon.py browser
+""",
+    )
+    parser.add_argument("steps", help="Steps file (JSON or YAML, '-' for stdin)")
+    parser.add_argument("--headless", action="store_true", help="Run in headless mode")
+    parser.add_argument(
+        "--continue-on-error", action="store_true", help="Keep running after a failed step"
+    )
+    add_block_arguments(parser)
+    add_har_arguments(parser)
+    add_trace_arguments(parser)
+    add_state_arguments(parser)
+    add_wait_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        steps = load_steps(args.steps)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        print(f"Error reading steps: {e}", file=sys.stderr)
+        return 1
+
+    # Session state and third-party blocking are keyed on the first URL visited
+    first_url = next((step["url"] for step in steps if step["action"] == "goto"), "")
+
+    headless = HEADLESS or args.headless
+    viewport = env_viewport()
+
+    results = []
+    failed = False
+    started = time.monotonic()
+
+    with sync_playwright() as p:
+        browser = launch_browser(p, headless)
+        context = open_context(
+            browser, args, viewport=viewport, storage_state=load_state_path(args, first_url)
+        )
+        install_blocking(context, args.block, first_url)
+        page = context.new_page()
+        page.set_default_timeout(30_000)
+        page.set_default_navigation_timeout(60_000)
+
+        try:
+            for index, step in enumerate(steps, 1):
+                record = {"index": index, "action": step["action"]}
+                if "name" in step:
+                    record["name"] = step["name"]
+                step_started = time.monotonic()
+                try:
+                    with span("step", action=step["action"], index=index):
+                        result = run_step(page, step, args)
+                    record["ok"] = True
+                    if result is not None:
+                        record["result"] = result
+                except Exception as e:
+                    failed = True
+                    record["ok"] = False
+                    record["error"] = str(e)
+                record["ms"] = round((time.monotonic() - step_started) * 1000)
+                results.append(record)
+                if failed and not args.continue_on_error:
+                    break
+
+            if not failed:
+                save_state(context, args, first_url)
+
+        finally:
+            final_url = page.url
+            close_context(context, args)
+            browser.close()
+
+    output = {
+        "ok": not failed,
+        "url": final_url,
+        "ms": round((time.monotonic() - started) * 1000),
+        "steps": results,
+        "outputs": {r["name"]: r.get("result") for r in results if "name" in r},
+    }
+    print(json.dumps(output, indent=2))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,968 @@
+"""Shared runtime helpers for the playwright scripts.
+
+Not a standalone script: imported by the PEP 723 scripts in this directory,
+which provide the playwright dependency. Playwright itself is only imported
+when a driver is started, so argument parsing, --help and usage errors stay fast.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import atexit
+import contextlib
+import json
+import os
+import sys
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Generator, Iterable
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, TextIO, TypeVar
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser as AsyncBrowser
+    from playwright.async_api import BrowserContext as AsyncBrowserContext
+    from playwright.async_api import Page as AsyncPage
+    from playwright.async_api import Playwright as AsyncPlaywright
+    from playwright.async_api import PlaywrightContextManager as AsyncPlaywrightContextManager
+    from playwright.async_api import Response as AsyncResponse
+    from playwright.async_api import Route as AsyncRoute
+    from playwright.sync_api import (
+        Browser,
+        BrowserContext,
+        Page,
+        Playwright,
+        PlaywrightContextManager,
+        Response,
+        Route,
+    )
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+HEADLESS = os.getenv("HEADLESS", "0").lower() in ("1", "true", "yes")
+SLOW_MO = int(os.getenv("SLOW_MO", "0"))
+
+# Set PLAYWRIGHT_DAEMON=0 to always launch a fresh browser
+USE_DAEMON = os.getenv("PLAYWRIGHT_DAEMON", "1").lower() not in ("0", "false", "no")
+# The state file hands out a CDP endpoint with full control of the browser, so it
+# lives in a per-user directory rather than world-writable /tmp
+DAEMON_STATE = Path(
+    os.getenv("PLAYWRIGHT_DAEMON_STATE")
+    or (
+        Path(os.environ["XDG_RUNTIME_DIR"]) / "playwright-daemon.json"
+        if os.getenv("XDG_RUNTIME_DIR")
+        else Path.home() / ".cache" / "playwright-skill" / "daemon.json"
+    )
+)
+
+# Per-origin storage-state cache used by --save-state/--load-state without a path
+STATE_DIR = Path(
+    os.getenv("PLAYWRIGHT_STATE_DIR") or Path.home() / ".cache" / "playwright-skill" / "state"
+)
+STATE_AUTO = "auto"
+
+WAIT_UNTIL_CHOICES = ("load", "domcontentloaded", "commit", "networkidle")
+
+# --block categories mapped to Playwright resource types
+BLOCK_RESOURCE_TYPES = {
+    "images": {"image"},
+    "media": {"media"},
+    "fonts": {"font"},
+    "stylesheets": {"stylesheet"},
+}
+
+# Resolves once the DOM has gone quietMs without mutations, or after maxMs at the latest
+DOM_QUIET_JS = """
+([quietMs, maxMs]) => new Promise(resolve => {
+    let quietTimer;
+    const done = () => {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(capTimer);
+        resolve();
+    };
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(done, quietMs);
+    });
+    observer.observe(document.documentElement || document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+    quietTimer = setTimeout(done, quietMs);
+    const capTimer = setTimeout(done, maxMs);
+})
+"""
+
+# Accessibility snapshot of interactive and landmark elements (ARIA role,
+# accessible name, value and state). Called with ["snapshot", [maxDepth,
+# maxNodes], rootSelector] it returns the pruned tree; with ["resolve", refs]
+# it tags the elements behind those refs with data-pw-ref and returns the
+# refs it found. Roles and names approximate the ARIA rules for common markup.
+SNAPSHOT_JS = """
+([mode, options, rootSelector]) => {
+    const LANDMARKS = new Set([
+        'banner', 'complementary', 'contentinfo', 'form', 'main', 'navigation', 'region', 'search',
+    ]);
+    const INTERACTIVE = new Set([
+        'button', 'checkbox', 'combobox', 'link', 'listbox', 'menuitem', 'menuitemcheckbox',
+        'menuitemradio', 'radio', 'searchbox', 'slider', 'spinbutton', 'switch', 'tab', 'textbox',
+        'treeitem',
+    ]);
+    const NAME_FROM_CONTENT = new Set([
+        'button', 'link', 'menuitem', 'menuitemcheckbox', 'menuitemradio', 'switch', 'tab', 'treeitem',
+    ]);
+    const TAG_ROLES = {
+        ASIDE: 'complementary', MAIN: 'main', NAV: 'navigation', FORM: 'form', SEARCH: 'search',
+        BUTTON: 'button', SUMMARY: 'button', TEXTAREA: 'textbox',
+    };
+    const INPUT_ROLES = {
+        button: 'button', submit: 'button', reset: 'button', image: 'button', file: 'button',
+        checkbox: 'checkbox', radio: 'radio', range: 'slider', number: 'spinbutton',
+        search: 'searchbox',
+    };
+    const BUTTON_INPUTS = new Set(['button', 'submit', 'reset', 'image', 'file']);
+    const SKIP = new Set(['SCRIPT', 'STYLE', 'TEMPLATE', 'NOSCRIPT', 'HEAD']);
+    const SECTIONING = 'article, aside, main, nav, section';
+    const clean = (s, max = 100) => {
+        s = (s || '').replace(/\\s+/g, ' ').trim();
+        return s.length > max ? s.slice(0, max - 1) + '…' : s;
+    };
+
+    const roleOf = el => {
+        const explicit = (el.getAttribute('role') || '').trim().split(/\\s+/)[0];
+        if (explicit) return explicit;
+        const tag = el.tagName;
+        if (tag === 'A' || tag === 'AREA') return el.hasAttribute('href') ? 'link' : null;
+        if (tag === 'INPUT') {
+            const type = (el.getAttribute('type') || 'text').toLowerCase();
+            return type === 'hidden' ? null : INPUT_ROLES[type] || 'textbox';
+        }
+        if (tag === 'SELECT') return el.multiple || el.size > 1 ? 'listbox' : 'combobox';
+        if (tag === 'HEADER' || tag === 'FOOTER') {
+            if (el.parentElement && el.parentElement.closest(SECTIONING)) return null;
+            return tag === 'HEADER' ? 'banner' : 'contentinfo';
+        }
+        if (tag === 'SECTION') {
+            return el.hasAttribute('aria-label') || el.hasAttribute('aria-labelledby') ? 'region' : null;
+        }
+        if (TAG_ROLES[tag]) return TAG_ROLES[tag];
+        if (el.isContentEditable && !(el.parentElement && el.parentElement.isContentEditable)) {
+            return 'textbox';
+        }
+        return null;
+    };
+
+    const nameOf = (el, role) => {
+        let name = '';
+        const labelledBy = el.getAttribute('aria-labelledby');
+        if (labelledBy) {
+            name = labelledBy.split(/\\s+/).map(id => document.getElementById(id))
+                .filter(Boolean).map(ref => ref.innerText || ref.textContent).join(' ');
+        }
+        name = name || el.getAttribute('aria-label') || '';
+        if (!name && el.labels && el.labels.length) {
+            name = Array.from(el.labels, label => label.innerText).join(' ');
+        }
+        if (!name && el.tagName === 'INPUT') {
+            const type = el.type;
+            if (type === 'submit' || type === 'reset' || type === 'button') {
+                name = el.value || (type === 'submit' ? 'Submit' : type === 'reset' ? 'Reset' : '');
+            } else if (type === 'image') {
+                name = el.alt;
+            }
+        }
+        if (!name && NAME_FROM_CONTENT.has(role)) {
+            name = el.innerText || Array.from(el.querySelectorAll('img[alt]'), img => img.alt).join(' ');
+        }
+        return clean(name || el.getAttribute('title') || el.getAttribute('placeholder'));
+    };
+
+    const describe = (el, role, node) => {
+        const tag = el.tagName;
+        if (tag === 'INPUT' && (el.type === 'checkbox' || el.type === 'radio')) {
+            node.checked = el.indeterminate ? 'mixed' : el.checked;
+        } else if ((tag === 'INPUT' && !BUTTON_INPUTS.has(el.type)) || tag === 'TEXTAREA') {
+            if (el.value) node.value = el.type === 'password' ? '••••' : clean(el.value);
+        } else if (tag === 'SELECT') {
+            node.value = clean(Array.from(el.selectedOptions, o => o.label).join(', '));
+            node.options = Array.from(el.options).slice(0, 25).map(o => clean(o.label, 40));
+            if (el.options.length > 25) node.options.push(`… ${el.options.length - 25} more`);
+        } else if (role === 'textbox' && el.isContentEditable) {
+            const text = clean(el.innerText);
+            if (text) node.value = text;
+        }
+        const aria = name => el.getAttribute(name);
+        if (aria('aria-checked')) {
+            node.checked = aria('aria-checked') === 'mixed' ? 'mixed' : aria('aria-checked') === 'true';
+        }
+        if (aria('aria-pressed')) node.pressed = aria('aria-pressed') === 'true';
+        if (aria('aria-expanded')) node.expanded = aria('aria-expanded') === 'true';
+        if (aria('aria-selected') === 'true') node.selected = true;
+        if (el.disabled || aria('aria-disabled') === 'true') node.disabled = true;
+        if (el.required || aria('aria-required') === 'true') node.required = true;
+        if (role === 'link' && el.hasAttribute('href')) node.url = clean(el.getAttribute('href'), 200);
+    };
+
+    const visible = el => (el.checkVisibility
+        ? el.checkVisibility({checkVisibilityCSS: true, visibilityProperty: true})
+        : el.getClientRects().length > 0);
+
+    // Refs number every interactive/landmark element in document order, visible
+    // or not and wherever the snapshot is scoped, so a later page load that
+    // walks the same DOM hands out the same refs
+    const resolving = mode === 'resolve';
+    const wanted = resolving ? new Set(options) : null;
+    const found = [];
+    const [maxDepth, maxNodes] = resolving ? [0, 0] : options;
+    const root = rootSelector ? document.querySelector(rootSelector) : document.body;
+    if (!root && !resolving) return null;
+    const top = {children: []};
+    let counter = 0;
+    let emitted = 0;
+    let truncated = false;
+
+    if (resolving) {
+        for (const el of document.querySelectorAll('[data-pw-ref]')) el.removeAttribute('data-pw-ref');
+    }
+
+    const walk = (el, parent, depth, inRoot) => {
+        const children = el.shadowRoot ? [...el.shadowRoot.children, ...el.children] : el.children;
+        for (const child of children) {
+            if (SKIP.has(child.tagName) || child.hidden || child.getAttribute('aria-hidden') === 'true') {
+                continue;
+            }
+            const within = inRoot || child === root;
+            const role = roleOf(child);
+            let target = parent;
+            let nextDepth = depth;
+            if (role && (INTERACTIVE.has(role) || LANDMARKS.has(role))) {
+                const ref = 'e' + ++counter;
+                if (resolving) {
+                    if (wanted.has(ref)) {
+                        child.setAttribute('data-pw-ref', ref);
+                        found.push(ref);
+                    }
+                } else if (within && visible(child)) {
+                    if (depth >= maxDepth) {
+                        parent.omitted = (parent.omitted || 0) + 1;
+                    } else if (emitted >= maxNodes) {
+                        truncated = true;
+                    } else {
+                        const node = {ref, role};
+                        const name = nameOf(child, role);
+                        if (name) node.name = name;
+                        describe(child, role, node);
+                        (parent.children = parent.children || []).push(node);
+                        target = node;
+                        nextDepth = depth + 1;
+                        emitted++;
+                    }
+                }
+            }
+            walk(child, target, nextDepth, within);
+        }
+    };
+    walk(document.body || document.documentElement, top, 0, root === document.body);
+
+    if (resolving) return found;
+    return {
+        url: location.href, title: document.title, nodes: emitted, truncated,
+        ...(top.omitted ? {omitted: top.omitted} : {}), children: top.children,
+    };
+}
+"""
+
+
+def resolve_refs(page: Page, refs: list[str]) -> list[str]:
+    """Tag the elements behind snapshot refs so ref_locator() finds them; returns refs not found."""
+    found = page.evaluate(SNAPSHOT_JS, ["resolve", refs, None])
+    return [ref for ref in refs if ref not in found]
+
+
+async def resolve_refs_async(page: AsyncPage, refs: list[str]) -> list[str]:
+    """Async counterpart of resolve_refs()."""
+    found = await page.evaluate(SNAPSHOT_JS, ["resolve", refs, None])
+    return [ref for ref in refs if ref not in found]
+
+
+def ref_locator(page: Page | AsyncPage, ref: str):
+    """Locator for an element tagged by resolve_refs()."""
+    return page.locator(f'[data-pw-ref="{ref}"]')
+
+
+def parse_viewport(value: str) -> dict | None:
+    """Parse viewport string like '1280x720' into dict."""
+    if not value:
+        return None
+    try:
+        w, h = value.lower().split("x", 1)
+        return {"width": int(w), "height": int(h)}
+    except Exception:
+        return None
+
+
+def env_viewport(width: int = 1280, height: int = 720) -> dict:
+    """The VIEWPORT environment variable's size, or width x height when unset or invalid."""
+    return parse_viewport(os.getenv("VIEWPORT", "")) or {"width": width, "height": height}
+
+
+def sync_playwright() -> PlaywrightContextManager:
+    """Start the sync Playwright driver, importing playwright on first use."""
+    from playwright.sync_api import sync_playwright as start
+
+    return start()
+
+
+def async_playwright() -> AsyncPlaywrightContextManager:
+    """Async counterpart of sync_playwright()."""
+    from playwright.async_api import async_playwright as start
+
+    return start()
+
+
+# Where timing spans go; None while tracing is off, when span() is a shared no-op
+_span_sink: TextIO | None = None
+_span_origin = 0.0
+_NO_SPAN = contextlib.nullcontext()
+_trace_zips = 0
+
+
+def enable_spans(target: str) -> None:
+    """Emit timing spans as NDJSON to stderr ('-' or '1') or append them to a file."""
+    global _span_sink, _span_origin
+    if _span_sink is not None:
+        return
+    if target.lower() in ("-", "1", "true", "yes", "stderr"):
+        _span_sink = sys.stderr
+    else:
+        _span_sink = open(target, "a", buffering=1)  # noqa: SIM115 - lives until exit
+    _span_origin = time.monotonic()
+    atexit.register(lambda: print_ndjson(_span_record("total", _span_origin, {}), _span_sink))
+
+
+def _span_record(name: str, start: float, attrs: dict) -> dict:
+    return {
+        "span": name,
+        "at_ms": round((start - _span_origin) * 1000, 1),
+        "ms": round((time.monotonic() - start) * 1000, 1),
+        **attrs,
+    }
+
+
+@contextlib.contextmanager
+def _timed_span(name: str, attrs: dict) -> Generator[None, None, None]:
+    start = time.monotonic()
+    try:
+        yield
+    except BaseException as e:
+        attrs["error"] = type(e).__name__
+        raise
+    finally:
+        print_ndjson(_span_record(name, start, attrs), _span_sink)
+
+
+def span(name: str, **attrs) -> contextlib.AbstractContextManager:
+    """Time a phase (launch, goto, screenshot...) as one span record when tracing is on.
+
+    Spans are written when they end, with at_ms (start, relative to when tracing
+    began) and ms (duration). Works around awaits too; concurrent spans carry
+    attributes such as the URL to tell them apart.
+    """
+    if _span_sink is None:
+        return _NO_SPAN
+    return _timed_span(name, attrs)
+
+
+class _TraceAction(argparse.Action):
+    """--trace / --trace-out FILE: switch spans on as soon as the option is parsed."""
+
+    def __call__(self, parser, namespace, values, option_string=None) -> None:
+        target = values or "-"
+        try:
+            enable_spans(target)
+        except OSError as e:
+            raise argparse.ArgumentError(self, f"can't open {target}: {e.strerror}") from None
+        setattr(namespace, self.dest, target)
+
+
+def add_trace_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the shared tracing options to a script's parser."""
+    group = parser.add_argument_group("tracing")
+    group.add_argument(
+        "--trace",
+        nargs=0,
+        action=_TraceAction,
+        help="Emit per-phase timing spans as NDJSON to stderr",
+    )
+    group.add_argument(
+        "--trace-out",
+        dest="trace",
+        action=_TraceAction,
+        metavar="FILE",
+        help="Append timing spans to FILE instead (default: $PLAYWRIGHT_TRACE)",
+    )
+    group.add_argument(
+        "--trace-zip",
+        metavar="PATH",
+        default=os.getenv("PLAYWRIGHT_TRACE_ZIP") or None,
+        help="Record a Playwright trace (view with `playwright show-trace`); further contexts "
+        "get -2, -3... suffixes (default: $PLAYWRIGHT_TRACE_ZIP)",
+    )
+    if os.getenv("PLAYWRIGHT_TRACE"):
+        try:
+            enable_spans(os.environ["PLAYWRIGHT_TRACE"])
+        except OSError as e:
+            parser.error(
+                f"PLAYWRIGHT_TRACE: can't open {os.environ['PLAYWRIGHT_TRACE']}: {e.strerror}"
+            )
+
+
+def next_trace_zip(path: str) -> str:
+    """Trace zip path for the next context: PATH first, then PATH-2, PATH-3..."""
+    global _trace_zips
+    _trace_zips += 1
+    if _trace_zips == 1:
+        return path
+    base = Path(path)
+    return str(base.with_name(f"{base.stem}-{_trace_zips}{base.suffix}"))
+
+
+def open_context(browser: Browser, args: argparse.Namespace, **options) -> BrowserContext:
+    """New browser context with the HAR options installed and --trace-zip recording started."""
+    with span("new_context"):
+        context = browser.new_context(**options)
+    install_har(context, args)
+    if args.trace_zip:
+        context.tracing.start(screenshots=True, snapshots=True, sources=True)
+    return context
+
+
+def close_context(context: BrowserContext, args: argparse.Namespace) -> None:
+    """Close a context from open_context(), saving its Playwright trace first."""
+    try:
+        if args.trace_zip:
+            with span("trace_zip"):
+                context.tracing.stop(path=next_trace_zip(args.trace_zip))
+    finally:
+        context.close()
+
+
+async def open_context_async(
+    browser: AsyncBrowser, args: argparse.Namespace, **options
+) -> AsyncBrowserContext:
+    """Async counterpart of open_context()."""
+    with span("new_context"):
+        context = await browser.new_context(**options)
+    await install_har_async(context, args)
+    if args.trace_zip:
+        await context.tracing.start(screenshots=True, snapshots=True, sources=True)
+    return context
+
+
+async def close_context_async(context: AsyncBrowserContext, args: argparse.Namespace) -> None:
+    """Async counterpart of close_context()."""
+    try:
+        if args.trace_zip:
+            with span("trace_zip"):
+                await context.tracing.stop(path=next_trace_zip(args.trace_zip))
+    finally:
+        await context.close()
+
+
+def add_wait_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the shared page-readiness options to a script's parser."""
+    group = parser.add_argument_group("page readiness")
+    group.add_argument(
+        "--wait-until",
+        choices=WAIT_UNTIL_CHOICES,
+        default="networkidle",
+        help="Navigation event to wait for (default: networkidle)",
+    )
+    group.add_argument("--wait-for", metavar="SELECTOR", help="Also wait until SELECTOR is visible")
+    group.add_argument(
+        "--dom-quiet",
+        metavar="MS",
+        type=int,
+        help="Also wait until the DOM has had no mutations for MS milliseconds",
+    )
+    group.add_argument(
+        "--dom-quiet-max",
+        metavar="MS",
+        type=int,
+        default=10_000,
+        help="Give up waiting for DOM quiescence after MS milliseconds (default: 10000)",
+    )
+
+
+def goto(page: Page, url: str, args: argparse.Namespace) -> Response | None:
+    """Navigate to url and wait until the page is ready per the readiness options.
+
+    The goto span covers navigation up to the --wait-until event, so tracing
+    leaves timeouts and failures exactly as they are without it.
+    """
+    with span("goto", url=url, event=args.wait_until):
+        response = page.goto(url, wait_until=args.wait_until)
+    wait_ready(page, args, load_state=False)
+    return response
+
+
+def wait_ready(page: Page, args: argparse.Namespace, load_state: bool = True) -> None:
+    """Wait for readiness after an in-page action such as a form submit."""
+    if load_state and args.wait_until != "commit":
+        with span("wait", event=args.wait_until):
+            page.wait_for_load_state(args.wait_until)
+    if args.wait_for:
+        with span("wait_for", selector=args.wait_for):
+            page.wait_for_selector(args.wait_for, state="visible")
+    if args.dom_quiet:
+        with span("dom_quiet"):
+            page.evaluate(DOM_QUIET_JS, [args.dom_quiet, args.dom_quiet_max])
+
+
+async def goto_async(page: AsyncPage, url: str, args: argparse.Namespace) -> AsyncResponse | None:
+    """Async counterpart of goto()."""
+    with span("goto", url=url, event=args.wait_until):
+        response = await page.goto(url, wait_until=args.wait_until)
+    await wait_ready_async(page, args, load_state=False)
+    return response
+
+
+async def wait_ready_async(
+    page: AsyncPage, args: argparse.Namespace, load_state: bool = True
+) -> None:
+    """Async counterpart of wait_ready()."""
+    if load_state and args.wait_until != "commit":
+        with span("wait", event=args.wait_until, url=page.url):
+            await page.wait_for_load_state(args.wait_until)
+    if args.wait_for:
+        with span("wait_for", selector=args.wait_for, url=page.url):
+            await page.wait_for_selector(args.wait_for, state="visible")
+    if args.dom_quiet:
+        with span("dom_quiet", url=page.url):
+            await page.evaluate(DOM_QUIET_JS, [args.dom_quiet, args.dom_quiet_max])
+
+
+def add_block_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the shared --block option to a script's parser."""
+    parser.add_argument(
+        "--block",
+        action="append",
+        default=[],
+        metavar="WHAT",
+        help="Block requests: images, media, fonts, stylesheets, third-party, or a URL glob "
+        "(comma-separated, repeatable)",
+    )
+
+
+def parse_block_rules(values: list[str]) -> dict:
+    """Split --block values into resource types, a third-party flag and URL globs."""
+    rules = {"types": set(), "third_party": False, "globs": []}
+    for value in values:
+        for item in filter(None, (part.strip() for part in value.split(","))):
+            if item in BLOCK_RESOURCE_TYPES:
+                rules["types"] |= BLOCK_RESOURCE_TYPES[item]
+            elif item == "third-party":
+                rules["third_party"] = True
+            else:
+                rules["globs"].append(item)
+    return rules
+
+
+def site_of(url: str) -> str:
+    """Approximate the registrable site of a URL by its last two host labels."""
+    host = urlsplit(url).hostname or ""
+    return ".".join(host.split(".")[-2:])
+
+
+def should_block(rules: dict, request_url: str, resource_type: str, page_site: str) -> bool:
+    """Decide whether a request matches the type or third-party block rules."""
+    if resource_type in rules["types"]:
+        return True
+    if rules["third_party"] and page_site and request_url.startswith(("http:", "https:")):
+        return site_of(request_url) != page_site
+    return False
+
+
+def install_blocking(context: BrowserContext, values: list[str], url: str) -> None:
+    """Abort matching requests in every page of the context; no-op without rules."""
+    rules = parse_block_rules(values)
+    for glob in rules["globs"]:
+        context.route(glob, lambda route: route.abort())
+
+    if rules["types"] or rules["third_party"]:
+        page_site = site_of(url)
+
+        def handle(route: Route) -> None:
+            request = route.request
+            if should_block(rules, request.url, request.resource_type, page_site):
+                route.abort()
+            else:
+                route.fallback()
+
+        context.route("**/*", handle)
+
+
+async def install_blocking_async(
+    target: AsyncBrowserContext | AsyncPage, values: list[str], url: str
+) -> None:
+    """Async counterpart of install_blocking(); also accepts a single page."""
+    rules = parse_block_rules(values)
+    for glob in rules["globs"]:
+        await target.route(glob, lambda route: route.abort())
+
+    if rules["types"] or rules["third_party"]:
+        page_site = site_of(url)
+
+        async def handle(route: AsyncRoute) -> None:
+            request = route.request
+            if should_block(rules, request.url, request.resource_type, page_site):
+                await route.abort()
+            else:
+                await route.fallback()
+
+        await target.route("**/*", handle)
+
+
+def add_state_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the shared storage-state (cookies + localStorage) options to a script's parser."""
+    group = parser.add_argument_group("session state")
+    group.add_argument(
+        "--save-state",
+        nargs="?",
+        const=STATE_AUTO,
+        metavar="PATH",
+        help="Save cookies/localStorage after a successful run (default: per-origin cache)",
+    )
+    group.add_argument(
+        "--load-state",
+        nargs="?",
+        const=STATE_AUTO,
+        metavar="PATH",
+        help="Start from saved cookies/localStorage (default: per-origin cache)",
+    )
+    group.add_argument(
+        "--state-max-age",
+        type=float,
+        default=24,
+        metavar="HOURS",
+        help="Treat saved state older than HOURS as stale (default: 24)",
+    )
+
+
+def state_path(value: str, url: str) -> Path:
+    """Resolve a --save-state/--load-state value, mapping 'auto' to the origin's cache file."""
+    if value != STATE_AUTO:
+        return Path(value)
+    parts = urlsplit(url)
+    origin = f"{parts.scheme}_{parts.hostname or 'local'}_{parts.port or ''}".rstrip("_")
+    return STATE_DIR / f"{origin}.json"
+
+
+def stale_reason(path: Path, max_age_hours: float) -> str | None:
+    """Explain why saved state shouldn't be reused, or return None if it looks fresh."""
+    if not path.exists():
+        return "not found"
+    if time.time() - path.stat().st_mtime > max_age_hours * 3600:
+        return f"older than {max_age_hours:g}h"
+    try:
+        state = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return "unreadable"
+    cookies = state.get("cookies", [])
+    # Session cookies have expires == -1; a state whose cookies have all expired is logged out
+    if cookies and all(0 <= c.get("expires", -1) < time.time() for c in cookies):
+        return "all cookies expired"
+    return None
+
+
+def load_state_path(args: argparse.Namespace, url: str) -> str | None:
+    """Return the storage-state file to start from, or None if absent or stale."""
+    if not args.load_state:
+        return None
+    path = state_path(args.load_state, url)
+    reason = stale_reason(path, args.state_max_age)
+    if reason:
+        print(f"Warning: not loading state {path} ({reason})", file=sys.stderr)
+        return None
+    return str(path)
+
+
+def save_state(context: BrowserContext, args: argparse.Namespace, url: str) -> None:
+    """Write the context's storage state if --save-state was given."""
+    if not args.save_state:
+        return
+    path = state_path(args.save_state, url)
+    if path.parent == STATE_DIR and STATE_DIR.exists():
+        # Tighten a cache directory created by an older version with the default umask
+        STATE_DIR.chmod(0o700)
+    write_private_json(path, context.storage_state())
+    print(f"State saved: {path}", file=sys.stderr)
+
+
+def add_har_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the shared HAR record/replay options to a script's parser."""
+    group = parser.add_argument_group("network recording").add_mutually_exclusive_group()
+    group.add_argument(
+        "--record-har", metavar="PATH", help="Record all responses into a HAR archive"
+    )
+    group.add_argument(
+        "--replay-har",
+        metavar="PATH",
+        default=os.getenv("PLAYWRIGHT_REPLAY_HAR") or None,
+        help="Serve responses from a HAR archive; requests not in it are aborted "
+        "(default: $PLAYWRIGHT_REPLAY_HAR)",
+    )
+
+
+def install_har(context: BrowserContext, args: argparse.Namespace) -> None:
+    """Record to or replay from a HAR archive. Recordings are written when the context closes."""
+    if args.record_har:
+        context.route_from_har(args.record_har, update=True, update_content="embed")
+    elif args.replay_har:
+        context.route_from_har(args.replay_har, not_found="abort")
+
+
+async def install_har_async(context: AsyncBrowserContext, args: argparse.Namespace) -> None:
+    """Async counterpart of install_har()."""
+    if args.record_har:
+        await context.route_from_har(args.record_har, update=True, update_content="embed")
+    elif args.replay_har:
+        await context.route_from_har(args.replay_har, not_found="abort")
+
+
+def parse_clip(value: str) -> dict:
+    """Parse an 'X,Y,WIDTH,HEIGHT' clip rectangle (CSS pixels)."""
+    try:
+        x, y, width, height = (float(part) for part in value.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid clip {value!r}, expected X,Y,WIDTH,HEIGHT")
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError("clip width and height must be positive")
+    return {"x": x, "y": y, "width": width, "height": height}
+
+
+def parse_quality(value: str) -> int:
+    """Parse a JPEG quality between 0 and 100."""
+    quality = int(value)
+    if not 0 <= quality <= 100:
+        raise argparse.ArgumentTypeError("quality must be between 0 and 100")
+    return quality
+
+
+def add_image_arguments(parser: argparse.ArgumentParser, region: bool = True) -> None:
+    """Add the shared screenshot encoding options, plus element/clip capture when region is set."""
+    group = parser.add_argument_group("image options")
+    group.add_argument(
+        "--format",
+        choices=("png", "jpeg"),
+        help="Image format (default: from the output extension, else png)",
+    )
+    group.add_argument(
+        "--quality", type=parse_quality, metavar="0-100", help="JPEG quality (implies jpeg)"
+    )
+    group.add_argument(
+        "--scale",
+        choices=("device", "css"),
+        default="device",
+        help="css: one image pixel per CSS pixel, smaller on HiDPI (default: device)",
+    )
+    if region:
+        target = group.add_mutually_exclusive_group()
+        target.add_argument(
+            "--selector",
+            dest="element",
+            metavar="SELECTOR",
+            help="Capture only the first element matching SELECTOR",
+        )
+        target.add_argument(
+            "--clip", type=parse_clip, metavar="X,Y,W,H", help="Capture only this rectangle"
+        )
+
+
+def check_image_arguments(
+    parser: argparse.ArgumentParser, args: argparse.Namespace, output: str | None = None
+) -> None:
+    """Settle args.format from the output path and --quality, rejecting contradictions."""
+    if args.format is None:
+        jpeg_path = bool(output) and output.lower().endswith((".jpg", ".jpeg"))
+        args.format = "jpeg" if jpeg_path or args.quality is not None else "png"
+    if args.quality is not None and args.format != "jpeg":
+        parser.error("--quality only applies to --format jpeg")
+
+
+def image_suffix(args: argparse.Namespace) -> str:
+    """File extension for the chosen image format."""
+    return ".jpg" if args.format == "jpeg" else ".png"
+
+
+def image_options(args: argparse.Namespace) -> dict:
+    """Keyword arguments for Page.screenshot()/Locator.screenshot() from the image options."""
+    options = {"type": args.format, "scale": args.scale}
+    if args.quality is not None:
+        options["quality"] = args.quality
+    return options
+
+
+def capture(page: Page, args: argparse.Namespace, full_page: bool = False) -> bytes:
+    """Screenshot the page, or the --selector element / --clip rectangle, as encoded bytes."""
+    options = image_options(args)
+    with span("screenshot", format=args.format, full_page=full_page):
+        if getattr(args, "element", None):
+            return page.locator(args.element).first.screenshot(**options)
+        if getattr(args, "clip", None):
+            return page.screenshot(clip=args.clip, full_page=full_page, **options)
+        return page.screenshot(full_page=full_page, **options)
+
+
+async def capture_async(
+    page: AsyncPage, args: argparse.Namespace, full_page: bool = False
+) -> bytes:
+    """Async counterpart of capture()."""
+    options = image_options(args)
+    with span("screenshot", format=args.format, full_page=full_page, url=page.url):
+        if getattr(args, "element", None):
+            return await page.locator(args.element).first.screenshot(**options)
+        if getattr(args, "clip", None):
+            return await page.screenshot(clip=args.clip, full_page=full_page, **options)
+        return await page.screenshot(full_page=full_page, **options)
+
+
+def write_image(data: bytes, output: str) -> None:
+    """Write image bytes to a path, to stdout ('-') or to an open file descriptor ('fd:N')."""
+    if output == "-":
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+    elif output.startswith("fd:"):
+        with os.fdopen(int(output[3:]), "wb", closefd=False) as stream:
+            stream.write(data)
+    else:
+        # screenshot(path=...) creates missing directories; keep doing so
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        Path(output).write_bytes(data)
+
+
+def save_error_screenshot(page: Page, args: argparse.Namespace, prefix: str) -> None:
+    """Best-effort viewport screenshot after a failure, encoded per the image options."""
+    ts = datetime.now().strftime("%Y%m%d-%H%M%S")
+    error_path = f"/tmp/{prefix}-{ts}{image_suffix(args)}"
+    try:
+        page.screenshot(path=error_path, **image_options(args))
+        print(f"Error screenshot: {error_path}", file=sys.stderr)
+    except Exception:
+        pass
+
+
+def pid_alive(pid: int) -> bool:
+    """Check whether a process with this pid exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def write_private_json(path: Path, data: object) -> None:
+    """Atomically write JSON that only this user can read, creating its directory as 0700.
+
+    The file is created as 0600 rather than chmod-ed afterwards, so its content
+    is never readable by others, and replaced in one step, so readers never
+    see a partial file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def write_daemon_state(state: dict) -> None:
+    """Atomically write the daemon's state file, readable and writable by this user only."""
+    write_private_json(DAEMON_STATE, state)
+
+
+def read_daemon_state() -> dict | None:
+    """Return the running daemon's state (pid, endpoint, headless), or None.
+
+    A state file that another user owns or could have written is ignored.
+    """
+    try:
+        with open(DAEMON_STATE) as f:
+            info = os.fstat(f.fileno())
+            if info.st_uid != os.getuid() or info.st_mode & 0o777 != 0o600:
+                return None
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or not pid_alive(state.get("pid", 0)):
+        return None
+    return state
+
+
+def launch_browser(p: Playwright, headless: bool) -> Browser:
+    """Connect to the browser daemon if it is running, otherwise launch Chromium.
+
+    When connected to the daemon, closing the returned browser only disconnects;
+    the daemon's browser process keeps running.
+    """
+    state = read_daemon_state() if USE_DAEMON else None
+    if state:
+        try:
+            with span("connect_daemon"):
+                return p.chromium.connect(state["endpoint"], slow_mo=SLOW_MO, timeout=5_000)
+        except Exception:
+            pass
+    with span("launch", headless=headless):
+        return p.chromium.launch(headless=headless, slow_mo=SLOW_MO)
+
+
+async def launch_browser_async(p: AsyncPlaywright, headless: bool) -> AsyncBrowser:
+    """Async counterpart of launch_browser()."""
+    state = read_daemon_state() if USE_DAEMON else None
+    if state:
+        try:
+            with span("connect_daemon"):
+                return await p.chromium.connect(state["endpoint"], slow_mo=SLOW_MO, timeout=5_000)
+        except Exception:
+            pass
+    with span("launch", headless=headless):
+        return await p.chromium.launch(headless=headless, slow_mo=SLOW_MO)
+
+
+async def run_bounded(
+    items: Iterable[T], worker: Callable[[T], Awaitable[R]], concurrency: int
+) -> AsyncIterator[R]:
+    """Run worker over items with at most `concurrency` in flight.
+
+    Results are yielded in completion order, so callers can stream them.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def guarded(item: T) -> R:
+        async with semaphore:
+            return await worker(item)
+
+    tasks = [asyncio.ensure_future(guarded(item)) for item in items]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def print_ndjson(record: dict, stream: TextIO | None = None) -> None:
+    """Write one JSON record per line to stream (stdout), flushed so consumers see it at once."""
+    stream = stream or sys.stdout
+    stream.write(json.dumps(record, default=str) + "\n")
+    stream.flush()
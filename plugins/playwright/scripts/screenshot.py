@@ -1,30 +1,185 @@
 #!/usr/bin/env -S uv run --script
 # /// script
 # requires-python = ">=3.10"
-# dependencies = ["playwright==1.56.0"]
+# dependencies = ["playwright==1.56.0", "numpy==2.2.6", "pillow==11.3.0"]
 # ///
 """Take a screenshot of a URL."""
 
 import argparse
-import os
+import asyncio
+import json
 import sys
+import time
 from datetime import datetime
+from pathlib import Path
 
-from playwright.sync_api import sync_playwright
+from runtime import (
+    HEADLESS,
+    add_har_arguments,
+    add_image_arguments,
+    add_state_arguments,
+    add_trace_arguments,
+    add_wait_arguments,
+    async_playwright,
+    capture,
+    capture_async,
+    check_image_arguments,
+    close_context,
+    close_context_async,
+    env_viewport,
+    goto,
+    goto_async,
+    image_suffix,
+    launch_browser,
+    launch_browser_async,
+    load_state_path,
+    open_context,
+    open_context_async,
+    parse_viewport,
+    print_ndjson,
+    run_bounded,
+    save_error_screenshot,
+    save_state,
+    sync_playwright,
+    write_image,
+)
 
-HEADLESS = os.getenv("HEADLESS", "0").lower() in ("1", "true", "yes")
-SLOW_MO = int(os.getenv("SLOW_MO", "0"))
 
+def parse_batch_line(
+    line: str, index: int, viewport: dict, output_dir: str, suffix: str = ".png"
+) -> dict:
+    """Parse a batch line: a JSON object or whitespace-separated 'URL [WxH] [OUTPUT]'."""
+    if line.startswith("{"):
+        job = json.loads(line)
+        if not isinstance(job, dict) or not job.get("url"):
+            raise ValueError("JSON line needs a 'url'")
+    else:
+        parts = line.split()
+        job = {"url": parts[0]}
+        for part in parts[1:]:
+            if "viewport" not in job and parse_viewport(part):
+                job["viewport"] = part
+            else:
+                job["output"] = part
+
+    if isinstance(job.get("viewport"), str):
+        parsed = parse_viewport(job["viewport"])
+        if not parsed:
+            raise ValueError(f"Invalid viewport: {job['viewport']}")
+        job["viewport"] = parsed
+    job.setdefault("viewport", viewport)
+    job.setdefault("output", str(Path(output_dir) / f"screenshot-{index:05d}{suffix}"))
+    return job
+
+
+def read_batch(source: str, viewport: dict, output_dir: str, suffix: str = ".png") -> list[dict]:
+    """Read batch jobs from a file, or stdin when source is '-'."""
+    stream = sys.stdin if source == "-" else open(source)
+    with stream:
+        lines = [line.strip() for line in stream]
+    jobs = []
+    for line in lines:
+        if line and not line.startswith("#"):
+            jobs.append(parse_batch_line(line, len(jobs) + 1, viewport, output_dir, suffix))
+    return jobs
+
+
+def diff_path_for(output: str) -> str:
+    """Default diff image path: next to the capture, with a .diff.png suffix."""
+    return str(Path(output).with_suffix("")) + ".diff.png"
+
+
+def check_baseline(data: bytes, baseline: str, diff_path: str, args: argparse.Namespace) -> dict:
+    """Compare a capture with its baseline image, writing a diff image on mismatch.
+
+    A missing baseline (or --update-baseline) stores the capture as the new baseline.
+    """
+    path = Path(baseline)
+    if args.update_baseline or not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        return {"baseline": baseline, "baseline_written": True, "match": True}
+
+    # numpy and pillow are only imported when a comparison actually runs
+    from visual_diff import compare
+
+    report, diff = compare(
+        data,
+        path.read_bytes(),
+        threshold=args.threshold,
+        anti_aliasing=not args.no_aa,
+        use_hash=args.fast,
+        max_mismatch=args.max_mismatch,
+    )
+    if diff:
+        write_image(diff, diff_path)
+        report["diff"] = diff_path
+    return {"baseline": baseline, **report}
+
+
+async def capture_batch(jobs: list[dict], args: argparse.Namespace, headless: bool) -> int:
+    """Capture every job on one browser, streaming one NDJSON record per URL."""
+    failed = 0
+
+    async with async_playwright() as p:
+        browser = await launch_browser_async(p, headless)
+
+        async def capture_job(job: dict) -> dict:
+            start = time.monotonic()
+            error = None
+            for attempt in range(1, args.retries + 2):
+                context = await open_context_async(
+                    browser, args, viewport=job["viewport"], storage_state=job["storage_state"]
+                )
+                try:
+                    page = await context.new_page()
+                    # Playwright's own 30s cap would otherwise fire before --timeout
+                    page.set_default_navigation_timeout(args.timeout * 1000)
+                    await asyncio.wait_for(goto_async(page, job["url"], args), args.timeout)
+                    data = await capture_async(page, args, full_page=args.full_page)
+                    write_image(data, job["output"])
+                    break
+                except Exception as e:
+                    error = str(e) or type(e).__name__
+                finally:
+                    await close_context_async(context, args)
+            else:
+                return {
+                    "url": job["url"],
+                    "ok": False,
+                    "error": error,
+                    "attempts": args.retries + 1,
+                    "ms": round((time.monotonic() - start) * 1000),
+                }
+
+            record = {"url": job["url"], "ok": True, "output": job["output"], "attempts": attempt}
+            if "baseline" in job:
+                try:
+                    # Pixel comparison is CPU-bound, but numpy releases the GIL for
+                    # most of it, so a worker thread keeps it off the event loop
+                    record.update(
+                        await asyncio.to_thread(
+                            check_baseline,
+                            data,
+                            job["baseline"],
+                            diff_path_for(job["output"]),
+                            args,
+                        )
+                    )
+                except (OSError, ValueError) as e:
+                    record.update(match=False, error=f"baseline: {e}")
+            record["ms"] = round((time.monotonic() - start) * 1000)
+            return record
+
+        try:
+            async for record in run_bounded(jobs, capture_job, args.concurrency):
+                failed += not (record["ok"] and record.get("match", True))
+                print_ndjson(record)
+        finally:
+            await browser.close()
 
-def parse_viewport(value: str) -> dict | None:
-    """Parse viewport string like '1280x720' into dict."""
-    if not value:
-        return None
-    try:
-        w, h = value.lower().split("x", 1)
-        return {"width": int(w), "height": int(h)}
-    except Exception:
-        return None
+    print(f"{len(jobs) - failed} of {len(jobs)} screenshot(s) captured", file=sys.stderr)
+    return 0 if failed == 0 else 1
 
 
 def main() -> int:
@@ -37,62 +192,168 @@ Examples:
   screenshot.py https://example.com --output /tmp/shot.png
   screenshot.py https://example.com --full-page --headless
   screenshot.py https://example.com --width 1920 --height 1080
+  screenshot.py https://example.com --format jpeg --quality 60 --scale css
+  screenshot.py https://example.com --selector "#main" --output /tmp/main.png
+  screenshot.py https://example.com --clip 0,0,800,600 --output - > shot.png
+  screenshot.py --batch urls.txt --concurrency 8 --headless > results.ndjson
+  screenshot.py https://example.com -o /tmp/home.png --baseline baselines/home.png
+  screenshot.py --batch urls.txt --output-dir /tmp/shots --baseline baselines/ --max-mismatch 0.001
+  cat urls.txt | screenshot.py --batch - --output-dir /tmp/shots
+
+Batch input (one job per line, # comments allowed):
+  https://example.com
+  https://example.com 375x812 /tmp/mobile.png
+  {"url": "https://example.com", "viewport": "1920x1080", "output": "/tmp/wide.png"}
+
+Visual comparison:
+  --baseline compares the capture with a stored image (in batch mode: a
+  directory holding one baseline per output file name, or a "baseline" key on
+  a JSON line). A missing baseline is created from the capture. Pixels differ
+  when their YIQ color distance exceeds --threshold; differences that
+  pass pixelmatch's anti-aliasing test count as anti-aliasing unless --no-aa.
+  Mismatches are drawn in red on <output>.diff.png. The result is JSON with
+  mismatch_ratio and match; the exit code is 1 when any ratio exceeds
+  --max-mismatch. numpy and pillow are imported only when a comparison runs,
+  so plain captures don't pay for loading them.
 
 Environment variables:
   HEADLESS=1    Run browser in headless mode
   SLOW_MO=250   Slow down actions by 250ms
+  PLAYWRIGHT_DAEMON=0  Don't connect to a running daemon.py browser
   VIEWPORT=1920x1080  Set viewport size
 """,
     )
-    parser.add_argument("url", help="URL to screenshot")
+    parser.add_argument("url", nargs="?", help="URL to screenshot")
     parser.add_argument(
-        "-o", "--output", help="Output path (default: /tmp/screenshot-{timestamp}.png)"
+        "-o",
+        "--output",
+        help="Output path, '-' for stdout or fd:N for a file descriptor "
+        "(default: /tmp/screenshot-{timestamp}.png)",
     )
     parser.add_argument("--full-page", action="store_true", help="Capture full page")
     parser.add_argument("--headless", action="store_true", help="Run in headless mode")
     parser.add_argument("--width", type=int, default=1280, help="Viewport width (default: 1280)")
     parser.add_argument("--height", type=int, default=720, help="Viewport height (default: 720)")
+    batch = parser.add_argument_group("batch mode")
+    batch.add_argument("--batch", metavar="FILE", help="Read jobs from FILE ('-' for stdin)")
+    batch.add_argument(
+        "--concurrency", type=int, default=4, help="Pages captured in parallel (default: 4)"
+    )
+    batch.add_argument(
+        "--timeout", type=float, default=60, help="Per-URL navigation timeout in seconds"
+    )
+    batch.add_argument("--retries", type=int, default=1, help="Retries per URL (default: 1)")
+    batch.add_argument(
+        "--output-dir", default="/tmp", help="Directory for jobs without an output path"
+    )
+    add_image_arguments(parser)
+    visual = parser.add_argument_group("visual comparison")
+    visual.add_argument(
+        "--baseline", metavar="PATH", help="Baseline image (batch mode: baseline directory)"
+    )
+    visual.add_argument(
+        "--diff", metavar="PATH", help="Diff image path (default: <output>.diff.png)"
+    )
+    visual.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Per-pixel color distance tolerance, 0-1 (default: 0.1)",
+    )
+    visual.add_argument(
+        "--max-mismatch",
+        type=float,
+        default=0.0,
+        metavar="RATIO",
+        help="Largest mismatched pixel ratio that still passes (default: 0)",
+    )
+    visual.add_argument(
+        "--no-aa", action="store_true", help="Count anti-aliasing differences as mismatches"
+    )
+    visual.add_argument(
+        "--fast",
+        action="store_true",
+        help="Skip the pixel diff when a coarse perceptual hash matches (may miss tiny changes)",
+    )
+    visual.add_argument(
+        "--update-baseline", action="store_true", help="Replace the baseline with this capture"
+    )
+    add_har_arguments(parser)
+    add_trace_arguments(parser)
+    add_state_arguments(parser)
+    add_wait_arguments(parser)
     args = parser.parse_args()
 
+    if not args.url and not args.batch:
+        parser.error("Either url or --batch is required")
+    check_image_arguments(parser, args, args.output)
+    if not 0 <= args.threshold <= 1:
+        parser.error("--threshold must be between 0 and 1")
+    if args.baseline and args.output and (args.output == "-" or args.output.startswith("fd:")):
+        parser.error("--baseline needs a file --output")
+    if args.batch and args.diff:
+        parser.error("--diff can't be combined with --batch; diffs go next to each output")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be positive")
+    if args.retries < 0:
+        parser.error("--retries can't be negative")
+
     headless = HEADLESS or args.headless
-    viewport = parse_viewport(os.getenv("VIEWPORT", "")) or {
-        "width": args.width,
-        "height": args.height,
-    }
+    viewport = env_viewport(args.width, args.height)
+
+    if args.batch:
+        if args.record_har:
+            parser.error("--record-har can't be combined with --batch")
+        try:
+            jobs = read_batch(args.batch, viewport, args.output_dir, image_suffix(args))
+        except (OSError, ValueError) as e:
+            print(f"Error reading batch: {e}", file=sys.stderr)
+            return 1
+        for job in jobs:
+            job["storage_state"] = load_state_path(args, job["url"])
+            if args.baseline and "baseline" not in job:
+                job["baseline"] = str(Path(args.baseline) / Path(job["output"]).name)
+        Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+        return asyncio.run(capture_batch(jobs, args, headless))
 
     if args.output:
         output_path = args.output
     else:
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        output_path = f"/tmp/screenshot-{timestamp}.png"
+        output_path = f"/tmp/screenshot-{timestamp}{image_suffix(args)}"
 
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=headless, slow_mo=SLOW_MO)
-        context = browser.new_context(viewport=viewport)
+        browser = launch_browser(p, headless)
+        context = open_context(
+            browser, args, viewport=viewport, storage_state=load_state_path(args, args.url)
+        )
         page = context.new_page()
         page.set_default_timeout(30_000)
         page.set_default_navigation_timeout(60_000)
 
         try:
-            page.goto(args.url, wait_until="networkidle")
-            page.screenshot(path=output_path, full_page=args.full_page)
-            print(output_path)
+            goto(page, args.url, args)
+            data = capture(page, args, full_page=args.full_page)
+            write_image(data, output_path)
+            save_state(context, args, args.url)
+
+            if args.baseline:
+                diff_path = args.diff or diff_path_for(output_path)
+                result = check_baseline(data, args.baseline, diff_path, args)
+                print(json.dumps({"output": output_path, **result}, indent=2))
+                return 0 if result["match"] else 1
+
+            if output_path != "-" and not output_path.startswith("fd:"):
+                print(output_path)
             return 0
 
         except Exception as e:
             print(f"Error: {e}", file=sys.stderr)
-            # Try to capture error screenshot
-            ts = datetime.now().strftime("%Y%m%d-%H%M%S")
-            error_path = f"/tmp/error-{ts}.png"
-            try:
-                page.screenshot(path=error_path)
-                print(f"Error screenshot: {error_path}", file=sys.stderr)
-            except Exception:
-                pass
+            save_error_screenshot(page, args, "error")
             return 1
 
         finally:
-            context.close()
+            close_context(context, args)
             browser.close()
 
 
@@ -0,0 +1,248 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.10"
+# dependencies = ["numpy==2.2.6", "pillow==11.3.0"]
+# ///
+"""Visual comparison of screenshots against baseline images.
+
+screenshot.py imports compare() in-process when a capture has a baseline; the
+module also runs standalone to compare two existing images.
+"""
+
+import argparse
+import io
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Average-color hash grid (HASH_SIZE x HASH_SIZE cells per channel)
+HASH_SIZE = 32
+
+# Largest possible YIQ delta between two colors (black vs white)
+MAX_YIQ_DELTA = 35215.0
+
+# Offsets of the 8 neighbours checked by the anti-aliasing test, in pixelmatch's order
+NEIGHBOURS = [(dy, dx) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if (dy, dx) != (0, 0)]
+
+# Luma weights used for the brightness comparisons of the anti-aliasing test
+Y_WEIGHTS = np.array([0.29889531, 0.58662247, 0.11448223], dtype=np.float32)
+
+
+def decode(data: bytes) -> Image.Image:
+    """Decode PNG/JPEG bytes into an RGB image, flattening transparency onto white."""
+    image = Image.open(io.BytesIO(data))
+    if image.mode in ("RGBA", "LA") or "transparency" in image.info:
+        background = Image.new("RGBA", image.size, (255, 255, 255, 255))
+        image = Image.alpha_composite(background, image.convert("RGBA"))
+    return image.convert("RGB")
+
+
+def color_hash(image: Image.Image) -> np.ndarray:
+    """Perceptual hash: the mean color of each cell of a coarse grid.
+
+    Unlike grayscale hashes it changes when a region changes color, but edits
+    much smaller than a cell can still leave it unchanged.
+    """
+    return np.asarray(image.resize((HASH_SIZE, HASH_SIZE), Image.Resampling.BOX))
+
+
+def yiq_delta(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Perceptual color distance per pixel in YIQ space (0 to MAX_YIQ_DELTA)."""
+    d = a - b
+    r, g, bl = d[..., 0], d[..., 1], d[..., 2]
+    y = r * 0.29889531 + g * 0.58662247 + bl * 0.11448223
+    i = r * 0.59597799 - g * 0.27417610 - bl * 0.32180189
+    q = r * 0.21147017 - g * 0.52261711 + bl * 0.31114694
+    return 0.5053 * y * y + 0.299 * i * i + 0.1957 * q * q
+
+
+def edge_mask(shape: tuple[int, int], ys: np.ndarray, xs: np.ndarray) -> np.ndarray:
+    """Whether each (ys, xs) pixel lies on the image border."""
+    height, width = shape
+    return (ys == 0) | (xs == 0) | (ys == height - 1) | (xs == width - 1)
+
+
+def many_siblings(packed: np.ndarray) -> np.ndarray:
+    """Per pixel: whether more than 2 of its neighbours have exactly its color.
+
+    Border pixels count as having one such neighbour already, as in pixelmatch.
+    """
+    height, width = packed.shape
+    padded = np.pad(packed, 1, constant_values=-1)
+    ys, xs = np.indices(packed.shape)
+    count = edge_mask(packed.shape, ys, xs).astype(np.int8)
+    for dy, dx in NEIGHBOURS:
+        count += padded[1 + dy : 1 + dy + height, 1 + dx : 1 + dx + width] == packed
+    return count > 2
+
+
+def anti_aliased(
+    image: np.ndarray,
+    siblings: np.ndarray,
+    other_siblings: np.ndarray,
+    ys: np.ndarray,
+    xs: np.ndarray,
+) -> np.ndarray:
+    """pixelmatch's anti-aliasing test for the (ys, xs) pixels of image.
+
+    A pixel is anti-aliased when at most 2 neighbours share its brightness,
+    it has both a darker and a brighter neighbour, and the darkest or the
+    brightest of those sits in a flat area (more than 2 identical siblings)
+    in both images.
+    """
+    brightness = image @ Y_WEIGHTS
+    padded = np.pad(brightness, 1, constant_values=np.nan)
+    center = brightness[ys, xs]
+    deltas = np.stack([center - padded[ys + 1 + dy, xs + 1 + dx] for dy, dx in NEIGHBOURS], axis=1)
+
+    valid = ~np.isnan(deltas)
+    zeroes = edge_mask(brightness.shape, ys, xs) + ((deltas == 0) & valid).sum(axis=1)
+    darker = np.where(valid & (deltas < 0), deltas, np.inf)
+    brighter = np.where(valid & (deltas > 0), deltas, -np.inf)
+    candidate = (zeroes <= 2) & np.isfinite(darker.min(axis=1)) & np.isfinite(brighter.max(axis=1))
+
+    offsets = np.array(NEIGHBOURS)
+    result = np.zeros(len(ys), dtype=bool)
+    for extreme in (darker.argmin(axis=1), brighter.argmax(axis=1)):
+        ny, nx = ys + offsets[extreme, 0], xs + offsets[extreme, 1]
+        ny, nx = ny.clip(0, brightness.shape[0] - 1), nx.clip(0, brightness.shape[1] - 1)
+        result |= siblings[ny, nx] & other_siblings[ny, nx]
+    return candidate & result
+
+
+def pack_colors(image: np.ndarray) -> np.ndarray:
+    """One int32 per pixel so whole colors compare in a single operation."""
+    rgb = image.astype(np.int32)
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+
+
+def render_diff(baseline: np.ndarray, mismatched: np.ndarray, anti_aliased: np.ndarray) -> bytes:
+    """PNG of the faded baseline with mismatches in red and anti-aliasing in yellow."""
+    luminance = baseline @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    faded = (255 - 0.1 * (255 - luminance)).astype(np.uint8)
+    out = np.repeat(faded[..., None], 3, axis=2)
+    out[anti_aliased] = (255, 255, 0)
+    out[mismatched] = (255, 0, 0)
+    buffer = io.BytesIO()
+    Image.fromarray(out).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def compare(
+    actual: bytes,
+    baseline: bytes,
+    threshold: float = 0.1,
+    anti_aliasing: bool = True,
+    use_hash: bool = False,
+    max_mismatch: float = 0.0,
+) -> tuple[dict, bytes | None]:
+    """Compare an encoded screenshot with an encoded baseline.
+
+    Cheap checks run first: identical bytes, then (with use_hash) an equal
+    perceptual hash, which trades exactness for speed. Otherwise every pixel
+    is compared in YIQ space; a pixel mismatches when its delta exceeds
+    threshold (0-1) of the maximum. With anti_aliasing, differing pixels that
+    pass pixelmatch's anti-aliasing test in either image are not counted.
+
+    The report's match is computed from the exact ratio (so any mismatch fails
+    at max_mismatch 0); mismatch_ratio is rounded for display.
+
+    Returns the report and, when pixels mismatch, a PNG diff image.
+    """
+    if actual == baseline:
+        return {
+            "method": "bytes",
+            "mismatched_pixels": 0,
+            "mismatch_ratio": 0.0,
+            "match": True,
+        }, None
+
+    actual_image, baseline_image = decode(actual), decode(baseline)
+    if actual_image.size != baseline_image.size:
+        width, height = baseline_image.size
+        return {
+            "method": "size",
+            "mismatch_ratio": 1.0,
+            "match": False,
+            "error": f"size {actual_image.width}x{actual_image.height} != baseline {width}x{height}",
+        }, None
+
+    if use_hash and np.array_equal(color_hash(actual_image), color_hash(baseline_image)):
+        return {
+            "method": "hash",
+            "mismatched_pixels": 0,
+            "mismatch_ratio": 0.0,
+            "match": True,
+        }, None
+
+    a = np.asarray(actual_image, dtype=np.float32)
+    b = np.asarray(baseline_image, dtype=np.float32)
+    if np.array_equal(a, b):
+        return {
+            "method": "pixels",
+            "mismatched_pixels": 0,
+            "mismatch_ratio": 0.0,
+            "match": True,
+        }, None
+
+    max_delta = MAX_YIQ_DELTA * threshold * threshold
+    differs = yiq_delta(a, b) > max_delta
+
+    anti_aliased_mask = np.zeros_like(differs)
+    if anti_aliasing and differs.any():
+        ys, xs = np.nonzero(differs)
+        siblings_a, siblings_b = many_siblings(pack_colors(a)), many_siblings(pack_colors(b))
+        smoothed = anti_aliased(a, siblings_a, siblings_b, ys, xs) | anti_aliased(
+            b, siblings_b, siblings_a, ys, xs
+        )
+        anti_aliased_mask[ys[smoothed], xs[smoothed]] = True
+    mismatched = differs & ~anti_aliased_mask
+
+    count = int(mismatched.sum())
+    ratio = count / mismatched.size
+    report = {
+        "method": "pixels",
+        "mismatched_pixels": count,
+        "anti_aliased_pixels": int(anti_aliased_mask.sum()),
+        "mismatch_ratio": round(ratio, 6),
+        "match": ratio <= max_mismatch,
+    }
+    diff = render_diff(b, mismatched, anti_aliased_mask) if count else None
+    return report, diff
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare a screenshot with a baseline image and print a JSON report",
+        epilog="Exit code: 0 when the images match, 1 when they don't, 2 on usage errors.",
+    )
+    parser.add_argument("actual", help="Screenshot to check")
+    parser.add_argument("baseline", help="Baseline image")
+    parser.add_argument("--diff", metavar="PATH", help="Write a diff image here on mismatch")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Color distance, 0-1")
+    parser.add_argument("--max-mismatch", type=float, default=0.0, metavar="RATIO")
+    parser.add_argument("--no-aa", action="store_true", help="Count anti-aliasing as mismatches")
+    parser.add_argument("--fast", action="store_true", help="Accept a matching perceptual hash")
+    args = parser.parse_args()
+
+    report, diff = compare(
+        Path(args.actual).read_bytes(),
+        Path(args.baseline).read_bytes(),
+        threshold=args.threshold,
+        anti_aliasing=not args.no_aa,
+        use_hash=args.fast,
+        max_mismatch=args.max_mismatch,
+    )
+    if diff and args.diff:
+        Path(args.diff).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.diff).write_bytes(diff)
+        report["diff"] = args.diff
+    print(json.dumps(report))
+    return 0 if report["match"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
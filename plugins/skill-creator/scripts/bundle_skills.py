@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Skill Bundler - Packs several skills into one content-addressed bundle
+
+A bundle is a zip file that stores every distinct file once under its
+SHA-256 digest (blobs/<digest>) plus a manifest.json that maps each skill's
+relative paths to those blobs. Files shared between skills (LICENSE.txt,
+common references, assets) are therefore stored only once.
+
+Usage:
+    bundle_skills.py pack <bundle-file> <path/to/skill-folder>...
+    bundle_skills.py unpack <bundle-file> <output-directory> [skill-name...]
+    bundle_skills.py list <bundle-file>
+
+Examples:
+    bundle_skills.py pack dist/marketplace.skillbundle plugins/*/
+    bundle_skills.py unpack dist/marketplace.skillbundle ~/.claude/skills pdf
+    bundle_skills.py list dist/marketplace.skillbundle
+"""
+
+import hashlib
+import json
+import re
+import shutil
+import sys
+import zipfile
+from pathlib import Path
+from quick_validate import validate_skill
+
+
+BUNDLE_FORMAT = 1
+MANIFEST_NAME = 'manifest.json'
+BLOB_PREFIX = 'blobs/'
+CHUNK_SIZE = 1024 * 1024
+# Fixed timestamp so identical inputs always produce identical bundles
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+SKILL_NAME_PATTERN = re.compile(r'^[a-z0-9]+(-[a-z0-9]+)*$')
+
+
+def hash_file(file_path):
+    """Return the hex SHA-256 digest of a file, read in fixed-size chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def collect_skill_files(skill_path):
+    """Return the skill's files as sorted (relative posix path, absolute path) pairs."""
+    files = [
+        (file_path.relative_to(skill_path).as_posix(), file_path)
+        for file_path in skill_path.rglob('*')
+        if file_path.is_file()
+    ]
+    return sorted(files)
+
+
+def pack_bundle(bundle_file, skill_paths):
+    """
+    Pack skill folders into a content-addressed bundle.
+
+    Args:
+        bundle_file: Path of the bundle to create
+        skill_paths: Paths to the skill folders to include
+
+    Returns:
+        Path to the created bundle, or None if error
+    """
+    skills = {}
+    blobs = {}
+
+    for skill_path in skill_paths:
+        skill_path = Path(skill_path).resolve()
+        if not skill_path.is_dir():
+            print(f"❌ Error: Skill folder not found: {skill_path}")
+            return None
+
+        valid, message = validate_skill(skill_path)
+        if not valid:
+            print(f"❌ Validation failed for {skill_path.name}: {message}")
+            return None
+
+        skill_name = skill_path.name
+        if skill_name in skills:
+            print(f"❌ Error: Duplicate skill name in bundle: {skill_name}")
+            return None
+
+        entries = {}
+        for rel_path, file_path in collect_skill_files(skill_path):
+            digest = hash_file(file_path)
+            stat = file_path.stat()
+            entries[rel_path] = {
+                'sha256': digest,
+                'size': stat.st_size,
+                'mode': stat.st_mode & 0o777,
+            }
+            blobs.setdefault(digest, file_path)
+
+        skills[skill_name] = {'files': entries}
+        print(f"  Added skill: {skill_name} ({len(entries)} files)")
+
+    manifest = {
+        'format': BUNDLE_FORMAT,
+        'skills': skills,
+    }
+
+    bundle_file = Path(bundle_file).resolve()
+    bundle_file.parent.mkdir(parents=True, exist_ok=True)
+    # Build next to the target and rename on success, so a failure never
+    # leaves a truncated bundle behind
+    partial_file = bundle_file.with_name(bundle_file.name + '.partial')
+
+    try:
+        with zipfile.ZipFile(partial_file, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            info = zipfile.ZipInfo(MANIFEST_NAME, date_time=ZIP_EPOCH)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            zipf.writestr(info, json.dumps(manifest, indent=2, sort_keys=True))
+
+            for digest in sorted(blobs):
+                info = zipfile.ZipInfo(BLOB_PREFIX + digest, date_time=ZIP_EPOCH)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                # A known size lets zipfile switch to ZIP64 for blobs over 2 GiB
+                info.file_size = blobs[digest].stat().st_size
+                with open(blobs[digest], 'rb') as src, zipf.open(info, 'w') as dst:
+                    shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        partial_file.replace(bundle_file)
+    except Exception as e:
+        partial_file.unlink(missing_ok=True)
+        print(f"❌ Error creating bundle: {e}")
+        return None
+
+    total_files = sum(len(skill['files']) for skill in skills.values())
+    print(f"\n✅ Bundled {len(skills)} skill(s), {total_files} files, "
+          f"{len(blobs)} unique blobs to: {bundle_file}")
+    return bundle_file
+
+
+def read_manifest(zipf):
+    """Read and check the manifest of an open bundle."""
+    manifest = json.loads(zipf.read(MANIFEST_NAME))
+    if manifest.get('format') != BUNDLE_FORMAT:
+        raise ValueError(f"Unsupported bundle format: {manifest.get('format')}")
+    return manifest
+
+
+def safe_skill_dir(output_dir, skill_name):
+    """Resolve a skill's folder inside output_dir, refusing names that are not hyphen-case."""
+    if not SKILL_NAME_PATTERN.match(skill_name):
+        raise ValueError(f"Invalid skill name in bundle: {skill_name!r}")
+    skill_dir = (output_dir / skill_name).resolve()
+    if not skill_dir.is_relative_to(output_dir):
+        raise ValueError(f"Unsafe skill name in bundle: {skill_name!r}")
+    return skill_dir
+
+
+def extract_blob(zipf, digest, destination):
+    """Extract a blob to destination, checking its content against the digest."""
+    actual = hashlib.sha256()
+    with zipf.open(BLOB_PREFIX + digest) as src, open(destination, 'wb') as dst:
+        for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+            actual.update(chunk)
+            dst.write(chunk)
+    if actual.hexdigest() != digest:
+        destination.unlink()
+        raise ValueError(f"Corrupt blob in bundle: {digest}")
+
+
+def safe_destination(skill_dir, rel_path):
+    """Resolve rel_path inside skill_dir, refusing paths that escape it."""
+    destination = (skill_dir / rel_path).resolve()
+    if not destination.is_relative_to(skill_dir):
+        raise ValueError(f"Unsafe path in bundle: {rel_path}")
+    return destination
+
+
+def unpack_bundle(bundle_file, output_dir, skill_names=None):
+    """
+    Rebuild skills from a bundle.
+
+    Each blob is decompressed at most once and checked against its SHA-256
+    address; further files with the same content are copied from the first
+    extracted file. Skill names must be hyphen-case and paths must stay
+    inside output_dir.
+
+    Args:
+        bundle_file: Path to the bundle
+        output_dir: Directory that receives one folder per skill
+        skill_names: Skills to extract (defaults to every skill in the bundle)
+
+    Returns:
+        List of created skill directories, or None if error
+    """
+    output_dir = Path(output_dir).resolve()
+
+    try:
+        with zipfile.ZipFile(bundle_file) as zipf:
+            manifest = read_manifest(zipf)
+            skills = manifest['skills']
+
+            if skill_names:
+                unknown = sorted(set(skill_names) - set(skills))
+                if unknown:
+                    print(f"❌ Error: Skill(s) not in bundle: {', '.join(unknown)}")
+                    return None
+            else:
+                skill_names = sorted(skills)
+
+            extracted = {}
+            created = []
+            for skill_name in skill_names:
+                skill_dir = safe_skill_dir(output_dir, skill_name)
+                if skill_dir.exists():
+                    print(f"❌ Error: Skill directory already exists: {skill_dir}")
+                    return None
+
+                for rel_path, entry in sorted(skills[skill_name]['files'].items()):
+                    destination = safe_destination(skill_dir, rel_path)
+                    destination.parent.mkdir(parents=True, exist_ok=True)
+
+                    digest = entry['sha256']
+                    if digest in extracted:
+                        shutil.copyfile(extracted[digest], destination)
+                    else:
+                        extract_blob(zipf, digest, destination)
+                        extracted[digest] = destination
+                    destination.chmod(entry.get('mode', 0o644))
+
+                print(f"✅ Installed {skill_name} to {skill_dir}")
+                created.append(skill_dir)
+
+            return created
+
+    except Exception as e:
+        print(f"❌ Error unpacking bundle: {e}")
+        return None
+
+
+def list_bundle(bundle_file):
+    """Print the skills in a bundle with their file counts and sizes."""
+    try:
+        with zipfile.ZipFile(bundle_file) as zipf:
+            manifest = read_manifest(zipf)
+    except Exception as e:
+        print(f"❌ Error reading bundle: {e}")
+        return False
+
+    for skill_name, skill in sorted(manifest['skills'].items()):
+        files = skill['files']
+        size = sum(entry['size'] for entry in files.values())
+        print(f"{skill_name}\t{len(files)} files\t{size} bytes")
+    return True
+
+
+def print_usage():
+    print("Usage:")
+    print("  bundle_skills.py pack <bundle-file> <path/to/skill-folder>...")
+    print("  bundle_skills.py unpack <bundle-file> <output-directory> [skill-name...]")
+    print("  bundle_skills.py list <bundle-file>")
+    print("\nExamples:")
+    print("  bundle_skills.py pack dist/marketplace.skillbundle plugins/*/")
+    print("  bundle_skills.py unpack dist/marketplace.skillbundle ~/.claude/skills pdf")
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+
+    if command == 'pack' and len(sys.argv) >= 4:
+        print(f"📦 Bundling {len(sys.argv) - 3} skill(s) into: {sys.argv[2]}\n")
+        result = pack_bundle(sys.argv[2], sys.argv[3:])
+    elif command == 'unpack' and len(sys.argv) >= 4:
+        result = unpack_bundle(sys.argv[2], sys.argv[3], sys.argv[4:])
+    elif command == 'list' and len(sys.argv) == 3:
+        result = list_bundle(sys.argv[2])
+    else:
+        print_usage()
+        sys.exit(1)
+
+    sys.exit(0 if result else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,20 +4,38 @@ Skill Initializer - Creates a new skill from template
 
 Usage:
     init_skill.py <skill-name> --path <path>
+    init_skill.py --spec <spec-file> --path <path> [--workers <n>]
 
 Examples:
     init_skill.py my-new-skill --path skills/public
     init_skill.py my-api-helper --path skills/private
     init_skill.py custom-skill --path /custom/location
+    init_skill.py --spec catalog.yaml --path skills/public --workers 16
+
+Spec files list the skills to create, each with a name and description:
+    YAML/JSON: a list of {name, description} mappings (optionally under a "skills" key)
+    CSV: a header row with "name" and "description" columns
 """
 
+import argparse
+import csv
+import json
+import re
+import shutil
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+import yaml
+from quick_validate import validate_skill
+
+
+DEFAULT_DESCRIPTION = "[TODO: Complete and informative explanation of what the skill does and when to use it. Include WHEN to use this skill - specific scenarios, file types, or tasks that trigger it.]"
 
 SKILL_TEMPLATE = """---
 name: {skill_name}
-description: [TODO: Complete and informative explanation of what the skill does and when to use it. Include WHEN to use this skill - specific scenarios, file types, or tasks that trigger it.]
+description: {description}
 ---
 
 # {skill_title}
@@ -222,7 +240,8 @@ def init_skill(skill_name, path):
     skill_title = title_case_skill_name(skill_name)
     skill_content = SKILL_TEMPLATE.format(
         skill_name=skill_name,
-        skill_title=skill_title
+        skill_title=skill_title,
+        description=DEFAULT_DESCRIPTION
     )
 
     skill_md_path = skill_dir / 'SKILL.md'
@@ -270,9 +289,174 @@ def init_skill(skill_name, path):
     return skill_dir
 
 
+def load_spec(spec_file):
+    """
+    Load skill entries from a YAML, JSON or CSV spec file.
+
+    Returns:
+        List of {'name': ..., 'description': ...} dicts
+    """
+    spec_file = Path(spec_file)
+    if spec_file.suffix.lower() == '.csv':
+        # utf-8-sig drops the byte order mark spreadsheet exports start with
+        with open(spec_file, newline='', encoding='utf-8-sig') as f:
+            entries = list(csv.DictReader(f))
+    else:
+        entries = yaml.safe_load(spec_file.read_text(encoding='utf-8-sig'))
+        if isinstance(entries, dict):
+            entries = entries.get('skills')
+
+    if not isinstance(entries, list):
+        raise ValueError("Spec must be a list of skills (or a mapping with a 'skills' list)")
+
+    skills = []
+    for index, entry in enumerate(entries, 1):
+        if not isinstance(entry, dict) or not entry.get('name'):
+            raise ValueError(f"Entry {index} is missing a 'name'")
+        skills.append({
+            'name': str(entry['name']).strip(),
+            'description': str(entry.get('description') or '').strip(),
+        })
+    return skills
+
+
+def render_skill_files(skill_name, description):
+    """Render every template file of a skill as (relative path, content, mode) tuples."""
+    skill_title = title_case_skill_name(skill_name)
+    # JSON strings are valid YAML scalars, so arbitrary descriptions stay parseable
+    description = json.dumps(description, ensure_ascii=False)
+    return [
+        ('SKILL.md', SKILL_TEMPLATE.format(
+            skill_name=skill_name,
+            skill_title=skill_title,
+            description=description
+        ), 0o644),
+        ('scripts/example.py', EXAMPLE_SCRIPT.format(skill_name=skill_name), 0o755),
+        ('references/api_reference.md', EXAMPLE_REFERENCE.format(skill_title=skill_title), 0o644),
+        ('assets/example_asset.txt', EXAMPLE_ASSET, 0o644),
+    ]
+
+
+def create_skill_atomically(skill_name, description, base_dir):
+    """
+    Create one skill in a staging directory, validate it, then move it into place.
+
+    Nothing is left behind at the final location unless the skill validates.
+
+    Returns:
+        (ok, message) tuple
+    """
+    if not re.match(r'^[a-z0-9]+(-[a-z0-9]+)*$', skill_name):
+        return False, "name must be hyphen-case (lowercase letters, digits, and hyphens only)"
+    if not description:
+        return False, "description is required"
+
+    skill_dir = base_dir / skill_name
+    if skill_dir.exists():
+        return False, f"directory already exists: {skill_dir}"
+
+    staging_dir = Path(tempfile.mkdtemp(prefix=f'.{skill_name}-', dir=base_dir))
+    try:
+        for rel_path, content, mode in render_skill_files(skill_name, description):
+            file_path = staging_dir / rel_path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_text(content, encoding='utf-8')
+            file_path.chmod(mode)
+        staging_dir.chmod(0o755)
+
+        valid, message = validate_skill(staging_dir)
+        if not valid:
+            return False, message
+
+        # rename() is atomic on the same filesystem, but on POSIX it silently
+        # replaces an empty directory, so re-check for one created meanwhile
+        if skill_dir.exists():
+            return False, f"directory already exists: {skill_dir}"
+        staging_dir.rename(skill_dir)
+        return True, str(skill_dir)
+    except Exception as e:
+        return False, str(e)
+    finally:
+        if staging_dir.exists():
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def init_skills_from_spec(spec_file, path, workers=8):
+    """
+    Initialize every skill listed in a spec file, writing skills concurrently.
+
+    Each skill is created transactionally: it either validates and appears at
+    its final location, or leaves nothing behind.
+
+    Args:
+        spec_file: Path to a YAML, JSON or CSV spec file
+        path: Path where the skill directories should be created
+        workers: Number of skills to write in parallel
+
+    Returns:
+        Number of skills that failed, or None if the spec could not be loaded
+    """
+    try:
+        skills = load_spec(spec_file)
+    except Exception as e:
+        print(f"❌ Error reading spec file: {e}")
+        return None
+
+    names = [skill['name'] for skill in skills]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        print(f"❌ Error: Duplicate skill name(s) in spec: {', '.join(duplicates)}")
+        return None
+
+    base_dir = Path(path).resolve()
+    base_dir.mkdir(parents=True, exist_ok=True)
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                create_skill_atomically, skill['name'], skill['description'], base_dir
+            ): skill['name']
+            for skill in skills
+        }
+        for future in as_completed(futures):
+            ok, message = future.result()
+            if ok:
+                print(f"✅ {futures[future]}")
+            else:
+                failed += 1
+                print(f"❌ {futures[future]}: {message}")
+
+    print(f"\n{len(skills) - failed} of {len(skills)} skill(s) initialized at {base_dir}")
+    return failed
+
+
+def main_spec():
+    parser = argparse.ArgumentParser(
+        prog='init_skill.py',
+        usage='init_skill.py --spec <spec-file> --path <path> [--workers <n>]',
+        description='Initialize every skill listed in a YAML, JSON or CSV spec file',
+    )
+    parser.add_argument('--spec', required=True, help='YAML, JSON or CSV spec file')
+    parser.add_argument('--path', required=True, help='Directory to create the skills in')
+    parser.add_argument('--workers', type=int, default=8, help='Skills written in parallel')
+    args = parser.parse_args()
+
+    print(f"🚀 Initializing skills from spec: {args.spec}")
+    print(f"   Location: {args.path}")
+    print()
+
+    failed = init_skills_from_spec(args.spec, args.path, max(1, args.workers))
+    sys.exit(0 if failed == 0 else 1)
+
+
 def main():
+    if any(arg == '--spec' or arg.startswith('--spec=') for arg in sys.argv[1:]):
+        main_spec()
+
     if len(sys.argv) < 4 or sys.argv[2] != '--path':
         print("Usage: init_skill.py <skill-name> --path <path>")
+        print("       init_skill.py --spec <spec-file> --path <path> [--workers <n>]")
         print("\nSkill name requirements:")
         print("  - Hyphen-case identifier (e.g., 'data-analyzer')")
         print("  - Lowercase letters, digits, and hyphens only")
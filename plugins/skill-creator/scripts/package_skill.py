@@ -8,14 +8,56 @@ Usage:
 Example:
     python utils/package_skill.py skills/public/my-skill
     python utils/package_skill.py skills/public/my-skill ./dist
+
+Every archive embeds <skill-name>/.skill-manifest.json with the SHA-256 digest
+and size of each packaged file (check it with verify_skill.py). Packaging is
+deterministic: unchanged skill content always produces byte-identical archives.
 """
 
+import hashlib
+import json
 import sys
 import zipfile
 from pathlib import Path
 from quick_validate import validate_skill
 
 
+MANIFEST_NAME = '.skill-manifest.json'
+MANIFEST_FORMAT = 1
+CHUNK_SIZE = 1024 * 1024
+# Fixed timestamp so identical inputs always produce identical archives
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+
+def make_zip_info(arcname, mode=0o644):
+    """Create a ZipInfo with a fixed timestamp and normalized permissions."""
+    info = zipfile.ZipInfo(arcname, date_time=ZIP_EPOCH)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.external_attr = (0o100000 | (mode & 0o777)) << 16
+    return info
+
+
+def add_file(zipf, file_path, arcname):
+    """
+    Stream a file into the archive, hashing it on the way.
+
+    Returns:
+        Manifest entry with the file's SHA-256 digest and size
+    """
+    digest = hashlib.sha256()
+    size = 0
+    stat = file_path.stat()
+    info = make_zip_info(arcname, 0o755 if stat.st_mode & 0o111 else 0o644)
+    # A known size lets zipfile switch to ZIP64 for files over 2 GiB
+    info.file_size = stat.st_size
+    with open(file_path, 'rb') as src, zipf.open(info, 'w') as dst:
+        for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+            dst.write(chunk)
+            size += len(chunk)
+    return {'sha256': digest.hexdigest(), 'size': size}
+
+
 def package_skill(skill_path, output_dir=None):
     """
     Package a skill folder into a .skill file.
@@ -62,22 +104,37 @@ def package_skill(skill_path, output_dir=None):
         output_path = Path.cwd()
 
     skill_filename = output_path / f"{skill_name}.skill"
+    # Build next to the target and rename on success, so a failure never
+    # leaves a truncated .skill file behind
+    partial_filename = output_path / f"{skill_name}.skill.partial"
 
     # Create the .skill file (zip format)
     try:
-        with zipfile.ZipFile(skill_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Walk through the skill directory
-            for file_path in skill_path.rglob('*'):
+        with zipfile.ZipFile(partial_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            manifest_arcname = f"{skill_name}/{MANIFEST_NAME}"
+            files = {}
+            # Walk through the skill directory in a stable order
+            for file_path in sorted(skill_path.rglob('*')):
                 if file_path.is_file():
                     # Calculate the relative path within the zip
-                    arcname = file_path.relative_to(skill_path.parent)
-                    zipf.write(file_path, arcname)
+                    arcname = file_path.relative_to(skill_path.parent).as_posix()
+                    if arcname == manifest_arcname:
+                        continue
+                    files[arcname] = add_file(zipf, file_path, arcname)
                     print(f"  Added: {arcname}")
 
+            manifest = {'format': MANIFEST_FORMAT, 'files': files}
+            zipf.writestr(
+                make_zip_info(manifest_arcname),
+                json.dumps(manifest, indent=2, sort_keys=True)
+            )
+        partial_filename.replace(skill_filename)
+
         print(f"\n✅ Successfully packaged skill to: {skill_filename}")
         return skill_filename
 
     except Exception as e:
+        partial_filename.unlink(missing_ok=True)
         print(f"❌ Error creating .skill file: {e}")
         return None
 
@@ -1,12 +1,21 @@
 #!/usr/bin/env python3
 """
 Quick validation script for skills - minimal version
+
+Usage:
+    quick_validate.py <skill_directory>
+    quick_validate.py --batch [--workers <n>] <path>...
+
+Batch mode accepts skill directories or root directories containing skills,
+validates them in parallel and streams one JSON object per skill to stdout.
 """
 
 import sys
 import os
 import re
+import json
 import yaml
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 def validate_skill(skill_path):
@@ -85,9 +94,67 @@ def validate_skill(skill_path):
 
     return True, "Skill is valid!"
 
+def find_skill_dirs(paths):
+    """Expand paths into skill directories, searching root directories for SKILL.md files"""
+    skill_dirs = []
+    for path in map(Path, paths):
+        if (path / 'SKILL.md').exists() or not path.is_dir():
+            skill_dirs.append(path)
+        else:
+            skill_dirs.extend(sorted(skill_md.parent for skill_md in path.rglob('SKILL.md')))
+    return list(dict.fromkeys(skill_dirs))
+
+
+def _validate_to_record(skill_path):
+    try:
+        valid, message = validate_skill(skill_path)
+    except Exception as e:
+        valid, message = False, f"Validation error: {e}"
+    return {'path': str(skill_path), 'valid': valid, 'message': message}
+
+
+def validate_batch(paths, workers=None):
+    """Validate many skills in parallel, printing one NDJSON record per skill as it finishes.
+
+    Returns:
+        (total, failed) counts
+    """
+    skill_dirs = find_skill_dirs(paths)
+    failed = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_validate_to_record, skill_dir) for skill_dir in skill_dirs]
+        for future in as_completed(futures):
+            record = future.result()
+            failed += not record['valid']
+            print(json.dumps(record), flush=True)
+    return len(skill_dirs), failed
+
+
+def main_batch(args):
+    workers = None
+    if args[:1] == ['--workers']:
+        try:
+            workers = max(1, int(args[1]))
+        except (IndexError, ValueError):
+            print("--workers requires an integer", file=sys.stderr)
+            sys.exit(2)
+        args = args[2:]
+    if not args:
+        print("Usage: python quick_validate.py --batch [--workers <n>] <path>...", file=sys.stderr)
+        sys.exit(2)
+
+    total, failed = validate_batch(args, workers)
+    print(f"{total - failed} of {total} skill(s) valid", file=sys.stderr)
+    sys.exit(0 if total and not failed else 1)
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--batch':
+        main_batch(sys.argv[2:])
+
     if len(sys.argv) != 2:
         print("Usage: python quick_validate.py <skill_directory>")
+        print("       python quick_validate.py --batch [--workers <n>] <path>...")
         sys.exit(1)
     
     valid, message = validate_skill(sys.argv[1])
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Skill Verifier - Checks .skill archives against their embedded manifest
+
+Every file entry is re-hashed by streaming it through SHA-256 in fixed-size
+chunks, so memory use stays bounded regardless of asset size. Archives are
+verified in parallel. Only problems are reported.
+
+The manifest is unsigned: this detects corruption and accidental changes,
+not deliberate tampering.
+
+Usage:
+    verify_skill.py [--workers <n>] <file.skill>...
+
+Example:
+    verify_skill.py dist/my-skill.skill
+    verify_skill.py --workers 8 dist/*.skill
+"""
+
+import hashlib
+import json
+import sys
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from package_skill import CHUNK_SIZE, MANIFEST_FORMAT, MANIFEST_NAME
+
+
+def find_manifest(zipf):
+    """Return the arcname of the archive's manifest, or None if there is none."""
+    for name in zipf.namelist():
+        if name.count('/') == 1 and name.endswith('/' + MANIFEST_NAME):
+            return name
+    return None
+
+
+def hash_entry(zipf, arcname):
+    """Stream one archive entry through SHA-256, returning (hex digest, size)."""
+    digest = hashlib.sha256()
+    size = 0
+    with zipf.open(arcname) as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def verify_archive(archive_path):
+    """
+    Verify one .skill archive against its embedded manifest.
+
+    Args:
+        archive_path: Path to the .skill file
+
+    Returns:
+        List of problem descriptions (empty if the archive is intact)
+    """
+    try:
+        with zipfile.ZipFile(archive_path) as zipf:
+            manifest_name = find_manifest(zipf)
+            if manifest_name is None:
+                return [f"missing {MANIFEST_NAME}"]
+
+            manifest = json.loads(zipf.read(manifest_name))
+            if manifest.get('format') != MANIFEST_FORMAT:
+                return [f"unsupported manifest format: {manifest.get('format')}"]
+
+            expected = manifest['files']
+            actual = {
+                info.filename for info in zipf.infolist()
+                if not info.is_dir() and info.filename != manifest_name
+            }
+
+            problems = [f"{name}: missing from archive" for name in sorted(set(expected) - actual)]
+            problems += [f"{name}: not in manifest" for name in sorted(actual - set(expected))]
+
+            for name in sorted(actual & set(expected)):
+                try:
+                    digest, size = hash_entry(zipf, name)
+                except (zipfile.BadZipFile, OSError) as e:
+                    problems.append(f"{name}: unreadable ({e})")
+                    continue
+                if size != expected[name]['size']:
+                    problems.append(f"{name}: size {size} != {expected[name]['size']}")
+                elif digest != expected[name]['sha256']:
+                    problems.append(f"{name}: sha256 mismatch")
+            return problems
+
+    except Exception as e:
+        return [f"cannot read archive ({e})"]
+
+
+def main():
+    args = sys.argv[1:]
+    workers = None
+    if args[:1] == ['--workers']:
+        try:
+            workers = max(1, int(args[1]))
+        except (IndexError, ValueError):
+            print("❌ Error: --workers requires an integer")
+            sys.exit(1)
+        args = args[2:]
+
+    if not args:
+        print("Usage: verify_skill.py [--workers <n>] <file.skill>...")
+        print("\nExample:")
+        print("  verify_skill.py dist/my-skill.skill")
+        print("  verify_skill.py --workers 8 dist/*.skill")
+        sys.exit(1)
+
+    # zlib and hashlib release the GIL on large buffers, so threads scale here
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(verify_archive, args)
+
+        failed = 0
+        for archive_path, problems in zip(args, results):
+            if problems:
+                failed += 1
+                for problem in problems:
+                    print(f"❌ {archive_path}: {problem}")
+
+    if failed:
+        print(f"\n{failed} of {len(args)} archive(s) failed verification")
+        sys.exit(1)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
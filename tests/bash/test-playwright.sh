@@ -22,6 +22,12 @@ TESTS_TOTAL=0
 TEST_TMP="${TMPDIR:-/tmp}/playwright-test-$$"
 mkdir -p "$TEST_TMP"
 
+# PLAYWRIGHT_OFFLINE=1 serves example.com from a recorded HAR so no network is needed
+PLAYWRIGHT_OFFLINE="${PLAYWRIGHT_OFFLINE:-0}"
+if [[ "$PLAYWRIGHT_OFFLINE" == "1" ]]; then
+    export PLAYWRIGHT_REPLAY_HAR="$REPO_ROOT/tests/fixtures/example.com.har"
+fi
+
 # Helper function to run test with expected exit code
 run_test() {
     local test_name="$1"
@@ -137,6 +143,12 @@ run_test_file_exists() {
 # Cleanup function
 cleanup() {
     echo -e "\n${BLUE}Cleaning up test artifacts...${NC}"
+    if [[ -n "${SITE_PID:-}" ]]; then
+        kill "$SITE_PID" 2>/dev/null || true
+    fi
+    if [[ -n "${REDIRECT_PID:-}" ]]; then
+        kill "$REDIRECT_PID" 2>/dev/null || true
+    fi
     rm -rf "$TEST_TMP"
 }
 
@@ -149,6 +161,7 @@ echo -e "${BLUE}╚════════════════════
 echo ""
 echo "Scripts directory: $PLAYWRIGHT_DIR"
 echo "Temp directory: $TEST_TMP"
+echo "Offline (HAR replay): $PLAYWRIGHT_OFFLINE"
 echo ""
 
 # ============================================================================
@@ -157,7 +170,7 @@ echo ""
 
 echo -e "\n${BLUE}=== Script Existence Tests ===${NC}"
 
-for script in check_setup.py screenshot.py navigate.py fill_form.py evaluate.py; do
+for script in check_setup.py screenshot.py navigate.py fill_form.py evaluate.py daemon.py runtime.py run_steps.py crawl.py pw.py; do
     TESTS_TOTAL=$((TESTS_TOTAL + 1))
     if [[ -f "$PLAYWRIGHT_DIR/$script" ]]; then
         echo -e "${GREEN}✓${NC} $script exists"
@@ -178,6 +191,22 @@ run_test_output_contains "check_setup.py shows browser status" \
     "Checking Playwright browser installation" \
     uv run "$PLAYWRIGHT_DIR/check_setup.py"
 
+run_test_output_contains "check_setup.py finds chromium without the driver" \
+    "chromium: /" \
+    uv run "$PLAYWRIGHT_DIR/check_setup.py"
+
+run_test_output_contains "check_setup.py finds the chromium headless shell" \
+    "chromium-headless-shell: /" \
+    uv run "$PLAYWRIGHT_DIR/check_setup.py"
+
+run_test_output_contains "check_setup.py --deep launches chromium" \
+    "chromium: /" \
+    uv run "$PLAYWRIGHT_DIR/check_setup.py" --deep
+
+run_test_output_contains "check_setup.py reports missing browsers from an empty cache" \
+    "chromium: missing" \
+    env PLAYWRIGHT_BROWSERS_PATH="$TEST_TMP/no-browsers" uv run "$PLAYWRIGHT_DIR/check_setup.py"
+
 # ============================================================================
 # TEST: screenshot.py
 # ============================================================================
@@ -196,6 +225,69 @@ run_test_file_exists "screenshot.py captures example.com" \
     "$SCREENSHOT_PATH" \
     uv run "$PLAYWRIGHT_DIR/screenshot.py" https://example.com --headless -o "$SCREENSHOT_PATH"
 
+run_test_file_exists "screenshot.py creates missing output directories" \
+    "$TEST_TMP/new/dir/shot.png" \
+    uv run "$PLAYWRIGHT_DIR/screenshot.py" https://example.com --headless -o "$TEST_TMP/new/dir/shot.png"
+
+printf 'https://example.com\nhttps://example.com 375x812 %s\n' "$TEST_TMP/batch-mobile.png" > "$TEST_TMP/batch.txt"
+run_test_output_contains "screenshot.py --batch streams NDJSON results" \
+    '"ok": true' \
+    uv run "$PLAYWRIGHT_DIR/screenshot.py" --batch "$TEST_TMP/batch.txt" --headless --output-dir "$TEST_TMP"
+
+run_test_file_exists "screenshot.py --batch honors per-line output path" \
+    "$TEST_TMP/batch-mobile.png" \
+    true
+
+run_test "screenshot.py rejects negative --retries" 2 \
+    uv run "$PLAYWRIGHT_DIR/screenshot.py" --batch "$TEST_TMP/batch.txt" --retries -1
+
+run_test_file_exists "screenshot.py --quality writes a JPEG element capture" \
+    "$TEST_TMP/heading.jpg" \
+    uv run "$PLAYWRIGHT_DIR/screenshot.py" https://example.com --headless \
+    --selector h1 --quality 60 --scale css -o "$TEST_TMP/heading.jpg"
+
+uv run "$PLAYWRIGHT_DIR/screenshot.py" https://example.com --headless \
+    --clip 0,0,320,200 --output - > "$TEST_TMP/stdout-shot.png" 2>/dev/null || true
+run_test_output_contains "screenshot.py --output - streams PNG bytes to stdout" \
+    "PNG" \
+    head -c 4 "$TEST_TMP/stdout-shot.png"
+
+run_test "screenshot.py rejects --quality with --format png" 2 \
+    uv run "$PLAYWRIGHT_DIR/screenshot.py" https://example.com --format png --quality 50
+
+BASELINE_PATH="$TEST_TMP/baselines/example.png"
+run_test_output_contains "screenshot.py --baseline creates a missing baseline" \
+    '"baseline_written": true' \
+    uv run "$PLAYWRIGHT_DIR/screenshot.py" https://example.com --headless \
+    -o "$TEST_TMP/compare.png" --baseline "$BASELINE_PATH"
+
+run_test_output_contains "screenshot.py --baseline matches an unchanged page" \
+    '"match": true' \
+    uv run "$PLAYWRIGHT_DIR/screenshot.py" https://example.com --headless \
+    -o "$TEST_TMP/compare.png" --baseline "$BASELINE_PATH"
+
+cat > "$TEST_TMP/changed.html" <<'HTML'
+<body style="background: #c00"><h1>Changed</h1></body>
+HTML
+run_test "screenshot.py --baseline fails on a changed page" 1 \
+    uv run "$PLAYWRIGHT_DIR/screenshot.py" "file://$TEST_TMP/changed.html" --headless --wait-until load \
+    -o "$TEST_TMP/changed.png" --baseline "$BASELINE_PATH"
+
+run_test_file_exists "screenshot.py --baseline writes a diff image" \
+    "$TEST_TMP/changed.diff.png" \
+    true
+
+# A solid line moved down by 1px is a real change, not anti-aliasing
+for top in 40 41; do
+    echo "<body style=\"margin: 0\"><div style=\"position: absolute; top: ${top}px; left: 10px; width: 300px; height: 1px; background: #000\"></div></body>" \
+        > "$TEST_TMP/line-$top.html"
+done
+uv run "$PLAYWRIGHT_DIR/screenshot.py" "file://$TEST_TMP/line-40.html" --headless --wait-until load \
+    -o "$TEST_TMP/line-40.png" --baseline "$TEST_TMP/line-baseline.png" >/dev/null 2>&1 || true
+run_test "screenshot.py --baseline fails on a line shifted by 1px" 1 \
+    uv run "$PLAYWRIGHT_DIR/screenshot.py" "file://$TEST_TMP/line-41.html" --headless --wait-until load \
+    -o "$TEST_TMP/line-41.png" --baseline "$TEST_TMP/line-baseline.png"
+
 # ============================================================================
 # TEST: navigate.py
 # ============================================================================
@@ -217,6 +309,14 @@ run_test_output_contains "navigate.py --title extracts title" \
     "Example Domain" \
     uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --headless --title
 
+run_test_output_contains "navigate.py --wait-until domcontentloaded with DOM quiescence" \
+    "Example Domain" \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --headless --title \
+    --wait-until domcontentloaded --wait-for h1 --dom-quiet 200
+
+run_test "navigate.py rejects unknown --wait-until" 2 \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --wait-until never
+
 run_test_output_contains "navigate.py --links returns JSON" \
     '"href"' \
     uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --headless --links
@@ -225,6 +325,104 @@ run_test_output_contains "navigate.py --text extracts text" \
     "This domain is for use in" \
     uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --headless --text
 
+run_test_output_contains "navigate.py --block still extracts text" \
+    "This domain is for use in" \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --headless --text \
+    --block images,media,fonts,stylesheets,third-party
+
+STATE_PATH="$TEST_TMP/state.json"
+run_test_file_exists "navigate.py --save-state writes storage state" \
+    "$STATE_PATH" \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --headless --title --save-state "$STATE_PATH"
+
+run_test_output_contains "navigate.py --load-state reuses saved state" \
+    "Example Domain" \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --headless --title --load-state "$STATE_PATH"
+
+run_test_output_contains "navigate.py --load-state warns about missing state" \
+    "not loading state" \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --headless --title --load-state "$TEST_TMP/missing.json"
+
+run_test_output_contains "navigate.py --replay-har serves fixture offline" \
+    "Example Domain" \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --headless --title \
+    --replay-har "$REPO_ROOT/tests/fixtures/example.com.har"
+
+if [[ "$PLAYWRIGHT_OFFLINE" != "1" ]]; then
+    HAR_PATH="$TEST_TMP/recorded.har"
+    run_test_file_exists "navigate.py --record-har writes HAR archive" \
+        "$HAR_PATH" \
+        uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --headless --title --record-har "$HAR_PATH"
+
+    run_test_output_contains "navigate.py --replay-har replays recorded HAR" \
+        "Example Domain" \
+        uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --headless --title --replay-har "$HAR_PATH"
+fi
+
+run_test_output_contains "navigate.py --metrics reports navigation timing" \
+    '"ttfb_ms"' \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --headless --metrics --wait-until load
+
+run_test_output_contains "navigate.py --metrics --repeat summarizes runs" \
+    '"navigation.load_ms"' \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --headless --metrics --repeat 3 --wait-until load
+
+run_test "navigate.py --repeat without --metrics fails" 2 \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --repeat 3
+
+run_test_output_contains "navigate.py --network reports sizes per type offline" \
+    '"by_type"' \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --headless --network \
+    --replay-har "$REPO_ROOT/tests/fixtures/example.com.har"
+
+run_test "navigate.py --network exits 1 over budget" 1 \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --headless --network --budget document=10B \
+    --replay-har "$REPO_ROOT/tests/fixtures/example.com.har"
+
+run_test "navigate.py --budget rejects unknown resource types" 2 \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --network --budget scirpt=100KB
+
+run_test "navigate.py --budget without --network fails" 2 \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --budget 1MB
+
+run_test_output_contains "navigate.py --trace times goto up to the --wait-until event" \
+    '"span": "goto", "at_ms"' \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --headless --title --trace
+
+run_test_output_contains "navigate.py --trace before the URL leaves the URL alone" \
+    '"span": "goto"' \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" --trace https://example.com --headless --title
+
+run_test "navigate.py --trace-out rejects an unwritable file" 2 \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --trace-out "$TEST_TMP/missing-dir/spans.ndjson"
+
+run_test_output_contains "PLAYWRIGHT_TRACE appends spans to a file" \
+    '"span": "extract"' \
+    bash -c "PLAYWRIGHT_TRACE='$TEST_TMP/spans.ndjson' uv run '$PLAYWRIGHT_DIR/navigate.py' https://example.com --headless --title && cat '$TEST_TMP/spans.ndjson'"
+
+run_test_file_exists "navigate.py --trace-zip writes a Playwright trace" \
+    "$TEST_TMP/trace.zip" \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --headless --title --trace-zip "$TEST_TMP/trace.zip"
+
+LINKS_PAGE="$TEST_TMP/links.html"
+cat > "$LINKS_PAGE" <<'HTML'
+<nav><a href="https://example.com/a">A</a><a href="https://example.com/a">A again</a></nav>
+<main><a href="https://example.com/b">B</a><a href="https://example.com/c">C</a><p>Body text</p></main>
+HTML
+
+run_test_output_contains "navigate.py --ndjson --dedupe streams unique links" \
+    '{"text": "B", "href": "https://example.com/b"}' \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" "file://$LINKS_PAGE" --headless --wait-until load \
+    --links --ndjson --dedupe --offset 1 --limit 1 --chunk-size 1
+
+run_test_output_contains "navigate.py --selector scopes --text" \
+    '{"text": "Body text"}' \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" "file://$LINKS_PAGE" --headless --wait-until load \
+    --text --ndjson --selector p
+
+run_test "navigate.py --limit without --ndjson fails" 2 \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --links --limit 5
+
 # ============================================================================
 # TEST: evaluate.py
 # ============================================================================
@@ -247,6 +445,74 @@ run_test_output_contains "evaluate.py counts links" \
     "1" \
     uv run "$PLAYWRIGHT_DIR/evaluate.py" https://example.com "document.querySelectorAll('a').length" --headless
 
+# Page with one image, served locally (route blocking doesn't see file:// URLs).
+# HAR replay would abort its requests, so these run with PLAYWRIGHT_REPLAY_HAR unset.
+IMG_DIR="$TEST_TMP/img-site"
+mkdir -p "$IMG_DIR"
+echo '<title>Image</title><img src="pixel.png">' > "$IMG_DIR/index.html"
+python3 -c 'import base64, sys; sys.stdout.buffer.write(base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8DwHwAFBQIAX8jx0gAAAABJRU5ErkJggg=="))' \
+    > "$IMG_DIR/pixel.png"
+IMG_PORT=$(python3 -c 'import socket; s = socket.socket(); s.bind(("127.0.0.1", 0)); print(s.getsockname()[1])')
+python3 -m http.server "$IMG_PORT" --bind 127.0.0.1 --directory "$IMG_DIR" >/dev/null 2>&1 &
+SITE_PID=$!
+IMG_URL="http://127.0.0.1:$IMG_PORT/"
+IMG_WIDTH="'width=' + document.querySelector('img').naturalWidth"
+sleep 1
+
+run_test_output_contains "evaluate.py loads the image without --block" \
+    "width=1" \
+    env -u PLAYWRIGHT_REPLAY_HAR uv run "$PLAYWRIGHT_DIR/evaluate.py" "$IMG_URL" "$IMG_WIDTH" \
+    --headless --wait-until load
+
+run_test_output_contains "evaluate.py --block images stops the image loading" \
+    "width=0" \
+    env -u PLAYWRIGHT_REPLAY_HAR uv run "$PLAYWRIGHT_DIR/evaluate.py" "$IMG_URL" "$IMG_WIDTH" \
+    --headless --wait-until load --block images
+
+kill "$SITE_PID" 2>/dev/null || true
+SITE_PID=""
+
+printf '%s\n' 'document.title' '{"id": "n", "expression": "s => document.querySelectorAll(s).length", "arg": "a"}' 'nope(' \
+    > "$TEST_TMP/repl.txt"
+run_test_output_contains "evaluate.py --repl evaluates stdin lines on one page" \
+    '"id": "n", "result": 1, "ok": true' \
+    bash -c "uv run '$PLAYWRIGHT_DIR/evaluate.py' https://example.com --repl --headless < '$TEST_TMP/repl.txt'"
+
+run_test_output_contains "evaluate.py --repl reports errors without stopping" \
+    '"ok": false' \
+    bash -c "uv run '$PLAYWRIGHT_DIR/evaluate.py' https://example.com --repl --headless < '$TEST_TMP/repl.txt'"
+
+printf '%s\n' "# pages" "file://$LINKS_PAGE" "file://$LINKS_PAGE?again" > "$TEST_TMP/urls.txt"
+run_test_output_contains "evaluate.py --urls evaluates every URL" \
+    '"result": 4, "ok": true' \
+    uv run "$PLAYWRIGHT_DIR/evaluate.py" --urls "$TEST_TMP/urls.txt" "document.links.length" \
+    --concurrency 2 --headless
+
+echo "http://127.0.0.1:9/" >> "$TEST_TMP/urls.txt"
+run_test "evaluate.py --urls exits 1 when a URL fails" 1 \
+    uv run "$PLAYWRIGHT_DIR/evaluate.py" --urls "$TEST_TMP/urls.txt" "document.title" --timeout 10 --headless
+
+run_test "evaluate.py rejects a url with --urls" 2 \
+    uv run "$PLAYWRIGHT_DIR/evaluate.py" https://example.com --urls "$TEST_TMP/urls.txt" "document.title"
+
+# ============================================================================
+# TEST: pw.py
+# ============================================================================
+
+echo -e "\n${BLUE}=== pw.py Tests ===${NC}"
+
+run_test_output_contains "pw.py prewarm reports the environment" \
+    '"chromium": true' \
+    uv run "$PLAYWRIGHT_DIR/pw.py" prewarm
+
+run_test_output_contains "pw.py dispatches to navigate.py" \
+    "Example Domain" \
+    uv run "$PLAYWRIGHT_DIR/pw.py" navigate https://example.com --title --headless
+
+run_test "pw.py rejects unknown commands" 2 \
+    uv run "$PLAYWRIGHT_DIR/pw.py" nope
+
 # ============================================================================
 # TEST: fill_form.py
 # ============================================================================
@@ -260,6 +526,216 @@ run_test_output_contains "fill_form.py --help shows usage" \
 run_test "fill_form.py without URL fails" 2 \
     uv run "$PLAYWRIGHT_DIR/fill_form.py"
 
+FORM_PAGE="$TEST_TMP/form.html"
+cat > "$FORM_PAGE" <<'HTML'
+<form>
+  <label for="e">Email address</label><input id="e">
+  <input placeholder="Search terms">
+  <input name="nickname">
+  <textarea id="notes"></textarea>
+</form>
+HTML
+
+run_test_output_contains "fill_form.py resolves fields by label, placeholder, name and id" \
+    "Filled by id: notes" \
+    uv run "$PLAYWRIGHT_DIR/fill_form.py" "file://$FORM_PAGE" --headless --wait-until load \
+    --field "email=a@example.com" --field "search=q" --field "nickname=n" --field "notes=hi"
+
+run_test_output_contains "fill_form.py warns about unknown fields" \
+    "Could not find field: missing" \
+    uv run "$PLAYWRIGHT_DIR/fill_form.py" "file://$FORM_PAGE" --headless --wait-until load \
+    --field "missing=x"
+
+# Values a number input rejects must surface as errors, not vanish in the batch fill
+printf '<input name="nickname"><input type="number" name="age">\n' > "$TEST_TMP/typed-form.html"
+run_test_output_contains "fill_form.py reports values a typed input rejects" \
+    "Cannot type text into input\[type=number\]" \
+    uv run "$PLAYWRIGHT_DIR/fill_form.py" "file://$TEST_TMP/typed-form.html" --headless \
+    --wait-until load --field "nickname=n" --field "age=abc"
+
+run_test_output_contains "navigate.py --a11y lists form controls with refs" \
+    'textbox "Email address" [e2]' \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" "file://$FORM_PAGE" --headless --wait-until load --a11y
+
+run_test_output_contains "navigate.py --a11y-json has nodes" \
+    '"ref": "e5"' \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" "file://$FORM_PAGE" --headless --wait-until load --a11y-json
+
+run_test "navigate.py --a11y can't be combined with --links" 2 \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" "file://$FORM_PAGE" --a11y --links
+
+run_test_output_contains "fill_form.py --ref fills snapshot refs" \
+    "Filled by ref: e3" \
+    uv run "$PLAYWRIGHT_DIR/fill_form.py" "file://$FORM_PAGE" --headless --wait-until load \
+    --ref "e3=query"
+
+run_test_output_contains "fill_form.py warns about unknown refs" \
+    "Could not find ref: e99" \
+    uv run "$PLAYWRIGHT_DIR/fill_form.py" "file://$FORM_PAGE" --headless --wait-until load \
+    --ref "e99=x"
+
+printf 'mail,nickname\na@example.com,ann\nb@example.com,bob\n' > "$TEST_TMP/rows.csv"
+run_test "fill_form.py --rows fills every row" 0 \
+    uv run "$PLAYWRIGHT_DIR/fill_form.py" "file://$FORM_PAGE" --headless --wait-until load \
+    --rows "$TEST_TMP/rows.csv" --map mail=email --results "$TEST_TMP/rows-results.ndjson"
+
+run_test_output_contains "fill_form.py --rows writes one result per row" \
+    '"row": 2' \
+    cat "$TEST_TMP/rows-results.ndjson"
+
+run_test "fill_form.py --rows fails rows when --expect never appears" 1 \
+    uv run "$PLAYWRIGHT_DIR/fill_form.py" "file://$FORM_PAGE" --headless --wait-until load \
+    --rows "$TEST_TMP/rows.csv" --map mail=email --submit --expect "#never" --timeout 10
+
+run_test "fill_form.py --expect requires --submit" 2 \
+    uv run "$PLAYWRIGHT_DIR/fill_form.py" "file://$FORM_PAGE" --expect "#done"
+
+printf '{"missing": "x"}\n' > "$TEST_TMP/bad-rows.ndjson"
+run_test "fill_form.py --rows fails rows with unknown fields" 1 \
+    uv run "$PLAYWRIGHT_DIR/fill_form.py" "file://$FORM_PAGE" --headless --wait-until load \
+    --rows "$TEST_TMP/bad-rows.ndjson"
+
+# ============================================================================
+# TEST: run_steps.py
+# ============================================================================
+
+echo -e "\n${BLUE}=== run_steps.py Tests ===${NC}"
+
+STEPS_FILE="$TEST_TMP/steps.yaml"
+cat > "$STEPS_FILE" <<EOF
+- action: goto
+  url: https://example.com
+- action: extract
+  name: heading
+  what: text
+  selector: h1
+- action: evaluate
+  name: links
+  script: document.querySelectorAll('a').length
+- action: screenshot
+  path: $TEST_TMP/steps-shot.png
+EOF
+
+run_test_output_contains "run_steps.py collects named step outputs" \
+    '"heading": "Example Domain"' \
+    uv run "$PLAYWRIGHT_DIR/run_steps.py" "$STEPS_FILE" --headless
+
+run_test_file_exists "run_steps.py screenshot step writes file" \
+    "$TEST_TMP/steps-shot.png" \
+    true
+
+echo '[{"action": "goto", "url": "https://example.com"}, {"action": "click", "selector": "#missing"}]' \
+    > "$TEST_TMP/failing-steps.json"
+run_test "run_steps.py fails on a failing step" 1 \
+    uv run "$PLAYWRIGHT_DIR/run_steps.py" "$TEST_TMP/failing-steps.json" --headless --wait-until load
+
+echo '[{"action": "goto", "url": "https://example.com"}, {"action": "fill", "label": "Email"}]' \
+    > "$TEST_TMP/incomplete-steps.json"
+run_test_output_contains "run_steps.py reports a step missing a required key" \
+    "Step 2 (fill) needs 'value'" \
+    uv run "$PLAYWRIGHT_DIR/run_steps.py" "$TEST_TMP/incomplete-steps.json" --headless
+
+# ============================================================================
+# TEST: crawl.py
+# ============================================================================
+
+echo -e "\n${BLUE}=== crawl.py Tests ===${NC}"
+
+# Small static site served locally: / -> a, b; a -> b, c; c -> d
+# HAR replay (offline mode) would abort requests to it, so crawls run with it unset
+SITE_DIR="$TEST_TMP/site"
+mkdir -p "$SITE_DIR"
+echo '<title>Home</title><a href="a.html">A</a><a href="b.html#top">B</a><a href="https://example.org/">Ext</a>' > "$SITE_DIR/index.html"
+echo '<title>A</title><a href="/b.html">B</a><a href="c.html">C</a>' > "$SITE_DIR/a.html"
+echo '<title>B</title>' > "$SITE_DIR/b.html"
+echo '<title>C</title><a href="d.html">D</a>' > "$SITE_DIR/c.html"
+echo '<title>D</title>' > "$SITE_DIR/d.html"
+SITE_PORT=$(python3 -c 'import socket; s = socket.socket(); s.bind(("127.0.0.1", 0)); print(s.getsockname()[1])')
+python3 -m http.server "$SITE_PORT" --bind 127.0.0.1 --directory "$SITE_DIR" >/dev/null 2>&1 &
+SITE_PID=$!
+SITE_URL="http://127.0.0.1:$SITE_PORT/"
+sleep 1
+
+run_test_output_contains "crawl.py follows same-origin links to --max-depth" \
+    '"title": "C"' \
+    env -u PLAYWRIGHT_REPLAY_HAR uv run "$PLAYWRIGHT_DIR/crawl.py" "$SITE_URL" --headless --max-depth 2 --wait-until load
+
+run_test "crawl.py respects --max-pages with a checkpoint" 0 \
+    env -u PLAYWRIGHT_REPLAY_HAR uv run "$PLAYWRIGHT_DIR/crawl.py" "$SITE_URL" --headless --wait-until load \
+    --max-pages 2 --checkpoint "$TEST_TMP/crawl.json"
+
+run_test_output_contains "crawl.py resumes from the checkpoint" \
+    "Resuming from" \
+    env -u PLAYWRIGHT_REPLAY_HAR uv run "$PLAYWRIGHT_DIR/crawl.py" --headless --wait-until load --checkpoint "$TEST_TMP/crawl.json" --max-depth 5
+
+run_test "crawl.py without URL or checkpoint fails" 2 \
+    uv run "$PLAYWRIGHT_DIR/crawl.py"
+
+# A start URL on another origin that redirects to the site, like http -> https or apex -> www
+REDIRECT_PORT=$(python3 -c 'import socket; s = socket.socket(); s.bind(("127.0.0.1", 0)); print(s.getsockname()[1])')
+python3 - "$REDIRECT_PORT" "http://127.0.0.1:$SITE_PORT" >/dev/null 2>&1 <<'PYEOF' &
+import sys
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+class Redirect(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(301)
+        self.send_header("Location", sys.argv[2] + self.path)
+        self.end_headers()
+
+HTTPServer(("127.0.0.1", int(sys.argv[1])), Redirect).serve_forever()
+PYEOF
+REDIRECT_PID=$!
+sleep 1
+
+run_test_output_contains "crawl.py follows links on the origin a start URL redirects to" \
+    '"title": "C"' \
+    env -u PLAYWRIGHT_REPLAY_HAR uv run "$PLAYWRIGHT_DIR/crawl.py" "http://localhost:$REDIRECT_PORT/" \
+    --headless --max-depth 2 --wait-until load
+
+kill "$REDIRECT_PID" 2>/dev/null || true
+REDIRECT_PID=""
+kill "$SITE_PID" 2>/dev/null || true
+SITE_PID=""
+
+# ============================================================================
+# TEST: daemon.py
+# ============================================================================
+
+echo -e "\n${BLUE}=== daemon.py Tests ===${NC}"
+
+export PLAYWRIGHT_DAEMON_STATE="$TEST_TMP/daemon.json"
+
+run_test "daemon.py status fails when not running" 1 \
+    uv run "$PLAYWRIGHT_DIR/daemon.py" status
+
+printf '{"pid": %d, "endpoint": "ws://127.0.0.1:9/x"}' $$ > "$PLAYWRIGHT_DAEMON_STATE"
+chmod 644 "$PLAYWRIGHT_DAEMON_STATE"
+run_test "daemon.py ignores a state file others can write" 1 \
+    uv run "$PLAYWRIGHT_DIR/daemon.py" status
+rm -f "$PLAYWRIGHT_DAEMON_STATE"
+
+run_test_output_contains "daemon.py start launches browser" \
+    "Daemon started" \
+    uv run "$PLAYWRIGHT_DIR/daemon.py" start --headless
+
+run_test_output_contains "daemon.py status shows the server pid" \
+    '"server_pid"' \
+    uv run "$PLAYWRIGHT_DIR/daemon.py" status
+
+run_test "daemon.py status keeps the endpoint secret" 1 \
+    bash -c "uv run '$PLAYWRIGHT_DIR/daemon.py' status | grep -q ws://"
+
+run_test_output_contains "navigate.py works through daemon" \
+    "Example Domain" \
+    uv run "$PLAYWRIGHT_DIR/navigate.py" https://example.com --headless --title
+
+run_test_output_contains "daemon.py stop shuts browser down" \
+    "Daemon stopped" \
+    uv run "$PLAYWRIGHT_DIR/daemon.py" stop
+
+unset PLAYWRIGHT_DAEMON_STATE
+
 # ============================================================================
 # SUMMARY
 # ============================================================================
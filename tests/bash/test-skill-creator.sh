@@ -0,0 +1,329 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# Get the directory of this script
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
+SKILL_CREATOR_DIR="$REPO_ROOT/plugins/skill-creator/scripts"
+
+# Colors for output
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+YELLOW='\033[1;33m'
+BLUE='\033[0;34m'
+NC='\033[0m' # No Color
+
+# Test counters
+TESTS_PASSED=0
+TESTS_FAILED=0
+TESTS_TOTAL=0
+
+# Temp directory for test artifacts
+TEST_TMP="${TMPDIR:-/tmp}/skill-creator-test-$$"
+mkdir -p "$TEST_TMP"
+
+# Helper function to run test with expected exit code
+run_test() {
+    local test_name="$1"
+    local expected_exit="$2"
+    shift 2
+    local cmd=("$@")
+
+    TESTS_TOTAL=$((TESTS_TOTAL + 1))
+    echo -e "\n${BLUE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
+    echo -e "${YELLOW}Test $TESTS_TOTAL: $test_name${NC}"
+    echo -e "${BLUE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
+    echo "Command: ${cmd[*]}"
+    echo ""
+
+    # Run command and capture output and exit code
+    set +e
+    output=$("${cmd[@]}" 2>&1)
+    actual_exit=$?
+    set -e
+
+    echo "Output:"
+    echo "$output"
+    echo ""
+    echo "Expected exit code: $expected_exit"
+    echo "Actual exit code: $actual_exit"
+
+    if [[ "$actual_exit" == "$expected_exit" ]]; then
+        echo -e "${GREEN}✓ PASSED${NC}"
+        TESTS_PASSED=$((TESTS_PASSED + 1))
+        return 0
+    else
+        echo -e "${RED}✗ FAILED${NC}"
+        TESTS_FAILED=$((TESTS_FAILED + 1))
+        return 1
+    fi
+}
+
+# Helper function to run test and check output contains string
+run_test_output_contains() {
+    local test_name="$1"
+    local expected_string="$2"
+    shift 2
+    local cmd=("$@")
+
+    TESTS_TOTAL=$((TESTS_TOTAL + 1))
+    echo -e "\n${BLUE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
+    echo -e "${YELLOW}Test $TESTS_TOTAL: $test_name${NC}"
+    echo -e "${BLUE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
+    echo "Command: ${cmd[*]}"
+    echo "Expected output to contain: $expected_string"
+    echo ""
+
+    # Run command and capture output
+    set +e
+    output=$("${cmd[@]}" 2>&1)
+    actual_exit=$?
+    set -e
+
+    echo "Output:"
+    echo "$output"
+    echo ""
+
+    if echo "$output" | grep -q "$expected_string"; then
+        echo -e "${GREEN}✓ PASSED${NC}"
+        TESTS_PASSED=$((TESTS_PASSED + 1))
+        return 0
+    else
+        echo -e "${RED}✗ FAILED - output does not contain expected string${NC}"
+        TESTS_FAILED=$((TESTS_FAILED + 1))
+        return 1
+    fi
+}
+
+# Cleanup function
+cleanup() {
+    echo -e "\n${BLUE}Cleaning up test artifacts...${NC}"
+    rm -rf "$TEST_TMP"
+}
+
+# Ensure cleanup on exit
+trap cleanup EXIT
+
+# Write a minimal valid skill: make_skill <dir> <name>
+make_skill() {
+    local dir="$1"
+    local name="$2"
+    mkdir -p "$dir/$name/references"
+    printf -- '---\nname: %s\ndescription: Test skill %s\n---\n\n# %s\n' \
+        "$name" "$name" "$name" > "$dir/$name/SKILL.md"
+    printf 'Shared license text\n' > "$dir/$name/LICENSE.txt"
+    printf 'Notes for %s\n' "$name" > "$dir/$name/references/notes.md"
+}
+
+# Write a one-file bundle by hand: make_bundle <file> <skill-name> <rel-path> <content> [digest]
+# The digest defaults to the content's SHA-256; pass another one to make a corrupt blob.
+make_bundle() {
+    python3 - "$@" <<'PYEOF'
+import hashlib, json, sys, zipfile
+bundle, skill_name, rel_path, content = sys.argv[1:5]
+data = content.encode()
+digest = sys.argv[5] if len(sys.argv) > 5 else hashlib.sha256(data).hexdigest()
+manifest = {'format': 1, 'skills': {skill_name: {'files': {
+    rel_path: {'sha256': digest, 'size': len(data), 'mode': 0o644}}}}}
+with zipfile.ZipFile(bundle, 'w') as zipf:
+    zipf.writestr('manifest.json', json.dumps(manifest))
+    zipf.writestr('blobs/' + digest, data)
+PYEOF
+}
+
+echo -e "${BLUE}╔════════════════════════════════════════════════════════════╗${NC}"
+echo -e "${BLUE}║          Skill Creator Scripts Integration Tests           ║${NC}"
+echo -e "${BLUE}╚════════════════════════════════════════════════════════════╝${NC}"
+echo ""
+echo "Scripts directory: $SKILL_CREATOR_DIR"
+echo "Temp directory: $TEST_TMP"
+
+SKILLS="$TEST_TMP/skills"
+make_skill "$SKILLS" alpha-skill
+make_skill "$SKILLS" beta-skill
+
+# ============================================================================
+# bundle_skills.py
+# ============================================================================
+
+run_test "bundle_skills.py pack bundles two skills" 0 \
+    python3 "$SKILL_CREATOR_DIR/bundle_skills.py" pack "$TEST_TMP/all.skillbundle" \
+    "$SKILLS/alpha-skill" "$SKILLS/beta-skill"
+
+run_test_output_contains "bundle_skills.py pack stores shared files once" \
+    "5 unique blobs" \
+    python3 "$SKILL_CREATOR_DIR/bundle_skills.py" pack "$TEST_TMP/again.skillbundle" \
+    "$SKILLS/alpha-skill" "$SKILLS/beta-skill"
+
+run_test "bundle_skills.py pack is deterministic" 0 \
+    cmp "$TEST_TMP/all.skillbundle" "$TEST_TMP/again.skillbundle"
+
+run_test "bundle_skills.py pack leaves no partial file" 1 \
+    test -e "$TEST_TMP/all.skillbundle.partial"
+
+run_test "bundle_skills.py pack rejects a missing skill folder" 1 \
+    python3 "$SKILL_CREATOR_DIR/bundle_skills.py" pack "$TEST_TMP/missing.skillbundle" \
+    "$SKILLS/no-such-skill"
+
+run_test_output_contains "bundle_skills.py list shows each skill" \
+    "beta-skill	3 files" \
+    python3 "$SKILL_CREATOR_DIR/bundle_skills.py" list "$TEST_TMP/all.skillbundle"
+
+run_test "bundle_skills.py list rejects a file that is not a bundle" 1 \
+    python3 "$SKILL_CREATOR_DIR/bundle_skills.py" list "$SKILLS/alpha-skill/SKILL.md"
+
+run_test "bundle_skills.py unpack restores every skill" 0 \
+    python3 "$SKILL_CREATOR_DIR/bundle_skills.py" unpack "$TEST_TMP/all.skillbundle" "$TEST_TMP/out"
+
+run_test "bundle_skills.py unpack round-trips file contents" 0 \
+    diff -r "$SKILLS" "$TEST_TMP/out"
+
+run_test "bundle_skills.py unpack extracts only the named skills" 1 \
+    bash -c "python3 '$SKILL_CREATOR_DIR/bundle_skills.py' unpack '$TEST_TMP/all.skillbundle' \
+        '$TEST_TMP/one' beta-skill && test -e '$TEST_TMP/one/alpha-skill'"
+
+run_test_output_contains "bundle_skills.py unpack rejects unknown skill names" \
+    "not in bundle: gamma-skill" \
+    python3 "$SKILL_CREATOR_DIR/bundle_skills.py" unpack "$TEST_TMP/all.skillbundle" \
+    "$TEST_TMP/unknown" gamma-skill
+
+run_test_output_contains "bundle_skills.py unpack refuses to overwrite a skill" \
+    "already exists" \
+    python3 "$SKILL_CREATOR_DIR/bundle_skills.py" unpack "$TEST_TMP/all.skillbundle" "$TEST_TMP/out"
+
+make_bundle "$TEST_TMP/escape-name.skillbundle" "../escaped" SKILL.md "owned"
+run_test_output_contains "bundle_skills.py unpack rejects a skill name that escapes the output" \
+    "Invalid skill name" \
+    python3 "$SKILL_CREATOR_DIR/bundle_skills.py" unpack "$TEST_TMP/escape-name.skillbundle" \
+    "$TEST_TMP/jail/out"
+
+run_test "bundle_skills.py unpack wrote nothing outside the output" 1 \
+    test -e "$TEST_TMP/jail/escaped"
+
+make_bundle "$TEST_TMP/escape-path.skillbundle" evil-skill "../../escaped.txt" "owned"
+run_test_output_contains "bundle_skills.py unpack rejects a path that escapes the skill" \
+    "Unsafe path" \
+    python3 "$SKILL_CREATOR_DIR/bundle_skills.py" unpack "$TEST_TMP/escape-path.skillbundle" \
+    "$TEST_TMP/jail/out"
+
+run_test "bundle_skills.py unpack wrote no escaped file" 1 \
+    test -e "$TEST_TMP/jail/escaped.txt"
+
+make_bundle "$TEST_TMP/corrupt.skillbundle" corrupt-skill SKILL.md "changed" \
+    "$(printf 'original' | sha256sum | cut -d' ' -f1)"
+run_test_output_contains "bundle_skills.py unpack detects a blob that does not match its digest" \
+    "Corrupt blob" \
+    python3 "$SKILL_CREATOR_DIR/bundle_skills.py" unpack "$TEST_TMP/corrupt.skillbundle" \
+    "$TEST_TMP/corrupt"
+
+run_test "bundle_skills.py unpack removes the corrupt file" 1 \
+    test -e "$TEST_TMP/corrupt/corrupt-skill/SKILL.md"
+
+# ============================================================================
+# package_skill.py / verify_skill.py
+# ============================================================================
+
+run_test "package_skill.py packages a skill with a manifest" 0 \
+    python3 "$SKILL_CREATOR_DIR/package_skill.py" "$SKILLS/alpha-skill" "$TEST_TMP/dist"
+
+run_test "verify_skill.py accepts an intact archive" 0 \
+    python3 "$SKILL_CREATOR_DIR/verify_skill.py" "$TEST_TMP/dist/alpha-skill.skill"
+
+# Rewrite one entry without touching the manifest
+python3 - "$TEST_TMP/dist/alpha-skill.skill" "$TEST_TMP/dist/changed.skill" <<'PYEOF'
+import sys, zipfile
+with zipfile.ZipFile(sys.argv[1]) as src, zipfile.ZipFile(sys.argv[2], 'w') as dst:
+    for info in src.infolist():
+        data = src.read(info)
+        if info.filename == 'alpha-skill/references/notes.md':
+            data = b'Changed notes\n'
+        dst.writestr(info, data)
+PYEOF
+
+run_test_output_contains "verify_skill.py reports a changed file" \
+    "references/notes.md: size" \
+    python3 "$SKILL_CREATOR_DIR/verify_skill.py" "$TEST_TMP/dist/changed.skill"
+
+run_test "verify_skill.py fails when any archive fails" 1 \
+    python3 "$SKILL_CREATOR_DIR/verify_skill.py" --workers 2 \
+    "$TEST_TMP/dist/alpha-skill.skill" "$TEST_TMP/dist/changed.skill"
+
+(cd "$SKILLS" && python3 -m zipfile -c "$TEST_TMP/dist/bare.skill" alpha-skill/SKILL.md)
+run_test_output_contains "verify_skill.py reports an archive without a manifest" \
+    "missing .skill-manifest.json" \
+    python3 "$SKILL_CREATOR_DIR/verify_skill.py" "$TEST_TMP/dist/bare.skill"
+
+# ============================================================================
+# init_skill.py --spec
+# ============================================================================
+
+cat > "$TEST_TMP/spec.yaml" <<'EOF'
+skills:
+  - name: first-skill
+    description: "Handles: colons, # hashes and 'quotes'"
+  - name: second-skill
+    description: Second skill
+  - name: cafe-skill
+    description: Commandes au café, crème brûlée
+EOF
+
+run_test "init_skill.py --spec creates every skill" 0 \
+    python3 "$SKILL_CREATOR_DIR/init_skill.py" --spec "$TEST_TMP/spec.yaml" \
+    --path "$TEST_TMP/init" --workers 2
+
+run_test "init_skill.py --spec skills pass validation" 0 \
+    python3 "$SKILL_CREATOR_DIR/quick_validate.py" "$TEST_TMP/init/second-skill"
+
+run_test_output_contains "init_skill.py --spec keeps descriptions parseable" \
+    "Handles: colons, # hashes and 'quotes'" \
+    python3 -c "import sys, yaml; print(yaml.safe_load(open(sys.argv[1]).read().split('---')[1])['description'])" \
+    "$TEST_TMP/init/first-skill/SKILL.md"
+
+run_test_output_contains "init_skill.py --spec writes non-ASCII descriptions as-is" \
+    'description: "Commandes au café, crème brûlée"' \
+    cat "$TEST_TMP/init/cafe-skill/SKILL.md"
+
+printf '\xef\xbb\xbfname,description\ncsv-skill,From a spreadsheet export\n' > "$TEST_TMP/spec.csv"
+run_test "init_skill.py --spec reads CSV with a byte order mark" 0 \
+    python3 "$SKILL_CREATOR_DIR/init_skill.py" --spec "$TEST_TMP/spec.csv" --path "$TEST_TMP/init"
+
+cat > "$TEST_TMP/bad-spec.yaml" <<'EOF'
+- name: good-skill
+  description: Fine
+- name: Bad_Skill
+  description: Not hyphen-case
+EOF
+
+run_test "init_skill.py --spec exits 1 when a skill fails" 1 \
+    python3 "$SKILL_CREATOR_DIR/init_skill.py" --spec "$TEST_TMP/bad-spec.yaml" --path "$TEST_TMP/partial"
+
+run_test "init_skill.py --spec still creates the valid skills" 0 \
+    test -f "$TEST_TMP/partial/good-skill/SKILL.md"
+
+run_test "init_skill.py --spec leaves no staging directories" 1 \
+    bash -c "ls -A '$TEST_TMP/partial' | grep -q '^\.'"
+
+run_test_output_contains "init_skill.py --spec refuses an existing skill" \
+    "directory already exists" \
+    python3 "$SKILL_CREATOR_DIR/init_skill.py" --spec "$TEST_TMP/spec.yaml" --path "$TEST_TMP/init"
+
+# ============================================================================
+# SUMMARY
+# ============================================================================
+
+echo -e "\n${BLUE}╔════════════════════════════════════════════════════════════╗${NC}"
+echo -e "${BLUE}║                      Test Summary                          ║${NC}"
+echo -e "${BLUE}╚════════════════════════════════════════════════════════════╝${NC}"
+echo ""
+echo -e "Total tests:  $TESTS_TOTAL"
+echo -e "Passed:       ${GREEN}$TESTS_PASSED${NC}"
+echo -e "Failed:       ${RED}$TESTS_FAILED${NC}"
+echo ""
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}Some tests failed!${NC}"
+    exit 1
+fi